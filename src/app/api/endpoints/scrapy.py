@@ -1,13 +1,15 @@
-import re
 import os
 import logging
 import subprocess
 import app.models.enums as models
-import app.services.scraper as scraper
+import app.services.jobs as jobs
+import app.services.cache as cache
+import app.services.geocoding as geocoding
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from app.config.settings import LOG_DIR
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from app.services.log_index import LogIndex
+from fastapi import APIRouter, HTTPException, Query
 
 router = APIRouter()
 
@@ -30,30 +32,57 @@ logger.setLevel(logging.DEBUG)
 
 @router.get("/page/")
 async def scrape_page(
-    background_tasks: BackgroundTasks,
     page: models.Pages = Query(..., description="Página a scrapeear"),
     refine: bool = Query(False, description="Indica si se debe refinar el scraping"),
-) -> Dict[str, str]:
+    incremental: bool = Query(False, description="Omite las páginas de detalle sin cambios desde la última corrida"),
+    resume: bool = Query(False, description="Reanuda el último crawl detenido de la araña en lugar de empezar de cero"),
+) -> Dict[str, Any]:
     """
-    Inicia el proceso de scraping en segundo plano.
+    Encola el proceso de scraping; lo ejecuta el pool de workers.
     """
     url = getattr(models.URLs, page.value).value
     logger.info(f"Log desde Scraper endpoint: {url}")
     logger.info(f"Solicitud de scraping recibida para la URL: {url}")
 
     try:
+        job_id = jobs.get_job_store().enqueue(page.value, url, refine, incremental, resume)
         if refine:
-            logger.info(f"Se inicia el refinado en segundo plano para {url}")
-            message = {"message": f"Se inicia el refinado en segundo plano para {url}"}
+            logger.info(f"Se encola el refinado para {url} (job: {job_id})")
+            message = f"Se encola el refinado para {url}"
         else:
-            logger.info(f"Tarea de scraping iniciada en segundo plano para {url}")
-            message = {"message": f"Tarea de scraping iniciada en segundo plano para {url}"}
-        background_tasks.add_task(scraper.run_webscraping, url, refine)
-        return message
+            logger.info(f"Tarea de scraping encolada para {url} (job: {job_id})")
+            message = f"Tarea de scraping encolada para {url}"
+        return {"message": message, "job_id": job_id}
     except Exception as e:
         logger.error(f"Error al iniciar el scraping: {str(e)}")
         raise HTTPException(status_code=500, detail="Error al iniciar el scraping.")
 
+@router.get("/jobs/{job_id}")
+def get_job(job_id: int) -> Dict[str, Any]:
+    """
+    Estado, duración y cantidad de items de un trabajo de scraping.
+    """
+    job = jobs.get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return job
+
+@router.post("/cache/invalidate")
+def invalidate_cache(
+    name: Optional[models.CacheNames] = Query(None, description="Caché a invalidar; todas si se omite"),
+) -> Dict[str, Any]:
+    """
+    Invalida las cachés locales (elements, api keys y geocodificación).
+    """
+    names = [name.value] if name else [cache_name.value for cache_name in models.CacheNames]
+    for cache_name in names:
+        if cache_name == models.CacheNames.geocoding.value:
+            geocoding.get_geocoding_cache().invalidate()
+        else:
+            cache.CACHES[cache_name].invalidate()
+    logger.info(f"Cachés invalidadas: {names}")
+    return {"message": "Cachés invalidadas", "caches": names}
+
 @router.get("/log_status/{spider_name}")
 def check_log_status(spider_name: models.Pages) -> Dict[str, Any]:
     """
@@ -67,47 +96,32 @@ def check_log_status(spider_name: models.Pages) -> Dict[str, Any]:
         raise HTTPException(status_code=404, detail="Log no encontrado")
 
     try:
-        with open(log_path, "r", encoding="utf-8") as log_file:
-            log_content = log_file.readlines()
-
-        is_running = any("open_spider" in line for line in log_content)
-        is_finished = any("close_spider" in line for line in log_content)
-        has_error = any(
-            re.search(models.ConfigErrorScraper.REGEX_ERROR.value, line) 
-            for line in log_content
-        )
-
-        if has_error:
-            status = "error"
-            output_details = {
-                f'Error in line: {position_line}. Error: {line}': log_content[position_line-10:position_line+20]
-                for position_line, line in enumerate(log_content)
-                if re.search(models.ConfigErrorScraper.REGEX_ERROR.value, line) 
-            }
-            return {
-                "status": "error",
-                "details": output_details
-            }
-        
-        if is_running and not is_finished:
-            status = "running"
-        elif is_finished:
-            status = "finished"
-        else:
-            status = "not_started"
-
-        return {"status": status, "details": log_content[-10:]}  # Últimas 10 líneas del log
+        # Solo se leen los bytes nuevos desde la consulta anterior
+        response = LogIndex(log_path).status()
+        latest_job = jobs.get_job_store().get_latest(spider_name.value)
+        if latest_job is not None:
+            # Salida de consola (stdout/stderr) del último trabajo de la araña
+            response["job_id"] = latest_job["id"]
+            response["output"] = latest_job["output_tail"]
+        return response
 
     except Exception as e:
         logger.error(f"Error al leer el log: {str(e)}")
         raise HTTPException(status_code=500, detail="Error al procesar el archivo de log.")
 
 @router.post("/kill/{pid}")
-async def kill_process(pid: int):
+async def kill_process(
+    pid: int,
+    graceful: bool = Query(False, description="Envía SIGTERM para que Scrapy cierre y guarde su JOBDIR"),
+):
     """
-    Fuerza la detención de un proceso mediante su PID.
+    Detiene un proceso mediante su PID. Con `graceful` el crawl se puede
+    reanudar luego con `/page/?resume=true`; si no, se fuerza con kill -9.
     """
     try:
+        if graceful:
+            subprocess.run(["kill", "-15", str(pid)], check=True)
+            return {"message": f"Se solicitó detener el proceso con PID {pid}."}
         subprocess.run(["kill", "-9", str(pid)], check=True)
         return {"message": f"Proceso con PID {pid} detenido forzosamente."}
     except subprocess.CalledProcessError as e:
@@ -35,6 +35,19 @@ class LodgerinConfig:
     API_URL = os.getenv("LODGERIN_API", "https://default-lodgerin-api.com")
     INTERNAL_URL = os.getenv("LODGERIN_INTERNAL", "https://default-internal.com")
     MAPS_INTERNAL_URL = os.getenv("LODGERIN_MAPS_INTERNAL", "https://default-maps.com")
+    # Sesión HTTP compartida: pool keep-alive, timeout y reintentos con backoff
+    POOL_CONNECTIONS = int(os.getenv("LODGERIN_POOL_CONNECTIONS", "4"))
+    POOL_MAXSIZE = int(os.getenv("LODGERIN_POOL_MAXSIZE", "16"))
+    TIMEOUT = float(os.getenv("LODGERIN_TIMEOUT", "30"))
+    MAX_RETRIES = int(os.getenv("LODGERIN_MAX_RETRIES", "3"))
+    BACKOFF_FACTOR = float(os.getenv("LODGERIN_BACKOFF_FACTOR", "0.5"))
+    # Peticiones simultáneas del cliente asíncrono (upserts de los ETL)
+    MAX_CONCURRENCY = int(os.getenv("LODGERIN_MAX_CONCURRENCY", "8"))
+    # Ubicaciones (correos) consultadas a la vez al armar el contexto de Yugo
+    CONTEXT_MAX_WORKERS = int(os.getenv("LODGERIN_CONTEXT_MAX_WORKERS", "8"))
+    # Envío de rental units en lotes; una ruta vacía desactiva el endpoint masivo
+    BULK_RENTAL_UNITS_PATH = os.getenv("LODGERIN_BULK_RENTAL_UNITS_PATH", "/rental-units/bulk")
+    BATCH_SIZE = int(os.getenv("LODGERIN_BATCH_SIZE", "50"))
 
 # 📌 Tokens y Seguridad
 class TokenConfig:
@@ -64,3 +77,66 @@ class ElementsConfig:
     ELEMENTS_JSON = os.getenv("ELEMENTS_JSON", "{}")
     PATH_LOGS = os.getenv("LOGS", "./logs")
     PATH_DATA = os.getenv("DATA", "./data")
+
+# 📌 Configuración de la cola de trabajos de scraping
+class JobsConfig:
+    DB_PATH = os.getenv("JOBS_DB", os.path.join(ElementsConfig.PATH_DATA, "jobs.sqlite3"))
+    MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", "2"))
+    POLL_INTERVAL = float(os.getenv("SCRAPER_POLL_INTERVAL", "2"))
+    STOP_TIMEOUT = float(os.getenv("SCRAPER_STOP_TIMEOUT", "10"))
+
+# 📌 Ejecución de las arañas
+class ScraperConfig:
+    # "subprocess": un `scrapy crawl` por trabajo; "inprocess": CrawlerRunner en el worker
+    EXECUTION_MODE = os.getenv("SCRAPER_EXECUTION_MODE", "subprocess")
+    CRAWL_TIMEOUT = float(os.getenv("SCRAPER_CRAWL_TIMEOUT", "0")) or None
+    CRAWL_STOP_TIMEOUT = float(os.getenv("SCRAPER_CRAWL_STOP_TIMEOUT", "30"))
+    # Últimas líneas de stdout/stderr de `scrapy crawl` que se guardan con el trabajo
+    OUTPUT_TAIL_LINES = int(os.getenv("SCRAPER_OUTPUT_TAIL_LINES", "200"))
+    OUTPUT_FLUSH_INTERVAL = float(os.getenv("SCRAPER_OUTPUT_FLUSH_INTERVAL", "5"))
+    # JOBDIR de cada araña (cola de peticiones y checkpoint de items) para reanudar crawls
+    JOBDIR_ROOT = os.path.abspath(os.getenv("SCRAPER_JOBDIR", os.path.join(ElementsConfig.PATH_DATA, "jobdir")))
+    # Modo incremental: estado de las páginas de detalle entre corridas
+    FRONTIER_DB = os.getenv("FRONTIER_DB", os.path.join(ElementsConfig.PATH_DATA, "frontier.sqlite3"))
+    FRONTIER_MAX_AGE_DAYS = float(os.getenv("FRONTIER_MAX_AGE_DAYS", "7"))
+    # Items que esperan al ETL antes de que la araña tenga que esperar
+    ETL_QUEUE_SIZE = int(os.getenv("SCRAPER_ETL_QUEUE_SIZE", "100"))
+    # ETL por propiedad: procesos para construir los modelos (0 = en hilos) e hilos para Lodgerin
+    ETL_PROCESSES = int(os.getenv("SCRAPER_ETL_PROCESSES", str(os.cpu_count() or 1)))
+    ETL_THREADS = int(os.getenv("SCRAPER_ETL_THREADS", "8"))
+    LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(funcName)s:%(lineno)d - %(message)s"
+    LOG_DATEFORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 📌 Caché HTTP de las arañas (el TTL de cada una está en su settings.py)
+class HttpCacheConfig:
+    ENABLED = os.getenv("HTTPCACHE_ENABLED", "true").lower() == "true"
+    # Ruta absoluta: `scrapy crawl` se ejecuta desde la carpeta de cada proyecto
+    DIR = os.path.abspath(os.getenv("HTTPCACHE_DIR", os.path.join(ElementsConfig.PATH_DATA, "httpcache")))
+    # Ajustes que la app pasa a todas las arañas. RFC2616Policy respeta Cache-Control y
+    # revalida con ETag/Last-Modified (respuestas 304); los errores no se guardan
+    SPIDER_SETTINGS = {
+        "HTTPCACHE_ENABLED": ENABLED,
+        "HTTPCACHE_DIR": DIR,
+        "HTTPCACHE_POLICY": "scrapy.extensions.httpcache.RFC2616Policy",
+        "HTTPCACHE_STORAGE": "scrapy.extensions.httpcache.FilesystemCacheStorage",
+        # Separados por comas para poder pasarlos con `-s`
+        "HTTPCACHE_IGNORE_HTTP_CODES": "429,500,502,503,504",
+    }
+
+# 📌 Sincronización con Lodgerin (cachés locales)
+class SyncConfig:
+    FINGERPRINTS_DB = os.getenv("FINGERPRINTS_DB", os.path.join(ElementsConfig.PATH_DATA, "fingerprints.sqlite3"))
+    # Pasado este tiempo se vuelve a enviar aunque no haya cambios (corrige desvíos con la API)
+    FINGERPRINT_MAX_AGE_DAYS = float(os.getenv("FINGERPRINT_MAX_AGE_DAYS", "7"))
+    CALENDARS_DB = os.getenv("CALENDARS_DB", os.path.join(ElementsConfig.PATH_DATA, "calendars.sqlite3"))
+
+# 📌 Cachés del contexto de scraping (elements y api keys de Lodgerin)
+class CacheConfig:
+    DIR = os.getenv("CACHE_DIR", os.path.join(ElementsConfig.PATH_DATA, "cache"))
+    ELEMENTS_TTL = float(os.getenv("CACHE_ELEMENTS_TTL", str(6 * 3600)))
+    API_KEYS_TTL = float(os.getenv("CACHE_API_KEYS_TTL", str(24 * 3600)))
+    # Geocodificación de direcciones: SQLite con TTL y un LRU en memoria delante
+    GEOCODING_DB = os.getenv("GEOCODING_DB", os.path.join(ElementsConfig.PATH_DATA, "geocoding.sqlite3"))
+    GEOCODING_TTL = float(os.getenv("CACHE_GEOCODING_TTL", str(90 * 24 * 3600)))
+    GEOCODING_NEGATIVE_TTL = float(os.getenv("CACHE_GEOCODING_NEGATIVE_TTL", str(24 * 3600)))
+    GEOCODING_LRU_SIZE = int(os.getenv("CACHE_GEOCODING_LRU_SIZE", "2048"))
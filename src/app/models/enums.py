@@ -114,6 +114,27 @@ class ConfigErrorScraper(Enum):
     Señales que puede detectar errores en los logs de las arañas
     """
     REGEX_ERROR = r"] ERROR:|Request error occurred"
+
+
+class JobStatus(str, Enum):
+    """
+    Estados de un trabajo de scraping en la cola persistente
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    # Detenido antes de terminar; se puede reanudar con `resume`
+    INTERRUPTED = "interrupted"
+
+
+class CacheNames(str, Enum):
+    """
+    Cachés locales que se pueden invalidar desde la API
+    """
+    elements = "elements"
+    api_keys = "api_keys"
+    geocoding = "geocoding"
 # TODO: elimnar luego de probar flipcoling y vita
 # feature_map = {
 #     "1": ["airConditioning", "air conditioning", "aire acondicionado"],
@@ -102,8 +102,8 @@ class Property(BaseModel):
     
 
 class RentalUnits(BaseModel):
-    PropertyId: str = Field(
-        ..., description="ID de la propiedad a la que pertenece la rental unit"
+    PropertyId: Optional[str] = Field(
+        None, description="ID de la propiedad a la que pertenece la rental unit (se asigna al guardar la propiedad)"
     )
     Images: List[Image] = Field(default_factory=list, description="Lista de imágenes")
     Price: Optional[PriceItem] = Field(None, description="")
@@ -0,0 +1,96 @@
+import logging
+
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import scrapy
+
+from app.scrapy.frontier import URL_META, tag_item
+
+logger = logging.getLogger(__name__)
+
+
+class ItemAggregator:
+    """
+    Arma un item a partir de varias peticiones de Scrapy.
+
+    Cada petición creada con `request` suma una pendiente; cuando responde (o
+    falla) se resta. Las peticiones que lance un callback se cuentan antes de
+    restar la suya, así `on_complete` se llama una sola vez, cuando ya no
+    queda ninguna en vuelo.
+
+    En el modo incremental el item se asocia a la página de detalle que
+    originó sus peticiones, aunque lo entregue el callback de otra página.
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        on_complete: Callable[[Dict[str, Any]], Optional[Iterable]],
+        name: str = "",
+    ):
+        self.data = data
+        self.on_complete = on_complete
+        self.name = name
+        self.pending = 0
+        self.completed = False
+        self.frontier_url: Optional[str] = None
+
+    def request(
+        self,
+        url: str,
+        callback: Callable,
+        cb_kwargs: Optional[dict] = None,
+        on_error: Optional[Callable] = None,
+        **kwargs,
+    ) -> scrapy.Request:
+        """
+        Petición cuyo `callback(response, aggregator, **cb_kwargs)` completa `data`.
+        Si falla se llama a `on_error(failure, aggregator, **cb_kwargs)`.
+        """
+        self.pending += 1
+        kwargs.setdefault("dont_filter", True)
+        return scrapy.Request(
+            url=url,
+            callback=self._on_response,
+            errback=self._on_error,
+            cb_kwargs={"handler": callback, "handler_kwargs": cb_kwargs or {}, "error_handler": on_error},
+            **kwargs,
+        )
+
+    def _on_response(self, response, handler: Callable, handler_kwargs: dict, error_handler: Optional[Callable]):
+        self.frontier_url = self.frontier_url or response.meta.get(URL_META)
+        try:
+            yield from handler(response, self, **handler_kwargs) or ()
+        except Exception as error:
+            logger.error('Error procesando %s para %s. Error: %s', response.url, self.name, error)
+        yield from self.release()
+
+    def _on_error(self, failure):
+        logger.warning('Petición fallida para %s: %s', self.name, failure.getErrorMessage())
+        self.frontier_url = self.frontier_url or failure.request.meta.get(URL_META)
+        cb_kwargs = failure.request.cb_kwargs
+        if cb_kwargs["error_handler"] is not None:
+            yield from cb_kwargs["error_handler"](failure, self, **cb_kwargs["handler_kwargs"]) or ()
+        yield from self.release()
+
+    def hold(self) -> None:
+        """
+        Marca una espera que no es una petición propia (p. ej. una página que
+        ya está descargando otro item). Se libera con `release`.
+        """
+        self.pending += 1
+
+    def release(self):
+        self.pending -= 1
+        yield from self.close()
+
+    def close(self):
+        """
+        Entrega el item si no quedan peticiones pendientes.
+        """
+        if self.pending > 0 or self.completed:
+            return
+        self.completed = True
+        for element in self.on_complete(self.data) or ():
+            tag_item(element, self.frontier_url)
+            yield element
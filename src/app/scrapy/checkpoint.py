@@ -0,0 +1,49 @@
+import os
+import json
+
+from typing import Optional
+
+from scrapy import Spider
+
+
+def get_jobdir(spider: Spider) -> Optional[str]:
+    crawler = getattr(spider, "crawler", None)
+    return crawler.settings.get("JOBDIR") if crawler is not None else None
+
+
+def crawl_interrupted(spider: Spider) -> bool:
+    """
+    True si la araña se está cerrando por una detención (SIGTERM, timeout o
+    `CrawlerRunner.stop`) y no porque terminó el crawl. El motor de Scrapy
+    deja de estar `running` antes de cerrar la araña en ese caso.
+    """
+    crawler = getattr(spider, "crawler", None)
+    engine = getattr(crawler, "engine", None)
+    return engine is not None and not engine.running
+
+
+def has_pending_requests(jobdir: Optional[str]) -> bool:
+    """
+    Indica si el JOBDIR guarda peticiones pendientes de una corrida detenida.
+    """
+    if not jobdir:
+        return False
+    try:
+        with open(os.path.join(jobdir, "requests.queue", "active.json"), "r", encoding="utf-8") as state:
+            return bool(json.load(state))
+    except (OSError, ValueError):
+        return False
+
+
+class ResumeMiddleware:
+    """
+    Middleware de araña: al reanudar desde un JOBDIR con peticiones pendientes
+    no se vuelven a lanzar las peticiones iniciales (casi todas usan
+    `dont_filter=True`, así que el dupefilter no las descartaría).
+    """
+
+    def process_start_requests(self, start_requests, spider: Spider):
+        if has_pending_requests(get_jobdir(spider)):
+            spider.logger.info("Reanudando %s desde %s", spider.name, get_jobdir(spider))
+            return
+        yield from start_requests
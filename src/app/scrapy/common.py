@@ -2,14 +2,18 @@ import re
 import json
 import unicodedata
 
-from typing import Dict, Type, Any
+from typing import Callable, Dict, Type, Any, Iterator, Optional
+from ast import literal_eval
 from pydantic import BaseModel
 from urllib.parse import urlparse, unquote
 
-from app.config.settings import ElementsConfig
-from app.services.lodgerin import LodgerinAPI, LodgerinInternal
+from app.config.settings import ElementsConfig, LodgerinConfig
+from app.services.cache import api_keys_cache, elements_cache
+from app.services.geocoding import geocode
+from app.services.lodgerin import LodgerinInternal, get_lodgerin_api
+from concurrent.futures import ThreadPoolExecutor
 
-from app.models.schemas import LocationMaps
+from app.models.schemas import LocationAddress, LocationMaps
 import os
 from enum import Enum
 from app.models.enums import feature_map_rental_units
@@ -20,6 +24,7 @@ from app.models.schemas import (
     RentalUnits
 )
 from pathlib import Path
+from app.scrapy.jsonlines import close_writers, get_writer
 
 
 def save_to_json_file(data: list[dict], output_path: str) -> None:
@@ -31,6 +36,17 @@ def save_to_json_file(data: list[dict], output_path: str) -> None:
         print(f"Error al guardar el archivo JSON: {e}")
 
 
+def load_context(context: Union[str, dict, None]) -> dict:
+    """
+    Obtiene el contexto de Lodgerin de la araña. Llega como JSON cuando se usa
+    `scrapy crawl -a context=...` y como diccionario cuando la araña se ejecuta
+    en proceso con CrawlerRunner.
+    """
+    if isinstance(context, dict):
+        return context
+    return json.loads(context) if context else {}
+
+
 def get_all_imagenes(space_images: list) -> list[dict]:
     all_imagenes = []
 
@@ -72,8 +88,7 @@ def clean_information_html(text):
     return cleaned.strip()
 
 def search_location(query) -> LocationMaps:
-    lodgerin_api = LodgerinInternal()
-    address = lodgerin_api.search_location(query)
+    address = geocode(query)
     if address:
         location = LocationMaps(
             boundingbox=address['boundingbox'],
@@ -109,21 +124,58 @@ def search_location(query) -> LocationMaps:
         )
         return location
 
+
+def search_location_address(query: Optional[str]) -> LocationAddress:
+    """
+    Geocodifica `query` y arma el `Location` de Lodgerin (campos vacíos si
+    `query` es None). Es I/O: en los ETL paralelos va en la etapa `load`.
+    """
+    address = search_location(query) if query is not None else None
+    return LocationAddress(
+        lat=str(safe_attr(address, "lat")),
+        lon=str(safe_attr(address, "lon")),
+        country=safe_attr(address, "country"),
+        countryCode=safe_attr(address, "countryCode"),
+        city=safe_attr(address, "city"),
+        street=safe_attr(address, "street"),
+        state=safe_attr(address, "state"),
+        prefixPhone=safe_attr(address, "prefixPhone"),
+        postalCode=safe_attr(address, "postalCode"),
+        number=safe_attr(address, "number"),
+        fullAddress=safe_attr(address, "fullAddress"),
+        address=safe_attr(address, "address"),
+    )
+
+def get_api_key(email: str):
+    """
+    API key de Lodgerin para un correo, con caché en memoria y disco.
+    """
+    return api_keys_cache.get_or_set(email, lambda: LodgerinInternal().get_api_key(email))
+
+
+def get_elements(api_key: str):
+    """
+    Catálogo `elements` de Lodgerin para una API key, con caché en memoria y disco.
+    """
+    def fetch_elements():
+        elements = get_lodgerin_api(api_key).get_elements()
+        return elements.get('data', None) if elements else None
+
+    return elements_cache.get_or_set(api_key, fetch_elements)
+
+
 def initialize_scraping_context(email: str):
     try:
-        lodgerin_api = LodgerinInternal()
-        api_key = lodgerin_api.get_api_key(email)
+        api_key = get_api_key(email)
         if api_key is None:
             print(f"[warning - initialize_scraping_context] -> El api_key es None para el correo: {email}")
             raise
-            
-        api_client = LodgerinAPI(api_key)
-        mapped_data = api_client.get_elements()
+
+        mapped_data = get_elements(api_key)
         if mapped_data is None:
             print(f"[warning - initialize_scraping_context] -> El mapped_data es None")
             raise
-        
-        mapped_data = mapped_data.get('data', None)
+
         mapped_data["api_key"] = [{"id": email, "name": api_key}]
         return mapped_data
     except Exception as e:
@@ -133,6 +185,7 @@ def initialize_scraping_context(email: str):
 def initialize_scraping_context_maps(email_map):
     """
     Inicializa el contexto de scraping para un mapeo de identificadores y correos electrónicos.
+    Las ubicaciones se consultan de forma concurrente.
 
     :param email_map: Un diccionario donde las claves son identificadores (por ejemplo, ubicaciones)
                       y los valores son correos electrónicos.
@@ -144,20 +197,23 @@ def initialize_scraping_context_maps(email_map):
 
         combined_mapped_data = {"api_key": []}
 
-        for location, email in email_map.items():
-            lodgerin_api = LodgerinInternal()
-            api_key = lodgerin_api.get_api_key(email)
+        def fetch_location(email):
+            api_key = get_api_key(email)
+            return api_key, get_elements(api_key) if api_key else None
+
+        max_workers = max(1, min(LodgerinConfig.CONTEXT_MAX_WORKERS, len(email_map)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch_location, email_map.values()))
+
+        for (location, email), (api_key, elements) in zip(email_map.items(), results):
             if api_key is None:
                 print(f"[warning - initialize_scraping_context_maps] -> El api_key es None para el correo: {email}")
                 continue
 
-            api_client = LodgerinAPI(api_key)
-            elements = api_client.get_elements()
             if elements is None:
                 print(f"[warning - initialize_scraping_context_maps] -> El elements es None para el email: {email}")
                 continue
-            
-            elements = elements.get('data', None)
+
             combined_mapped_data["api_key"].append({
                 "id": email,
                 "location": location,
@@ -346,42 +402,38 @@ def read_json(path_document_json: str) -> list[dict]:
     
     return []
 
-def create_json(item: Union[RentalUnits, Property, RentalUnitsCalendarItem], path_spider: str) -> None:
-    class PathDocument(Enum):
-        PROPERTY = os.path.join(path_spider ,"property.json")
-        RENTAL_UNITS = os.path.join(path_spider ,"rental_units.json")
-        CALENDAR = os.path.join(path_spider ,"calendar.json")
+class PathDocument(Enum):
+    PROPERTY = "property.jsonl"
+    RENTAL_UNITS = "rental_units.jsonl"
+    CALENDAR = "calendar.jsonl"
+
 
-    current_dir = ElementsConfig.PATH_DATA
+def get_json_path(item: Union[RentalUnits, Property, RentalUnitsCalendarItem], path_spider: str) -> str:
     if isinstance(item, RentalUnits):
-        json_file_path = os.path.join(current_dir, PathDocument.RENTAL_UNITS.value)
+        document = PathDocument.RENTAL_UNITS
     elif isinstance(item, Property):
-        json_file_path = os.path.join(current_dir, PathDocument.PROPERTY.value)
+        document = PathDocument.PROPERTY
     elif isinstance(item, RentalUnitsCalendarItem):
-        json_file_path = os.path.join(current_dir, PathDocument.CALENDAR.value)
+        document = PathDocument.CALENDAR
     else:
         raise ValueError(
             "item must be an instance of RentalUnits or Property or Calendar."
         )
+    return os.path.join(ElementsConfig.PATH_DATA, path_spider, document.value)
+
+
+def create_json(item: Union[RentalUnits, Property, RentalUnitsCalendarItem], path_spider: str) -> None:
+    """
+    Agrega el item como una línea a `property.jsonl`, `rental_units.jsonl` o
+    `calendar.jsonl` de la araña. El archivo queda abierto durante la corrida;
+    se cierra con `close_json_files`.
+    """
+    get_writer(get_json_path(item, path_spider)).write(item.model_dump())
 
-    os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
-
-    # Leer el JSON si ya existe
-    if os.path.exists(json_file_path):
-        with open(json_file_path, "r", encoding="utf-8-sig") as json_file:
-            try:
-                data = json.load(json_file)
-                if not isinstance(data, list):
-                    data = []
-            except json.JSONDecodeError:
-                data = [] 
-    else:
-        data = []
 
-    data.append(item.model_dump())
-    with open(json_file_path, "w", encoding="utf-8-sig") as json_file:
-        json.dump(data, json_file, indent=4, ensure_ascii=False)
-    print(f"Datos guardados en: {json_file_path}")
+def close_json_files(path_spider: str) -> None:
+    """Vacía y cierra los archivos abiertos por `create_json` para la araña."""
+    close_writers(os.path.join(ElementsConfig.PATH_DATA, path_spider))
 
 
 def create_rental_unit_code_with_initials(property_referend_code: str, unit_index: int) -> str:
@@ -422,4 +474,144 @@ def load_json(file_path: Path) -> Any:
     Carga un archivo JSON y retorna su contenido.
     """
     with file_path.open('r', encoding='utf-8') as f:
-        return json.load(f)
\ No newline at end of file
+        return json.load(f)
+
+# ------------------------------------------------------------------------------------------
+# Datos JSON embebidos en el HTML (`const postData = [...]`, `"translatedWordsList": [...]`)
+
+EMBEDDED_MAX_LENGTH = 64 * 1024 * 1024
+_JSON_DECODER = json.JSONDecoder()
+_CLOSING_BRACKETS = {"[": "]", "{": "}"}
+# Cadena entre comillas dobles o simples, con escapes
+_JS_STRING = r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\''
+_PYTHON_WORDS = {"true": "True", "false": "False", "null": "None"}
+
+
+def find_embedded_literal(text: str, marker: str) -> Optional[int]:
+    """
+    Posición donde empieza el arreglo u objeto que sigue a `marker`
+    (expresión regular), o None si no existe.
+    """
+    match = re.search(marker, text)
+    if not match:
+        return None
+    start = skip_whitespace(text, match.end())
+    return start if start < len(text) and text[start] in _CLOSING_BRACKETS else None
+
+
+def skip_whitespace(text: str, index: int) -> int:
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return index
+
+
+def scan_literal(text: str, start: int, limit: int) -> Optional[int]:
+    """Posición siguiente al corchete que cierra el que abre en `start`."""
+    if start >= limit or text[start] not in _CLOSING_BRACKETS:
+        return None
+    stack = []
+    quote = None
+    index = start
+    while index < limit:
+        char = text[index]
+        if quote:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in _CLOSING_BRACKETS:
+            stack.append(_CLOSING_BRACKETS[char])
+        elif char in "]}":
+            if not stack or stack.pop() != char:
+                return None
+            if not stack:
+                return index + 1
+        index += 1
+    return None
+
+
+def loads_js(literal: str) -> Any:
+    """
+    Decodifica un literal JSON; si falla por particularidades de JavaScript
+    (comas finales, `undefined`, comillas simples) se intenta corregirlas.
+    Las correcciones no tocan el texto de las cadenas.
+    """
+    try:
+        return json.loads(literal)
+    except ValueError:
+        pass
+    cleaned = sub_outside_strings(r",(?P<close>\s*[\]}])", lambda match: match.group("close"), literal)
+    cleaned = sub_outside_strings(r"\bundefined\b", lambda match: "null", cleaned)
+    try:
+        return json.loads(cleaned)
+    except ValueError:
+        return literal_eval(
+            sub_outside_strings(r"\b(?P<word>true|false|null)\b", lambda match: _PYTHON_WORDS[match.group("word")], cleaned)
+        )
+
+
+def sub_outside_strings(pattern: str, repl: Callable[[re.Match], str], literal: str) -> str:
+    """
+    `re.sub` sobre el literal salvo dentro de las cadenas: cada cadena se
+    consume entera antes de buscar `pattern` (la misma lógica de comillas
+    de `scan_literal`).
+    """
+    return re.sub(
+        f"(?P<string>{_JS_STRING})|{pattern}",
+        lambda match: match.group("string") if match.group("string") is not None else repl(match),
+        literal,
+        flags=re.S,
+    )
+
+
+def extract_embedded_json(text: str, marker: str, default: Any = None, max_length: int = EMBEDDED_MAX_LENGTH) -> Any:
+    """
+    Extrae y decodifica el literal que sigue a `marker`; `default` si no existe
+    o no es válido. Solo si no es JSON estricto se delimita con `scan_literal`
+    (recorre el literal en Python) y se corrige con `loads_js`.
+    """
+    start = find_embedded_literal(text, marker)
+    if start is None:
+        return default
+    try:
+        value, end = _JSON_DECODER.raw_decode(text, start)
+        return value if end - start <= max_length else default
+    except ValueError:
+        pass
+    end = scan_literal(text, start, min(len(text), start + max_length))
+    if end is None:
+        return default
+    try:
+        return loads_js(text[start:end])
+    except (ValueError, SyntaxError):
+        return default
+
+
+def iter_embedded_json_array(text: str, marker: str, max_length: int = EMBEDDED_MAX_LENGTH) -> Iterator[Any]:
+    """
+    Recorre elemento por elemento el arreglo que sigue a `marker`, sin
+    construir la lista completa. Los elementos que no son JSON estricto se
+    decodifican con `loads_js`.
+    """
+    index = find_embedded_literal(text, marker)
+    if index is None or text[index] != "[":
+        return
+    end = min(len(text), index + max_length)
+    index += 1
+
+    while index < end:
+        while index < end and (text[index].isspace() or text[index] == ","):
+            index += 1
+        if index >= end or text[index] == "]":
+            return
+        try:
+            element, index = _JSON_DECODER.raw_decode(text, index)
+        except ValueError:
+            element_end = scan_literal(text, index, end)
+            if element_end is None:
+                return
+            element = loads_js(text[index:element_end])
+            index = element_end
+        yield element
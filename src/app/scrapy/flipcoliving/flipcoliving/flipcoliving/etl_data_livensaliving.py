@@ -228,7 +228,7 @@ def process_property(
     print("Processing property...")
 
     prop_obj = retrive_lodgerin_property(data, elements, address)
-    prop_id = funcs.save_property(prop_obj, api_key)
+    prop_id = funcs.save_property(prop_obj, api_key, Pages.livensaliving.value)
     prop_obj.id = prop_id
     create_json(prop_obj, Pages.livensaliving.value)
     logging.info("Saved property %s", prop_id)
@@ -243,7 +243,7 @@ def process_property(
             rental["features"] = rentals.get("features", [])
             rental["images"] = rentals.get("images", [])
             rent_obj = retrive_lodgerin_rental_units(prop_obj, rental, elements)
-            rent_id = funcs.save_rental_unit(rent_obj, api_key)
+            rent_id = funcs.save_rental_unit(rent_obj, api_key, Pages.livensaliving.value)
             rent_obj.id = rent_id
             create_json(rent_obj, Pages.livensaliving.value)
             logging.info("Saved rental unit %s", rent_id)
@@ -1,6 +1,8 @@
 import re
+import logging
 import unicodedata
-from typing import List
+from functools import partial
+from typing import Iterable, List, Optional
 from logging import Logger
 from pydantic import BaseModel
 
@@ -12,8 +14,6 @@ from app.scrapy.common import (
     get_all_imagenes, 
     create_json, 
     create_rental_unit_code_with_initials,
-    read_json
-
 )
 from app.models.schemas import (
     PriceItem,
@@ -24,17 +24,18 @@ from app.models.schemas import (
     mapping
 )
 from app.scrapy.funcs import (
-    check_and_insert_rental_unit_calendar,
+    sync_rental_unit_calendars,
     detect_language,
     find_feature_keys,
     get_elements_types,
     get_month_dates,
     save_property,
-    save_rental_unit,
+    save_rental_units,
 )
 from app.scrapy.common import remove_accents, search_feature_with_map, extract_id_label, filtrar_ids_validos
 from app.models.features_spider import EquivalencesFlipColinving
 from app.services.csvexport import CsvExporter
+from app.scrapy.parallel import ParallelEtl
 
 
 class RoomData(BaseModel):
@@ -45,46 +46,82 @@ class RoomData(BaseModel):
     images: List[str]
 
 
-def etl_data_flipcoliving(output_path: list[dict], logger: Logger, context) -> None:
-
-    items: list[dict[str, str]] = read_json(output_path)
-
-    if items == []:
-        logger.warning('- La data se encuentra vacia')
-        return None
+def etl_data_flipcoliving(items: Iterable[dict], logger: Logger, context) -> None:
 
     elements_dict = parse_elements(context, mapping)
     api_key = elements_dict["api_key"].data[0].name
-    
-    for index, item in enumerate(items):
-        try:
-            flip_coliving = ETLFlipColiving(elements_dict, api_key)
-            flip_coliving.parse_data(item, logger)
-        except Exception as error:
-            logger.error('error en el item numero %s', index)
-            logger.error('error: %s', error)
+    flip_coliving = ETLFlipColiving(elements_dict, api_key, logger)
+    exporter = CsvExporter(Pages.flipcoliving.value)
+
+    # Las propiedades son independientes: se procesan en paralelo y se
+    # escriben en el orden en que llegaron
+    ParallelEtl(
+        transform=parse_coliving,
+        load=flip_coliving.save_data,
+        emit=partial(export_coliving, exporter=exporter),
+        transform_args=(elements_dict, api_key),
+        logger=logger,
+    ).run(items)
+
+
+def parse_coliving(item: dict, elements_dict, api_key: str) -> tuple:
+    """Construye el Property y las habitaciones (corre en el pool de procesos)."""
+    return ETLFlipColiving(elements_dict, api_key).parse_data(item)
+
+
+def export_coliving(output: tuple, exporter: CsvExporter) -> None:
+    property_item, rental_units_items, calendar_unit_list = output
+    create_json(property_item, Pages.flipcoliving.value)
+    for unit in rental_units_items:
+        create_json(unit, Pages.flipcoliving.value)
+        exporter.process_and_export_to_csv(property_item, unit)
+    for calendar_unit in calendar_unit_list:
+        create_json(calendar_unit, Pages.flipcoliving.value)
 
 
 class ETLFlipColiving:
 
-    def __init__(self, elements_dict: str, api_key: str) -> None:
+    def __init__(self, elements_dict: str, api_key: str, logger: Optional[Logger] = None) -> None:
         self.elements_dict = elements_dict 
         self.api_key = api_key
+        self.logger = logger or logging.getLogger(__name__)
 
-    def save_data_property(self):
-        pass
-
-    def save_data_rental_unit(self):
-        pass
+    def save_data(self, parsed: tuple) -> tuple:
+        property_item, bedrooms, rooms_data, parse_coliving_name = parsed
+        self.save_data_property(property_item)
+        rental_units_items, calendar_unit_list = create_rental_units(
+            property_item, int(bedrooms), rooms_data, self.elements_dict, parse_coliving_name
+        )
+        self.save_data_rental_unit(rental_units_items, calendar_unit_list)
+        return property_item, rental_units_items, calendar_unit_list
+
+    def save_data_property(self, property_item: Property) -> None:
+        property_item.id = save_property(property_item, self.api_key, Pages.flipcoliving.value)
+        self.logger.info("property_id: %s", property_item.id)
+
+    def save_data_rental_unit(self, rental_units_items: List[RentalUnits], calendar_unit_list: list) -> None:
+        # Con el ID de la propiedad, sus rental units se guardan de forma concurrente
+        list_rental_unit_id = save_rental_units(rental_units_items, self.api_key, Pages.flipcoliving.value)
+        for unit, rental_unit_id in zip(rental_units_items, list_rental_unit_id):
+            unit.id = rental_unit_id
+
+        # schedule
+        sync_rental_unit_calendars(
+            [
+                (rental_id, calendar_unit)
+                for rental_id, calendar_unit in zip(list_rental_unit_id, calendar_unit_list)
+                if calendar_unit.startDate not in ("None", None)
+            ],
+            self.api_key,
+        )
 
-    def parse_data(self, item: dict, logger: Logger) -> None:
+    def parse_data(self, item: dict) -> tuple:
         defaults = get_default_values(self.elements_dict)
         item = item["items_output"]
         _, _, _, areaM2, bedrooms = parse_banner_features(item["banner_features"])
         parse_coliving_name = remove_accents(item["parse_coliving_name"][0]).replace(" ", "-")
         result_description = get_all_descriptions(item["parse_description"], parse_coliving_name)
         reference_code = generate_reference_code(item["city_name"], parse_coliving_name)
-        exporter = CsvExporter(Pages.flipcoliving.value)
             
         element_feature = extract_id_label(self.elements_dict["features"].data)
         features_id = search_feature_with_map(
@@ -93,82 +130,50 @@ class ETLFlipColiving:
             EquivalencesFlipColinving.FEATURES,
         )
 
-        try:
-            property_item = Property(
-                referenceCode=reference_code,
-                areaM2=areaM2,
-                rentalType=defaults["rentalType"],
-                isActive=defaults["isActive"],
-                isPublished=defaults["isPublished"],
-                Features=features_id,
-                tourUrl=(
-                    item["tour_url"][0]
-                    if "tour_url" in item and item["tour_url"]
-                    else None
+        property_item = Property(
+            referenceCode=reference_code,
+            areaM2=areaM2,
+            rentalType=defaults["rentalType"],
+            isActive=defaults["isActive"],
+            isPublished=defaults["isPublished"],
+            Features=features_id,
+            tourUrl=(
+                item["tour_url"][0]
+                if "tour_url" in item and item["tour_url"]
+                else None
+            ),
+            PropertyTypeId=defaults["propertiesTypes"],
+            Texts=result_description[0],
+            Images=item.get("all_firts_imagenes", []),
+            Location=LocationAddress(
+                lat=item["latitude"][0],
+                lon=item["longitude"][0],
+                country=defaults["country"],
+                countryCode=defaults["countryCode"],
+                city=item["city_name"],
+            ),
+        )
+
+        rooms_data = [
+            RoomData(
+                areaM2=int(float(rental_unit["data_rental_unit"][1].replace(" sqm", "").replace(",", ".").strip())),
+                amount=int(
+                    rental_unit["data_rental_unit"][0]
+                    .split(" to ")[-1]
+                    .replace("€ /month", "")
+                    .strip()
                 ),
-                PropertyTypeId=defaults["propertiesTypes"],
-                Texts=result_description[0],
-                Images=item.get("all_firts_imagenes", []),
-                Location=LocationAddress(
-                    lat=item["latitude"][0],
-                    lon=item["longitude"][0],
-                    country=defaults["country"],
-                    countryCode=defaults["countryCode"],
-                    city=item["city_name"],
+                schedule=rental_unit["available_rental_unit"][0],
+                title=clean_string(
+                    remove_accents(
+                        rental_unit["name_rental_unit"][0].replace(" ", "_")
+                    )
                 ),
+                images=rental_unit["imagenes_rental_unit"],
             )
-
-            property_id = save_property(property_item, self.api_key)
-            property_item.id = property_id
-            create_json(property_item, Pages.flipcoliving.value)
-            rooms_data = [
-                RoomData(
-                    areaM2=int(float(rental_unit["data_rental_unit"][1].replace(" sqm", "").replace(",", ".").strip())),
-                    amount=int(
-                        rental_unit["data_rental_unit"][0]
-                        .split(" to ")[-1]
-                        .replace("€ /month", "")
-                        .strip()
-                    ),
-                    schedule=rental_unit["available_rental_unit"][0],
-                    title=clean_string(
-                        remove_accents(
-                            rental_unit["name_rental_unit"][0].replace(" ", "_")
-                        )
-                    ),
-                    images=rental_unit["imagenes_rental_unit"],
-                )
-                for rental_unit in item["rental_units"]
-            ]
-            rental_units_items, calendar_unit_list = create_rental_units(
-                property_item, int(bedrooms), rooms_data, self.elements_dict, parse_coliving_name
-            )
-
-            list_rental_unit_id = []
-            for unit in rental_units_items:
-                rental_unit = save_rental_unit(unit, self.api_key)
-                unit.id = rental_unit
-                list_rental_unit_id.append(rental_unit)
-
-            for unit in rental_units_items:
-                create_json(unit, Pages.flipcoliving.value)
-                exporter.process_and_export_to_csv(property_item, unit)
-            
-            # schedule
-            for rental_id, calendar_unit in zip(
-                list_rental_unit_id, calendar_unit_list
-            ):
-                if calendar_unit.startDate in ("None", None):
-                    continue
-                check_and_insert_rental_unit_calendar(rental_id, calendar_unit, self.api_key)
-
-            for calendar_unit in calendar_unit_list:
-                create_json(calendar_unit, Pages.flipcoliving.value)
-
-            return property_item
-
-        except Exception as e:
-            logger.error(f"Error al iniciar el scraping para {str(e)}")
+            for rental_unit in item["rental_units"]
+        ]
+        return property_item, bedrooms, rooms_data, parse_coliving_name
 
 
 def clean_string(text: str) -> str:
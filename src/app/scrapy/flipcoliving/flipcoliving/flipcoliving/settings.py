@@ -48,6 +48,12 @@ ROBOTSTXT_OBEY = True
 #    "flipcoliving.middlewares.FlipcolivingSpiderMiddleware": 543,
 # }
 
+# Modo incremental (-a incremental=1): descarta páginas de detalle sin cambios en el listado
+SPIDER_MIDDLEWARES = {
+   "app.scrapy.frontier.CrawlFrontierMiddleware": 950,
+   "app.scrapy.checkpoint.ResumeMiddleware": 960,
+}
+
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 # DOWNLOADER_MIDDLEWARES = {
@@ -82,7 +88,7 @@ ITEM_PIPELINES = {
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
 # HTTPCACHE_ENABLED = True
-# HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_EXPIRATION_SECS = 7 * 24 * 3600
 # HTTPCACHE_DIR = "httpcache"
 # HTTPCACHE_IGNORE_HTTP_CODES = []
 # HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
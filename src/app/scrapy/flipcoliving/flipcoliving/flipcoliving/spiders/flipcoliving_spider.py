@@ -1,13 +1,10 @@
 # coding=utf-8
 import re
-import json
 import logging
 from os import path
 from pathlib import Path
 
 import scrapy
-import requests
-from scrapy import Selector
 
 from app.scrapy.flipcoliving.flipcoliving.flipcoliving import items
 from app.scrapy.flipcoliving.flipcoliving.flipcoliving.enum_path import (
@@ -17,6 +14,9 @@ from app.scrapy.flipcoliving.flipcoliving.flipcoliving.enum_path import (
 )
 
 from app.models.enums import Pages
+from app.scrapy.common import load_context
+from app.scrapy.aggregator import ItemAggregator
+from app.scrapy.frontier import SIGNATURE_META, listing_signature
 
 class FlipcolivingSpiderSpider(scrapy.Spider):
     name = "flipcoliving_spider"
@@ -54,7 +54,7 @@ class FlipcolivingSpiderSpider(scrapy.Spider):
         # Obtener LOG_FILE desde los argumentos
         log_path = kwargs.pop("LOG_FILE", None)
         self.logger.info(f"log_path: {log_path}")
-        self.context = json.loads(context) if isinstance(context, str) else {}
+        self.context = load_context(context)
 
     def start_requests(self):
         """
@@ -122,6 +122,8 @@ class FlipcolivingSpiderSpider(scrapy.Spider):
         # Recorrer los Coliving
         for coliving_url in colivings_url:
 
+            # Texto de la tarjeta del listado (precio, disponibilidad) para el modo incremental
+            signature = listing_signature(coliving_url.xpath('../..//text()').getall())
             coliving_url = coliving_url.get()
 
             if coliving_url is None:
@@ -142,6 +144,7 @@ class FlipcolivingSpiderSpider(scrapy.Spider):
                     "aux_city_url": items_meta["aux_city_url"],
                     "coliving_url": coliving_url,
                     "coliving_name": coliving_name,
+                    SIGNATURE_META: signature,
                 },
                 headers=GENERAL_HEADERS,
                 callback=self.parse_coliving,
@@ -279,27 +282,42 @@ class FlipcolivingSpiderSpider(scrapy.Spider):
 
         items_output["rental_units"] = items_rental_units
 
+        items_output["descriptions_language"] = {}
+
+        # El item se entrega cuando responden todas las paginas de idiomas
+        aggregator = ItemAggregator(items_output, self.build_coliving_item, name=response.url)
+
         for index_language, url_language in enumerate(all_url):
 
             if index_language == 0:
                 # ingles
                 continue
 
-            description = self.parse_coliving_language(url_language)
-            items_output["parse_description"].append(description)
+            yield aggregator.request(
+                url=url_language,
+                headers=GENERAL_HEADERS,
+                callback=self.parse_coliving_language,
+                cb_kwargs={"index_language": index_language},
+            )
+
+        yield from aggregator.close()
+
+    def build_coliving_item(self, items_output: dict):
+        descriptions_language: dict = items_output.pop("descriptions_language")
+        for index_language in sorted(descriptions_language):
+            items_output["parse_description"].append(descriptions_language[index_language])
 
         item = items.FlipcolivingItem()
         item["items_output"] = items_output
         self.logger.info('Extraida propiedad: %s', items_output['coliving_name'])
         yield item
 
-    def parse_coliving_language(self, url):
-        response_with_requests = requests.get(url)
-        response_with_scrapy = Selector(text=response_with_requests.text)
-        description = response_with_scrapy.xpath(
+    def parse_coliving_language(self, response, aggregator: ItemAggregator, index_language: int):
+        description = response.xpath(
             XpathGeneralColiving.ABOUT_THE_HOME.value
         ).get()
-        return description
+        aggregator.data["descriptions_language"][index_language] = description
+        return ()
 
     def check_data_object(self, data_object: list) -> list:
 
@@ -0,0 +1,201 @@
+import re
+import time
+import hashlib
+import logging
+
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import scrapy
+from scrapy import signals
+
+from app.config.settings import ScraperConfig
+from app.services.storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+# Claves de `Request.meta` usadas por el modo incremental
+SIGNATURE_META = "frontier_signature"
+URL_META = "frontier_url"
+# Atributo con el que se marca el item que sale de una página de detalle
+ITEM_URL_ATTR = "_frontier_url"
+
+
+def listing_signature(*parts: Union[str, Iterable[str], None]) -> str:
+    """
+    Firma de los datos que muestra el listado para una propiedad (nombre,
+    precio, disponibilidad...). Se normalizan los espacios antes del hash.
+    """
+    texts = []
+    for part in parts:
+        if part is None:
+            continue
+        texts.extend([part] if isinstance(part, str) else part)
+    normalized = re.sub(r"\s+", " ", " ".join(texts)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def is_incremental(spider: scrapy.Spider) -> bool:
+    return str(getattr(spider, "incremental", "0")).lower() in ("1", "true")
+
+
+def tag_item(item: Any, url: Optional[str]) -> None:
+    """
+    Asocia el item a la página de detalle de la que salió, si no lo estaba.
+    El modo incremental la registra cuando el item pasa por los pipelines.
+    """
+    if url is None or isinstance(item, scrapy.Request) or getattr(item, ITEM_URL_ATTR, None):
+        return
+    try:
+        setattr(item, ITEM_URL_ATTR, url)
+    except AttributeError:
+        # Items sin atributos (dict): la página se vuelve a descargar en la próxima corrida
+        pass
+
+
+class CrawlFrontier(SqliteStore):
+    """
+    Estado de las páginas de detalle de una araña entre corridas: firma del
+    listado, hash del contenido descargado y cuándo se vio/descargó por última vez.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS frontier (
+            spider TEXT NOT NULL,
+            url TEXT NOT NULL,
+            signature TEXT,
+            content_hash TEXT,
+            last_seen REAL NOT NULL,
+            last_crawled REAL,
+            PRIMARY KEY (spider, url)
+        );
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        spider: str,
+        max_age_days: float = ScraperConfig.FRONTIER_MAX_AGE_DAYS,
+        timeout: float = 30.0,
+    ):
+        super().__init__(db_path, timeout)
+        self.spider = spider
+        self.max_age = max_age_days * 24 * 3600
+
+    def unchanged(self, url: str, signature: str) -> bool:
+        """
+        True si el listado muestra lo mismo que en la última descarga y esta no
+        es más antigua que `max_age` (se fuerza una descarga completa cada tanto).
+        """
+        row = self.connection.execute(
+            "SELECT signature, last_crawled FROM frontier WHERE spider = ? AND url = ?",
+            (self.spider, url),
+        ).fetchone()
+        if row is None or row["last_crawled"] is None or row["signature"] != signature:
+            return False
+        return not (self.max_age and time.time() - row["last_crawled"] > self.max_age)
+
+    def touch(self, url: str) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE frontier SET last_seen = ? WHERE spider = ? AND url = ?",
+                (time.time(), self.spider, url),
+            )
+
+    def record(self, url: str, signature: Optional[str], content_hash: str) -> bool:
+        """
+        Guarda la descarga de una página de detalle. Devuelve True si el
+        contenido cambió respecto a la corrida anterior.
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT content_hash FROM frontier WHERE spider = ? AND url = ?",
+                (self.spider, url),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO frontier "
+                "(spider, url, signature, content_hash, last_seen, last_crawled) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.spider, url, signature, content_hash, now, now),
+            )
+        return row is None or row["content_hash"] != content_hash
+
+
+class CrawlFrontierMiddleware:
+    """
+    Middleware de araña del modo incremental (`-a incremental=1`).
+
+    Las arañas marcan las peticiones a páginas de detalle con la firma del
+    listado (`meta["frontier_signature"]`); si no cambió desde la última
+    descarga la petición se descarta. Sin el argumento no hace nada.
+
+    La página se registra recién cuando su item se entrega (`item_scraped`):
+    si el crawl se detiene antes, se vuelve a descargar en la próxima corrida.
+    Las peticiones que salen de ella llevan su URL, así que el item puede
+    armarse en cualquier callback posterior.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.frontier: Optional[CrawlFrontier] = None
+        # Páginas de detalle descargadas cuyo item todavía no se entregó
+        self.pending: Dict[str, Tuple[Optional[str], str]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler.stats)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(middleware.item_scraped, signal=signals.item_scraped)
+        return middleware
+
+    def spider_opened(self, spider):
+        if is_incremental(spider):
+            self.frontier = CrawlFrontier(ScraperConfig.FRONTIER_DB, spider.name)
+            spider.logger.info("Modo incremental activo (frontier: %s)", ScraperConfig.FRONTIER_DB)
+
+    def spider_closed(self, spider):
+        if self.frontier is not None:
+            self.stats.set_value("frontier/not_emitted", len(self.pending))
+            self.frontier.close()
+
+    def process_spider_output(self, response, result, spider):
+        if self.frontier is None:
+            yield from result
+            return
+
+        url = response.meta.get(URL_META)
+        if url is not None and SIGNATURE_META in response.meta:
+            # Página de detalle: se registra cuando se entregue su item
+            self.pending.setdefault(
+                url, (response.meta[SIGNATURE_META], hashlib.sha256(response.body).hexdigest())
+            )
+
+        for element in result:
+            if isinstance(element, scrapy.Request):
+                if SIGNATURE_META in element.meta:
+                    if self._skip(element):
+                        continue
+                elif url is not None:
+                    element.meta.setdefault(URL_META, url)
+            else:
+                tag_item(element, url)
+            yield element
+
+    def item_scraped(self, item, response, spider):
+        url = getattr(item, ITEM_URL_ATTR, None)
+        if self.frontier is None or url not in self.pending:
+            return
+        changed = self.frontier.record(url, *self.pending.pop(url))
+        self.stats.inc_value(f"frontier/{'changed' if changed else 'unchanged_content'}")
+
+    def _skip(self, request: scrapy.Request) -> bool:
+        if URL_META in request.meta:
+            return False
+        signature = request.meta[SIGNATURE_META]
+        if signature is not None and self.frontier.unchanged(request.url, signature):
+            self.frontier.touch(request.url)
+            self.stats.inc_value("frontier/skipped")
+            return True
+        request.meta[URL_META] = request.url
+        return False
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import re
@@ -11,8 +12,19 @@ from app.models.enums import (
     Month,
     PropertyType,
 )
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, List, Optional, Tuple, TypeVar
 from app.models.schemas import RentalUnitsCalendarItem
-from app.services.lodgerin import LodgerinAPI
+from app.services.calendar_sync import CalendarSync, get_calendar_store
+from app.services.fingerprints import get_fingerprint_store
+from app.services.lodgerin import (
+    RENTAL_UNIT_SAVED_MSG,
+    AsyncLodgerinAPI,
+    RentalUnitBatcher,
+    get_lodgerin_api,
+)
+
+T = TypeVar("T")
 
 os.makedirs(settings.LOG_DIR, exist_ok=True)
 
@@ -126,11 +138,45 @@ def get_elements_types(term, elements):
         return None
 
 
-def save_property(property_item, api_key):
+PROPERTY = "property"
+RENTAL_UNIT = "rental_unit"
+
+
+def get_unchanged_id(provider, kind, item):
+    """
+    ID de Lodgerin guardado si el item no cambió desde el último envío del proveedor.
+    """
+    if not provider or not item.referenceCode:
+        return None
+    lodgerin_id = get_fingerprint_store().unchanged_id(provider, kind, item)
+    if lodgerin_id:
+        logger.info(f"Sin cambios en {kind} {item.referenceCode}, se omite el envío (ID: {lodgerin_id})")
+    return lodgerin_id
+
+
+def record_saved(provider, kind, item, lodgerin_id):
+    if provider and item.referenceCode and lodgerin_id:
+        get_fingerprint_store().record(provider, kind, item, lodgerin_id)
+
+
+def save_property(property_item, api_key, provider=None):
+    """
+    Con `provider` solo se envía la propiedad si su contenido cambió desde el
+    último envío; si no, se devuelve el ID guardado.
+    """
+    property_id = get_unchanged_id(provider, PROPERTY, property_item)
+    if property_id:
+        return property_id
+
     property_dict = property_item.model_dump()
-    lodgerin_api = LodgerinAPI(api_key)
+    lodgerin_api = get_lodgerin_api(api_key)
     response = lodgerin_api.create_or_update_property(property_dict)
+    property_id = parse_property_response(response, property_item)
+    record_saved(provider, PROPERTY, property_item, property_id)
+    return property_id
+
 
+def parse_property_response(response, property_item):
     if response is not None and "msg" in response and "data" in response:
         if response["msg"] == "The property has been saved successfully!":
             data = response["data"]
@@ -145,13 +191,22 @@ def save_property(property_item, api_key):
     return None
 
 
-def save_rental_unit(rental_unit_item, api_key):
+def save_rental_unit(rental_unit_item, api_key, provider=None):
+    rental_unit_id = get_unchanged_id(provider, RENTAL_UNIT, rental_unit_item)
+    if rental_unit_id:
+        return rental_unit_id
+
     rental_unit_dict = rental_unit_item.model_dump()
-    lodgerin_api = LodgerinAPI(api_key)
+    lodgerin_api = get_lodgerin_api(api_key)
     response = lodgerin_api.create_or_update_rental_unit(rental_unit_dict)
+    rental_unit_id = parse_rental_unit_response(response, rental_unit_dict)
+    record_saved(provider, RENTAL_UNIT, rental_unit_item, rental_unit_id)
+    return rental_unit_id
+
 
+def parse_rental_unit_response(response, rental_unit_dict):
     if response is not None and "msg" in response and "data" in response:
-        if response["msg"] == "The rental unit has been saved successfully!":
+        if response["msg"] == RENTAL_UNIT_SAVED_MSG:
             data = response["data"]
             logger.info(
                 f"rental_unit saved successfully! rental_unit ID: {data.get('id')}"
@@ -169,54 +224,93 @@ def save_rental_unit(rental_unit_item, api_key):
 def check_and_insert_rental_unit_calendar(
     rental_unit_id: str, calendar_unit: RentalUnitsCalendarItem, api_key: str
 ):
-    lodgerin_api = LodgerinAPI(api_key)
-    dates_payload = [calendar_unit.model_dump()]
+    sync_rental_unit_calendars([(rental_unit_id, calendar_unit)], api_key)
 
+
+def run_coroutine_sync(coroutine: Awaitable[T]) -> T:
+    """
+    Ejecuta una corrutina desde código síncrono. Los pipelines corren dentro
+    del reactor asyncio de Scrapy, donde ya hay un loop activo: en ese caso la
+    corrutina se ejecuta en un hilo aparte con su propio loop.
+    """
     try:
-        existing_schedule = lodgerin_api.get_rental_unit_calendar(rental_unit_id)
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
 
-        if existing_schedule is None or not existing_schedule.get("data"):
-            logger.info(f"Inserting new dates for rental unit ID {rental_unit_id}")
-            response = lodgerin_api.create_rental_unit_calendar(
-                rental_unit_id, dates_payload
-            )
-            if response:
-                logger.info(
-                    f"Successfully inserted dates for rental unit ID {rental_unit_id}"
-                )
-            else:
-                logger.info(
-                    f"Error inserting dates for rental unit ID {rental_unit_id}"
-                )
 
-        else:
-            existing_end_dates = {
-                event["endDate"] for event in existing_schedule["data"]
-            }
-            exists = any(
-                payload["endDate"] in existing_end_dates for payload in dates_payload
-            )
-            if exists:
-                logger.info(
-                    f"Rental unit ID {rental_unit_id} already has the correct end date."
-                )
-
-            else:
-                logger.info(f"Updating end date for rental unit ID {rental_unit_id}")
-                response = lodgerin_api.create_rental_unit_calendar(
-                    rental_unit_id, dates_payload
-                )
-                if response:
-                    logger.info(
-                        f"Successfully updated end date for rental unit ID {rental_unit_id}"
-                    )
-                else:
-                    logger.info(
-                        f"Error updating end date for rental unit ID {rental_unit_id}"
-                    )
+def save_properties(property_items: list, api_key: str, provider=None) -> List[Optional[str]]:
+    """
+    Guarda varias propiedades de forma concurrente. Devuelve los IDs en el
+    mismo orden (None para las que fallaron). Con `provider` se omiten las
+    que no cambiaron.
+    """
+    property_ids = [get_unchanged_id(provider, PROPERTY, item) for item in property_items]
+    changed = [index for index, property_id in enumerate(property_ids) if not property_id]
+
+    async def _save():
+        async with AsyncLodgerinAPI(api_key) as lodgerin_api:
+            return await asyncio.gather(*(
+                lodgerin_api.create_or_update_property(property_items[index].model_dump())
+                for index in changed
+            ))
+
+    if changed:
+        for index, response in zip(changed, run_coroutine_sync(_save())):
+            property_ids[index] = parse_property_response(response, property_items[index])
+            record_saved(provider, PROPERTY, property_items[index], property_ids[index])
+    return property_ids
+
 
+def save_rental_units(rental_unit_items: list, api_key: str, provider=None) -> List[Optional[str]]:
+    """
+    Guarda las unidades de renta de una propiedad (ya guardada) en lotes,
+    asignando el ID devuelto a cada una. Devuelve los IDs en el mismo orden
+    (None para las que fallaron). Con `provider` se omiten las que no cambiaron.
+    """
+    changed = []
+    for item in rental_unit_items:
+        item.id = get_unchanged_id(provider, RENTAL_UNIT, item)
+        if not item.id:
+            changed.append(item)
+
+    async def _save():
+        async with AsyncLodgerinAPI(api_key) as lodgerin_api:
+            batcher = RentalUnitBatcher(lodgerin_api)
+            for item in changed:
+                batcher.add(item)
+            await batcher.flush()
+
+    if changed:
+        run_coroutine_sync(_save())
+        for item in changed:
+            record_saved(provider, RENTAL_UNIT, item, item.id)
+        logger.info(
+            f"rental_units saved: {sum(1 for item in changed if item.id)}/{len(changed)} "
+            f"({len(rental_unit_items) - len(changed)} sin cambios)"
+        )
+    return [item.id for item in rental_unit_items]
+
+
+def sync_rental_unit_calendars(
+    calendars: List[Tuple[str, RentalUnitsCalendarItem]], api_key: str
+) -> None:
+    """
+    Envía a Lodgerin solo los rangos de calendario nuevos respecto a la copia
+    local, para una lista de pares (rental_unit_id, calendar_unit).
+    """
+    async def _sync():
+        async with AsyncLodgerinAPI(api_key) as lodgerin_api:
+            await CalendarSync(lodgerin_api, get_calendar_store()).sync(calendars)
+
+    if not calendars:
+        return
+    try:
+        run_coroutine_sync(_sync())
     except Exception as e:
-        logger.info(f"An error occurred for rental unit ID {rental_unit_id}: {e}")
+        logger.error(f"An error occurred while syncing calendars: {e}")
 
 
 def remove_html(text):
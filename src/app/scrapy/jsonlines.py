@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+JSONL_EXTENSION = ".jsonl"
+
+
+def dump_line(item: dict) -> str:
+    return json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    """
+    Recorre un archivo JSON Lines sin cargarlo completo en memoria. Las líneas
+    inválidas (p. ej. la última si el proceso murió escribiéndola) se omiten.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning("Línea %d inválida en %s", number, path)
+
+
+class JsonLinesWriter:
+    """
+    Escritor de solo anexado: un objeto JSON por línea con un único archivo
+    abierto durante la corrida. El buffer se vacía cada `flush_every` items o
+    `flush_interval` segundos, y `fsync` hace lo mismo contra el disco.
+    """
+
+    def __init__(self, path: str, flush_every: int = 100, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+
+    def write(self, item: dict) -> None:
+        line = dump_line(item)
+        with self._lock:
+            self._file.write(line)
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def fsync(self) -> None:
+        with self._lock:
+            self._flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def _flush(self) -> None:
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def convert_json_to_jsonl(json_path: str, jsonl_path: Optional[str] = None) -> Optional[str]:
+    """
+    Convierte un arreglo JSON con indentación (formato anterior de
+    `property.json`, `rental_units.json`, ...) a JSON Lines. El archivo
+    original se renombra a `.json.bak`. Devuelve la ruta del `.jsonl` o None
+    si no había nada que convertir.
+    """
+    if not os.path.exists(json_path):
+        return None
+    jsonl_path = jsonl_path or os.path.splitext(json_path)[0] + JSONL_EXTENSION
+
+    try:
+        with open(json_path, "r", encoding="utf-8-sig") as file:
+            data = json.load(file)
+    except ValueError:
+        logger.warning("No se pudo convertir %s: no es un JSON válido", json_path)
+        return None
+    if isinstance(data, dict):
+        data = [data]
+
+    with JsonLinesWriter(jsonl_path) as writer:
+        for item in data:
+            writer.write(item)
+    os.replace(json_path, json_path + ".bak")
+    logger.info("Convertidos %d registros de %s a %s", len(data), json_path, jsonl_path)
+    return jsonl_path
+
+
+_writers: dict[str, JsonLinesWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path: str) -> JsonLinesWriter:
+    """
+    Escritor compartido para `path` durante la corrida. La primera vez se
+    migra el `.json` del formato anterior si existe.
+    """
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None or writer.closed:
+            legacy_path = os.path.splitext(path)[0] + ".json"
+            if not os.path.exists(path) and os.path.exists(legacy_path):
+                convert_json_to_jsonl(legacy_path, path)
+            writer = _writers[path] = JsonLinesWriter(path)
+        return writer
+
+
+def close_writers(directory: Optional[str] = None) -> None:
+    """
+    Cierra los escritores abiertos (solo los de `directory` si se indica).
+    """
+    with _writers_lock:
+        for path in list(_writers):
+            if directory is None or os.path.normpath(os.path.dirname(path)) == os.path.normpath(directory):
+                _writers.pop(path).close()
+
+
+atexit.register(close_writers)
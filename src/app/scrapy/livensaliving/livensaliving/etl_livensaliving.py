@@ -1,19 +1,11 @@
 from logging import Logger
 from pprint import pprint
 from scrapy import Spider
-from app.scrapy.common import read_json
+from typing import Iterable
 
 
 
-def etl_data_livensaliving(output_path_data: str, spider: Spider, logger: Logger):
-    
-    # Obtener la data extraida de la arana
-    all_data = read_json(output_path_data)
-
-    # Verificar si hay informacion extraida o existe el documento
-    if not all_data:
-        logger.warning('No existe data o el archivo para refinar. Chequear')
-        return None
+def etl_data_livensaliving(all_data: Iterable[dict], spider: Spider, logger: Logger):
     
     extractor = ExtractorLivensaliving(logger)
     extractor.parse_main_data(all_data)
@@ -24,7 +16,7 @@ class ExtractorLivensaliving:
     def __init__(self, logger: Logger):
         self.logger: Logger = logger
 
-    def parse_main_data(self, all_data: list[dict]):
+    def parse_main_data(self, all_data: Iterable[dict]):
         
         for index_property, info_property in enumerate(all_data):
             main_data_property: dict = info_property.get('items_output', {}).get("main_data_property", {})
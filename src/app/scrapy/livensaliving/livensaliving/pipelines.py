@@ -1,29 +1,12 @@
-from os import path
+from typing import Iterator
 from scrapy import Spider
-from app.scrapy.common import save_to_json_file
-from app.scrapy.livensaliving.livensaliving.items import LivensalivingItem
+from app.models.enums import Pages
+from app.scrapy.pipelines import StreamingJsonLinesPipeline
 from app.scrapy.livensaliving.livensaliving.etl_livensaliving import etl_data_livensaliving
 
 
-class LivensalivingPipeline:
-    def open_spider(self, spider: Spider) -> None:
-        self.items = []
-        self.output_path: str = path.join(
-            spider.items_spider_output_document["output_folder"],
-            spider.items_spider_output_document["file_name"],
-        )
+class LivensalivingPipeline(StreamingJsonLinesPipeline):
+    page = Pages.livensaliving.value
 
-    def process_item(self, item: LivensalivingItem, spider: Spider) -> dict:
-        self.items.append(dict(item))
-        return item
-
-    def close_spider(self, spider: Spider) -> None:
-
-        if spider.items_spider_output_document['refine'] == '1':
-            spider.logger.info("- Refining data")
-        else:
-            spider.logger.info("- JSON file created with %d items.", len(self.items))
-            save_to_json_file(self.items, self.output_path)
-
-        etl_data_livensaliving(self.output_path, spider, spider.logger)
-        spider.logger.info("close_spider")
+    def run_etl(self, items: Iterator[dict], spider: Spider) -> None:
+        etl_data_livensaliving(items, spider, spider.logger)
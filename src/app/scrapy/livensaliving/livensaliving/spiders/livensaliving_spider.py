@@ -1,5 +1,4 @@
 import re
-import json
 import scrapy
 from os import path
 from pathlib import Path
@@ -12,6 +11,8 @@ from app.scrapy.livensaliving.livensaliving.config_enum import (
     ConfigProperty,
     ConfigRentalUnits
 )
+from app.scrapy.common import load_context
+from app.scrapy.frontier import SIGNATURE_META, listing_signature
 
 
 class LivensalivingSpiderSpider(scrapy.Spider):
@@ -46,7 +47,7 @@ class LivensalivingSpiderSpider(scrapy.Spider):
         Path(self.items_spider_output_document["output_folder"]).mkdir(
             parents=True, exist_ok=True
         )
-        self.context = json.loads(context) if context else {}
+        self.context = load_context(context)
 
     def start_requests(self):
         if self.items_spider_output_document['refine'] == '1':
@@ -124,7 +125,12 @@ class LivensalivingSpiderSpider(scrapy.Spider):
 
             yield scrapy.Request(
                 info_property['url'],
-                meta={'output_item': output_item},
+                meta={
+                    'output_item': output_item,
+                    SIGNATURE_META: listing_signature(
+                        info_property['name'], info_property['title'], info_property['description']
+                    ),
+                },
                 dont_filter=True,
                 callback=self.parse_property
             )
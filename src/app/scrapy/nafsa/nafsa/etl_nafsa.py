@@ -3,18 +3,10 @@ import re
 import pandas as pd
 from logging import Logger
 from scrapy import Spider
-from app.scrapy.common import read_json
+from typing import Iterable
 
 
-def etl_data_nafsa(output_path_data_not_refine: str, spider: Spider, logger: Logger):
-    
-    # Obtener la data extraida de la arana
-    all_data = read_json(output_path_data_not_refine)
-
-    # Verificar si hay informacion extraida o existe el documento
-    if not all_data:
-        logger.warning('No existe data o el archivo para refinar. Chequear')
-        return None
+def etl_data_nafsa(all_data: Iterable[dict], spider: Spider, logger: Logger):
     
     output_data_lodgerin = {
         "name": [],
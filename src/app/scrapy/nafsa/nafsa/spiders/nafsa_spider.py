@@ -1,5 +1,4 @@
 import re
-import json
 import scrapy
 from os import path
 from pathlib import Path
@@ -10,6 +9,7 @@ from app.scrapy.nafsa.nafsa.config_enum import (
     XpathTable,
     XpathInfoAttendees,
 )
+from app.scrapy.common import load_context
 
 
 class NafsaSpiderSpider(scrapy.Spider):
@@ -44,7 +44,7 @@ class NafsaSpiderSpider(scrapy.Spider):
         Path(self.items_spider_output_document["output_folder"]).mkdir(
             parents=True, exist_ok=True
         )
-        self.context = json.loads(context) if context else {}
+        self.context = load_context(context)
 
     def start_requests(self):
         if self.items_spider_output_document['refine'] == '1':
@@ -23,6 +23,9 @@ class ConfigPages(Enum):
         "//a[contains(text(), 'Contact us')]"
     )
 
+    # Slot de descarga compartido por todas las APIs *.greenlts.es (DOWNLOAD_SLOTS en settings.py)
+    GREENLTS_SLOT = "greenlts.es"
+
 class ConfigXpathProperty(Enum):
     
     NAME = "//title//text()"
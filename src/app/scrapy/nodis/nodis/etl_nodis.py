@@ -2,11 +2,10 @@ import json
 from scrapy import Spider
 from logging import Logger
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 
 from app.scrapy.nodis.nodis.spiders.nodis_spider import clean_data
 from app.scrapy.common import (
-    read_json,
     parse_elements,
     extract_id_label,
     get_id_from_name,
@@ -36,15 +35,10 @@ from app.scrapy.common import (
 from app.services.csvexport import CsvExporter
 
 
-def etl_data_nodis(output_path: str, spider: Spider, logger: Logger):
-    
-    items: list[dict[str, str]] = read_json(output_path)
-    if items == []:
-        logger.warning('- No existe informacion en el archivo JSON para refinar')
-        return None
-    
+def etl_data_nodis(items: Iterable[dict], spider: Spider, logger: Logger):
+
     extractor_data_etl = ExtractorData(items, logger)
-    output_data_nodis = list(extractor_data_etl.extractor_main_info())
+    output_data_nodis = extractor_data_etl.extractor_main_info()
 
     # TODO: Realzar el proceso de guardar la informacion para Lodgerin con la "output_data_nodis"
     
@@ -60,7 +54,7 @@ def etl_data_nodis(output_path: str, spider: Spider, logger: Logger):
 class ExtractorData:
     
     def __init__(self, items, logger):
-        self.items: list[str, dict] = items
+        self.items: Iterable[dict] = items
         self.logger: Logger = logger
     
     def extractor_main_info(self):
@@ -373,7 +367,7 @@ def process_property(
     Procesa una propiedad y sus unidades de renta, guarda en API, exporta CSV y JSON.
     """
     prop_obj = retrive_lodgerin_property(data, elements)
-    prop_id = funcs.save_property(prop_obj, api_key)
+    prop_id = funcs.save_property(prop_obj, api_key, Pages.nodis.value)
     prop_obj.id = prop_id
     create_json(prop_obj, Pages.nodis.value)
     Logger.info("Saved property %s", prop_id)
@@ -382,7 +376,7 @@ def process_property(
     if rentals:
         for rental in rentals:
             rent_obj = retrive_lodgerin_rental_units(prop_obj, rental)
-            rent_id = funcs.save_rental_unit(rent_obj, api_key)
+            rent_id = funcs.save_rental_unit(rent_obj, api_key, Pages.nodis.value)
             rent_obj.id = rent_id
             create_json(rent_obj, Pages.nodis.value)
             Logger.info("Saved rental unit %s", rent_id)
@@ -30,6 +30,12 @@ ROBOTSTXT_OBEY = False
 #CONCURRENT_REQUESTS_PER_DOMAIN = 16
 #CONCURRENT_REQUESTS_PER_IP = 16
 
+# Las APIs de los rental units estan en un subdominio de greenlts.es por residencia;
+# se agrupan en un unico slot para limitar la concurrencia contra ese proveedor
+DOWNLOAD_SLOTS = {
+    "greenlts.es": {"concurrency": 4, "delay": 0.5},
+}
+
 # Disable cookies (enabled by default)
 #COOKIES_ENABLED = False
 
@@ -48,6 +54,12 @@ ROBOTSTXT_OBEY = False
 #    "nodis.middlewares.NodisSpiderMiddleware": 543,
 #}
 
+# Modo incremental (-a incremental=1): descarta páginas de detalle sin cambios en el listado
+SPIDER_MIDDLEWARES = {
+   "app.scrapy.frontier.CrawlFrontierMiddleware": 950,
+   "app.scrapy.checkpoint.ResumeMiddleware": 960,
+}
+
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #DOWNLOADER_MIDDLEWARES = {
@@ -82,7 +94,7 @@ ITEM_PIPELINES = {
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
 #HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_EXPIRATION_SECS = 7 * 24 * 3600
 #HTTPCACHE_DIR = "httpcache"
 #HTTPCACHE_IGNORE_HTTP_CODES = []
 #HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
@@ -2,7 +2,6 @@ import json
 from pprint import pprint
 import re
 import scrapy
-import requests
 from os import path
 from pathlib import Path
 from typing import Optional
@@ -13,6 +12,14 @@ from app.scrapy.nodis.nodis.config_enum import (
     ConfigPages, 
     ConfigXpathProperty 
 )
+from app.scrapy.common import load_context
+from app.scrapy.aggregator import ItemAggregator
+from app.scrapy.frontier import SIGNATURE_META
+
+
+LANGUAGE_CODES: dict[str, tuple[str, str]] = {
+    "en-GB": ("en-GB", "en"),
+}
 
 
 class NodisSpiderSpider(scrapy.Spider):
@@ -46,7 +53,7 @@ class NodisSpiderSpider(scrapy.Spider):
         Path(self.items_spider_output_document["output_folder"]).mkdir(
             parents=True, exist_ok=True
         )
-        self.context = json.loads(context) if context else {}
+        self.context = load_context(context)
 
     def start_requests(self):
         if self.items_spider_output_document['refine'] == '1':
@@ -73,38 +80,65 @@ class NodisSpiderSpider(scrapy.Spider):
                 self.logger.warning('Chequear. Existe url de Property nueva: %s', response.url)
                 continue
             
-            output = self.parse_main_property_and_rental(url_property)
-            if output is None:
-                self.logger.warning('La url: %s fallo en la busqueda', url_property)
-                continue
-            
-            parse_item = NodisItem()
-            parse_item['items_output'] = output
-            yield parse_item
+            yield scrapy.Request(
+                url_property,
+                callback=self.parse_main_property_and_rental,
+                errback=self.error_main_property,
+                cb_kwargs={'url_property': url_property},
+                # Sin datos de listado: el modo incremental la registra pero nunca la descarta
+                meta={SIGNATURE_META: None},
+            )
             # break
-    
-    def parse_main_property_and_rental(self, url_property: str):
-        response_property = requests.get(url_property)
-        if response_property.status_code != 200:
-            return None
-        response = Selector(text=response_property.text)
+
+    def error_main_property(self, failure):
+        self.logger.warning('La url: %s fallo en la busqueda', failure.request.url)
+
+    def parse_main_property_and_rental(self, response: Selector, url_property: str):
         property: dict = self.parse_data_property(response)
         output = {
             'url_property': url_property,
             'property': property,
             'rental': []
         }
+
+        # El item se entrega cuando responden el idioma y la API de los rental units
+        aggregator = ItemAggregator(output, self.build_item, name=url_property)
+
+        url_property_language = self.get_url_other_language(response, 'en-GB')
+        if url_property_language is not None:
+            yield aggregator.request(
+                url_property_language,
+                callback=self.parse_description_other_language,
+                cb_kwargs={'language_code': 'en-GB'},
+            )
+
+        aux_url_rental_units = self.get_url_rental_units(url_property, property)
+        if aux_url_rental_units is not None:
+            url_data = aux_url_rental_units.replace('/lang/en', '') + "/api/app/data"
+            yield aggregator.request(
+                url_data,
+                callback=self.parse_rental_api_data,
+                meta={'download_slot': ConfigPages.GREENLTS_SLOT.value},
+            )
+
+        yield from aggregator.close()
+
+    def build_item(self, output: dict):
+        parse_item = NodisItem()
+        parse_item['items_output'] = output
+        yield parse_item
+
+    def get_url_rental_units(self, url_property: str, property: dict) -> Optional[str]:
         aux_url_rental_units = property.get('URL_RENTAL_UNIT', None)
         if aux_url_rental_units is None or re.search(r'contacto', aux_url_rental_units):
             # No presenta rental units
-            return output
+            return None
         
         if re.search(r'stephouse', aux_url_rental_units) and re.search('malaga', aux_url_rental_units):
             # El caso es para Malaga
             # Caso Particular. Tomado por Default la fuente del rental
             aux_url_rental_units = "https://stephousemalagaparmenides.greenlts.es/"
             property['URL_RENTAL_UNIT'] = aux_url_rental_units
-            pass
 
         elif not re.search(r'greenlts', aux_url_rental_units):
             self.logger.info(
@@ -112,15 +146,9 @@ class NodisSpiderSpider(scrapy.Spider):
                 url_property, 
                 aux_url_rental_units
             )
-            return output
-
-        data_hotel_and_rental_units = self.parse_rental_api_data(aux_url_rental_units)
-        if data_hotel_and_rental_units is None:
-            return output
+            return None
 
-        output['property']['info_hotel_property'] = data_hotel_and_rental_units['info_hotel_property']
-        output['rental'] = data_hotel_and_rental_units['output_rental_units']
-        return output
+        return aux_url_rental_units
 
     def parse_data_property(self, response: Selector) -> dict:
         items_property = {
@@ -144,7 +172,11 @@ class NodisSpiderSpider(scrapy.Spider):
         items_property['property_name'] = clean_property_name(items_property['property_name'])
         items_property['property_images'] = check_images(items_property['property_images'])
 
-        items_property['property_description_en'] = self.parse_description_other_language(response, 'en-GB')
+        # Se completa con la pagina en ingles (parse_description_other_language)
+        items_property['property_description_en'] = {
+            "property_description_1_en": '',
+            "property_description_2_en": '',
+        }
 
         # Existen casos donde solo presenta un formulario
         flag_rental_units = True if not response.xpath(ConfigPages.CONTACT.value) else False
@@ -154,79 +186,36 @@ class NodisSpiderSpider(scrapy.Spider):
         )
         return items_property
     
-    def parse_description_other_language(self, response: Selector, language_code: str) -> dict[str, str]:
-
-        code = {
-            "en-GB": ("en-GB", "en"),
-        }.get(language_code, None)
-
+    def get_url_other_language(self, response: Selector, language_code: str) -> Optional[str]:
+        code = LANGUAGE_CODES.get(language_code, None)
         if code is None:
-            return {
-                "property_description_1_en": '',
-                "property_description_2_en": '',
-            }
-
-        url_property_language = response.xpath(f"//a[contains(@hreflang, '{code[0]}')]/@href").get()
-
-        if url_property_language is None:
-            return {
-                "property_description_1_en": '',
-                "property_description_2_en": '',
-            }
-
-        response_property_language = requests.get(url_property_language)
-        if response_property_language.status_code != 200:
-            return {
-                f"property_description_1_{code[1]}": '',
-                f"property_description_2_{code[1]}": '',
-            }
+            return None
+        return response.xpath(f"//a[contains(@hreflang, '{code[0]}')]/@href").get()
 
-        response_language = Selector(text=response_property_language.text)
+    def parse_description_other_language(self, response: Selector, aggregator: ItemAggregator, language_code: str):
 
-        description_output = {
-            f"property_description_1_{code[1]}": response_language.xpath(ConfigXpathProperty.DESCRIPTION_1.value).getall(),
-            f"property_description_2_{code[1]}": response_language.xpath(ConfigXpathProperty.DESCRIPTION_2.value).getall(),
+        code = LANGUAGE_CODES[language_code]
+        aggregator.data['property'][f"property_description_{code[1]}"] = {
+            f"property_description_1_{code[1]}": response.xpath(ConfigXpathProperty.DESCRIPTION_1.value).getall(),
+            f"property_description_2_{code[1]}": response.xpath(ConfigXpathProperty.DESCRIPTION_2.value).getall(),
         }
+        return ()
 
-        return description_output
-
-
-    def parse_rental_api_data(self, url_base: str) -> Optional[dict]:
-        url_base = url_base.replace('/lang/en', '')
-        url_api = url_base + "/api"
-        url_data = url_base + "/api/app/data"
-
-        api_info = requests.get(url_api)
-        data_info = requests.get(url_data)
-        
-        if all([api_info.status_code != 200, data_info.status_code != 200]):
-            self.logger.warning('Problemas para obtener los rental units de:  %s', url_base)
-            return None
-        
+    def parse_rental_api_data(self, response, aggregator: ItemAggregator):
         try:
-            api_info: dict = api_info.json()
-            data_info: dict = data_info.json()
+            data_info: dict = json.loads(response.body)
         except Exception as error:
-            self.logger.warning('Problemas para obtener los rental units de:  %s', [url_api, url_data])
-            return None
+            self.logger.warning('Problemas para obtener los rental units de:  %s', response.url)
+            return ()
 
         info_hotel_property = data_info.get('data', {}).get('data', {}).get("hotel", {})
         all_rental_units = data_info.get('data', {}).get('data', {}).get("masters", {}).get("roomTypes", [])
-        
-        if all_rental_units == []:
-            return {
-                "info_hotel_property": info_hotel_property, 
-                "output_rental_units" : []
-            }
 
-        output_rental_units = self.extractor_info_rental_unit(all_rental_units)
+        # TODO: Buscar en /api si existe data relevante de los rental_units (Pendiente si es necesario)
 
-        # TODO: Buscar en api_info si existe data relevante de los rental_units (Pendiente si es necesario)
-
-        return {
-                "info_hotel_property": info_hotel_property, 
-                "output_rental_units" : output_rental_units
-            }
+        aggregator.data['property']['info_hotel_property'] = info_hotel_property
+        aggregator.data['rental'] = self.extractor_info_rental_unit(all_rental_units) if all_rental_units else []
+        return ()
 
     def extractor_info_rental_unit(self, all_rental_units: list[dict]) -> dict[str, str]:
         output = []
@@ -0,0 +1,122 @@
+import logging
+import multiprocessing
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from app.config.settings import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+# Argumentos comunes de `transform` en cada proceso del pool (se envían una sola vez)
+_transform_args: tuple = ()
+
+
+class Skip(NamedTuple):
+    """
+    Resultado de `transform` para omitir una propiedad. El motivo se registra
+    con el logger del ETL: los procesos del pool no tienen el de la araña.
+    """
+
+    reason: str
+
+
+def _init_process(transform_args: tuple) -> None:
+    global _transform_args
+    _transform_args = transform_args
+
+
+def _transform_in_process(transform: Callable, item: Any) -> Any:
+    return transform(item, *_transform_args)
+
+
+class ParallelEtl:
+    """
+    ETL en paralelo por propiedad, en tres etapas:
+
+    - `transform(item, *transform_args)`: construcción de modelos, regex y
+      mapeo de features (CPU, sin red). Corre en un pool de procesos, así
+      que debe ser una función de módulo con argumentos serializables.
+      Devuelve `Skip(motivo)` o None para omitir la propiedad.
+    - `load(result)`: geocodificación y guardado en Lodgerin (I/O), en un
+      pool de hilos que comparte las cachés del proceso principal.
+    - `emit(output)`: JSON de salida y CSV, en el hilo que llama y en el
+      mismo orden de los items.
+
+    Como mucho `window` propiedades están en curso a la vez, así que los
+    items pueden venir de un iterador sin cargarlos completos. Un error en
+    una propiedad se registra y no afecta a las demás.
+    Con `processes=0` la transformación corre en el pool de hilos.
+    """
+
+    def __init__(
+        self,
+        transform: Callable[..., Any],
+        load: Optional[Callable[[Any], Any]] = None,
+        emit: Optional[Callable[[Any], None]] = None,
+        transform_args: tuple = (),
+        logger: logging.Logger = logger,
+        processes: int = ScraperConfig.ETL_PROCESSES,
+        threads: int = ScraperConfig.ETL_THREADS,
+        window: Optional[int] = None,
+    ):
+        self.transform = transform
+        self.load = load
+        self.emit = emit
+        self.transform_args = transform_args
+        self.logger = logger
+        self.processes = processes
+        self.threads = max(1, threads)
+        self.window = window or 2 * self.threads
+        self.processed = 0
+        self.errors = 0
+
+    def run(self, items: Iterable[Any]) -> int:
+        """Procesa los items y devuelve cuántas propiedades fallaron."""
+        process_pool = None
+        if self.processes > 0:
+            process_pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process,
+                initargs=(self.transform_args,),
+            )
+        thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="etl")
+        pending: deque = deque()
+        try:
+            for index, item in enumerate(items):
+                if process_pool is not None:
+                    transformed = process_pool.submit(_transform_in_process, self.transform, item)
+                else:
+                    transformed = thread_pool.submit(self.transform, item, *self.transform_args)
+                pending.append((index, thread_pool.submit(self._load, transformed)))
+                while len(pending) >= self.window:
+                    self._emit(*pending.popleft())
+            while pending:
+                self._emit(*pending.popleft())
+        finally:
+            thread_pool.shutdown(wait=True, cancel_futures=True)
+            if process_pool is not None:
+                process_pool.shutdown(wait=True, cancel_futures=True)
+
+        self.logger.info("ETL paralelo: %d propiedades, %d con errores", self.processed, self.errors)
+        return self.errors
+
+    def _load(self, transformed: Future) -> Any:
+        result = transformed.result()
+        if result is None or isinstance(result, Skip) or self.load is None:
+            return result
+        return self.load(result)
+
+    def _emit(self, index: int, loaded: Future) -> None:
+        self.processed += 1
+        try:
+            output = loaded.result()
+            if isinstance(output, Skip):
+                self.logger.warning("Se omite la propiedad número %s: %s", index, output.reason)
+            elif output is not None and self.emit is not None:
+                self.emit(output)
+        except Exception:
+            self.errors += 1
+            self.logger.exception("Error en la propiedad número %s", index)
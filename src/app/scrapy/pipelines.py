@@ -0,0 +1,200 @@
+import os
+import queue
+import logging
+import threading
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Iterator, Optional
+
+from scrapy import Spider
+from twisted.internet import threads
+from twisted.internet.defer import Deferred
+
+from app.config.settings import ScraperConfig
+from app.scrapy.checkpoint import crawl_interrupted, get_jobdir, has_pending_requests
+from app.scrapy.common import close_json_files
+from app.scrapy.jsonlines import JSONL_EXTENSION, JsonLinesWriter, convert_json_to_jsonl, read_jsonl
+
+
+_DONE = object()
+
+
+class EtlStage:
+    """
+    Ejecuta el ETL en un hilo aparte que consume los items de una cola a
+    medida que la araña los produce: la sincronización con Lodgerin se solapa
+    con el crawl en lugar de empezar en `close_spider`. El hilo arranca con
+    el primer item, así que sin items el ETL no se ejecuta.
+
+    Pasados `maxsize` items en espera, `put` devuelve un Deferred que el
+    hilo del ETL resuelve (vía `reactor.callFromThread`) al consumir un item;
+    ningún hilo queda bloqueado esperando lugar en la cola.
+    """
+
+    def __init__(
+        self,
+        run_etl: Callable[[Iterator[dict]], None],
+        logger: logging.Logger,
+        maxsize: int = ScraperConfig.ETL_QUEUE_SIZE,
+    ):
+        self.run_etl = run_etl
+        self.logger = logger
+        self.maxsize = maxsize
+        self.queue: queue.Queue = queue.Queue()
+        self.waiters: deque = deque()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="etl-stage", daemon=True)
+
+    def put(self, record: dict) -> Optional[Deferred]:
+        """
+        Encola un item. Si ya hay `maxsize` en espera devuelve un Deferred que
+        se resuelve cuando el ETL consume uno, sin bloquear el reactor.
+        """
+        if self.thread.ident is None:
+            self.thread.start()
+        with self.lock:
+            self.queue.put_nowait(record)
+            if self.queue.qsize() <= self.maxsize:
+                return None
+            waiter = Deferred()
+            self.waiters.append(waiter)
+            return waiter
+
+    def finish(self) -> None:
+        """
+        Espera a que el ETL procese los items encolados. Bloquea hasta que
+        termina, así que no debe llamarse desde el hilo del reactor.
+        """
+        if self.thread.ident is None:
+            return
+        self.queue.put_nowait(_DONE)
+        self.thread.join()
+
+    def iter_queue(self) -> Iterator[dict]:
+        # Import diferido: Scrapy instala el reactor asyncio antes de usarlo
+        from twisted.internet import reactor
+
+        while True:
+            record = self.queue.get()
+            with self.lock:
+                # Se liberó un lugar: la araña que espera más tiempo puede seguir
+                if self.waiters:
+                    reactor.callFromThread(self.waiters.popleft().callback, None)
+            if record is _DONE:
+                return
+            yield record
+
+    def _run(self) -> None:
+        items = self.iter_queue()
+        try:
+            self.run_etl(items)
+        except Exception:
+            self.logger.exception("Error en el ETL; se descartan los items restantes")
+        # Si el ETL terminó antes de tiempo se vacía la cola para no frenar a la araña
+        for _ in items:
+            pass
+
+
+class StreamingJsonLinesPipeline(ABC):
+    """
+    Base de los pipelines de las arañas: cada item se escribe en
+    `<file_name>.jsonl` apenas llega, en lugar de acumularse en memoria
+    hasta `close_spider`.
+
+    Cada item también pasa a una `EtlStage`, que ejecuta el ETL mientras
+    la araña sigue extrayendo; `close_spider` solo espera a que termine. En
+    modo refine el ETL recorre el archivo de una corrida anterior.
+
+    Con JOBDIR el archivo hace de checkpoint: si el crawl se detiene se
+    conserva y la corrida reanudada sigue escribiendo al final. Los items
+    recibidos antes de la detención ya pasaron por el ETL.
+
+    Las subclases definen `page` (valor de `Pages`), `run_etl` y, si el
+    item no se guarda tal cual, `to_record`.
+    """
+
+    page: str = ""
+    # Cada cuántos items se fuerza la escritura a disco (fsync)
+    fsync_every: int = 50
+
+    def open_spider(self, spider: Spider) -> None:
+        spider.logger.info("open_spider")
+        document = spider.items_spider_output_document
+        self.output_path: str = os.path.join(
+            document["output_folder"],
+            os.path.splitext(document["file_name"])[0] + JSONL_EXTENSION,
+        )
+        self.refine = document["refine"] == "1"
+        self.resumable = get_jobdir(spider) is not None
+        self.item_count = 0
+        self.writer: Optional[JsonLinesWriter] = None
+        self.etl: Optional[EtlStage] = None
+
+        if self.refine:
+            # Se refina la salida de una corrida anterior (o su versión en JSON)
+            if not os.path.exists(self.output_path):
+                convert_json_to_jsonl(os.path.join(document["output_folder"], document["file_name"]), self.output_path)
+            return
+
+        if has_pending_requests(get_jobdir(spider)) and os.path.exists(self.output_path):
+            spider.logger.info("- Reanudando; los items se agregan a %s", self.output_path)
+        elif os.path.exists(self.output_path):
+            os.remove(self.output_path)
+        self.writer = JsonLinesWriter(self.output_path)
+        self.etl = EtlStage(lambda items: self.run_etl(items, spider), spider.logger)
+        spider.logger.info("- Pipeline initialized. JSONL output path: %s", self.output_path)
+
+    def process_item(self, item, spider: Spider):
+        if self.writer is None:
+            return item
+        record = self.to_record(item)
+        self.writer.write(record)
+        self.item_count += 1
+        if self.item_count % self.fsync_every == 0:
+            self.writer.fsync()
+
+        pending = self.etl.put(record)
+        if pending is not None:
+            # Cola llena: la araña espera al ETL en vez de acumular items en memoria
+            return pending.addCallback(lambda _: item)
+        return item
+
+    def close_spider(self, spider: Spider) -> Optional[Deferred]:
+        if self.writer is not None:
+            self.writer.fsync()
+            self.writer.close()
+        if self.etl is not None:
+            spider.logger.info("- Esperando a que el ETL procese los items pendientes")
+            # La espera corre en un hilo para no bloquear el reactor
+            return threads.deferToThread(self.etl.finish).addCallback(lambda _: self.finish_spider(spider))
+        self.finish_spider(spider)
+        return None
+
+    def finish_spider(self, spider: Spider) -> None:
+        if self.resumable and crawl_interrupted(spider):
+            spider.logger.info("- Crawl detenido con %d items; se conservan para reanudarlo", self.item_count)
+        elif self.refine:
+            spider.logger.info("- Refining data")
+            if not os.path.exists(self.output_path) or os.path.getsize(self.output_path) == 0:
+                spider.logger.warning("- La data se encuentra vacia: %s", self.output_path)
+            else:
+                self.run_etl(self.iter_items(), spider)
+        elif self.item_count:
+            spider.logger.info("- JSONL file written with %d items.", self.item_count)
+        else:
+            spider.logger.warning("- La data se encuentra vacia: %s", self.output_path)
+
+        if self.page:
+            close_json_files(self.page)
+        spider.logger.info("close_spider")
+
+    def to_record(self, item) -> dict:
+        return dict(item)
+
+    def iter_items(self) -> Iterator[dict]:
+        return read_jsonl(self.output_path)
+
+    @abstractmethod
+    def run_etl(self, items: Iterator[dict], spider: Spider) -> None:
+        """Procesa los items (ETL hacia Lodgerin)."""
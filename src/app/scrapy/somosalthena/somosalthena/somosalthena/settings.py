@@ -48,6 +48,11 @@ ROBOTSTXT_OBEY = True
 #    "somosalthena.middlewares.SomosalthenaSpiderMiddleware": 543,
 # }
 
+# Al reanudar desde un JOBDIR no se repiten las peticiones iniciales
+SPIDER_MIDDLEWARES = {
+   "app.scrapy.checkpoint.ResumeMiddleware": 960,
+}
+
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 # DOWNLOADER_MIDDLEWARES = {
@@ -82,7 +87,7 @@ ITEM_PIPELINES = {
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
 # HTTPCACHE_ENABLED = True
-# HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_EXPIRATION_SECS = 7 * 24 * 3600
 # HTTPCACHE_DIR = "httpcache"
 # HTTPCACHE_IGNORE_HTTP_CODES = []
 # HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
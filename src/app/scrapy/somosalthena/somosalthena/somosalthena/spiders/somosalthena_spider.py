@@ -1,13 +1,11 @@
 # coding=utf-8
-import re
-import json
 import scrapy
-from ast import literal_eval
 from os import path
 from pathlib import Path
 from app.scrapy.somosalthena.somosalthena.somosalthena import items
 
 from app.models.enums import Pages
+from app.scrapy.common import iter_embedded_json_array, load_context
 
 class SomosalthenaSpiderSpider(scrapy.Spider):
     name = "somosalthena_spider"
@@ -43,7 +41,7 @@ class SomosalthenaSpiderSpider(scrapy.Spider):
         Path(self.items_spider_output_document["output_folder"]).mkdir(
             parents=True, exist_ok=True
         )
-        self.context = json.loads(context) if context else {}
+        self.context = load_context(context)
 
     def start_requests(self):
         """
@@ -61,19 +59,13 @@ class SomosalthenaSpiderSpider(scrapy.Spider):
 
     def parse(self, response):
 
-        all_data = re.search(r"const postData = (\[.+\])", response.text)
+        # El catálogo viene embebido en la página; se entrega un item por inmueble
+        total = 0
+        for data_json in iter_embedded_json_array(response.text, r"const postData\s*=\s*"):
+            item = items.SomosalthenaItem()
+            item["items_output"] = data_json
+            total += 1
+            yield item
 
-        if not all_data:
+        if not total:
             self.logger.warning("No se presenta una API en la url: %s", response.url)
-            return None
-
-        all_data = literal_eval(all_data.group(1))
-
-        if not all_data:
-            self.logger.warning("No se logro la obtencion del JSON")
-            return None
-
-        item = items.SomosalthenaItem()
-
-        item["items_output"] = all_data
-        yield item
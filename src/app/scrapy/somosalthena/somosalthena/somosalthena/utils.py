@@ -1,10 +1,10 @@
 import calendar
-import json
 import re
 from asyncio import constants
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, Type
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Type
 
 from pydantic import BaseModel, Field
 from scrapy import Spider
@@ -25,36 +25,29 @@ class PropertyTypeColiving(Enum):
     OPERATION = "alquiler"
 
 
-def get_data_json(json_path_no_refined: str) -> list[dict]:
+def is_coliving_property(data_json: dict) -> bool:
+    """Solo interesan los pisos, casas y edificios en alquiler."""
+    return (
+        bool(data_json)
+        and data_json.get("GrupoInmueble") in PropertyTypeColiving.PROPERTY_TYPE.value
+        and data_json.get("Operacion") == PropertyTypeColiving.OPERATION.value
+    )
+
+
+def iter_refined_data(items: Iterable[dict]) -> Iterator[dict]:
     """
-    object_spider:
-        keys:
-            "output_folder_path"
-            "output_folder_name"
-            "file_name"
-            "processed_name"
-            "refine"
-            "output_folder"
+    Filtra y refina los inmuebles a medida que se leen del JSONL sin
+    refinar, sin cargar el catálogo completo en memoria.
     """
+    for data_json in items:
+        if is_coliving_property(data_json):
+            yield refine_data_json(data_json)
+
 
-    output_data = []
-
-    # Leer un archivo JSON
-    with open(json_path_no_refined, "r") as file:
-        all_data = json.load(file)
-        for data_json in all_data:
-            if not data_json:
-                continue
-            if not (
-                data_json["GrupoInmueble"] in PropertyTypeColiving.PROPERTY_TYPE.value
-            ):
-                continue
-            if not (data_json["Operacion"] == PropertyTypeColiving.OPERATION.value):
-                continue
-            refined_data_json = refine_data_json(data_json)
-            output_data.append(refined_data_json)
-
-    return output_data
+def iter_batches(items: Iterable[Any], size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 def refine_data_json(data_json: dict) -> dict:
@@ -2,8 +2,9 @@ import re
 import json
 import stat
 from scrapy import Spider
-from typing import List, Tuple, Dict
+from typing import Iterable, List, Tuple, Dict
 
+from functools import partial
 from logging import Logger
 
 from app.models.enums import (
@@ -18,7 +19,6 @@ from app.models.schemas import (
     Property,
     RentalUnits,
     RentalUnitsCalendarItem,
-    LocationAddress,
     ApiKeyItem,
     Text,
     mapping
@@ -27,7 +27,7 @@ from app.models.schemas import (
 from app.scrapy.common import (
     parse_elements,
     get_all_imagenes,
-    search_location,
+    search_location_address,
     extract_area,
     extract_cost,
     create_json,
@@ -36,13 +36,13 @@ from app.scrapy.common import (
     filtrar_ids_validos
 )
 from app.scrapy.funcs import (
-    check_and_insert_rental_unit_calendar,
+    sync_rental_unit_calendars,
     detect_language,
     find_feature_keys,
     get_elements_types,
     get_month_dates,
     save_property,
-    save_rental_unit,
+    save_rental_units,
 )
 
 from app.config.settings import GlobalConfig
@@ -51,92 +51,118 @@ from pprint import pprint
 
 from app.models.features_spider import EquivalencesVitaStudents
 from app.services.csvexport import CsvExporter
+from app.scrapy.parallel import ParallelEtl
 
-def etl_data_vita(items: List[Dict], json_elements: Dict, logger: Logger) -> None:
+
+def etl_data_vita(items: Iterable[Dict], json_elements: Dict, logger: Logger) -> None:
 
     elements_dict = parse_elements(json_elements, mapping)
     api_key = elements_dict["api_key"].data[0].name
     
     exporter = CsvExporter(Pages.vita.value)
 
-    for index, item in enumerate(items):
+    # Las propiedades son independientes: se procesan en paralelo y se
+    # escriben en el orden en que llegaron
+    ParallelEtl(
+        transform=transform_property,
+        load=partial(load_property, api_key=api_key, logger=logger),
+        emit=partial(emit_property, exporter=exporter),
+        transform_args=(elements_dict,),
+        logger=logger,
+    ).run(items)
+
+
+def transform_property(item: Dict, elements_dict: Dict) -> Tuple[Property, str, List, List]:
+    """
+    Construye el Property de Lodgerin y sus rental units (corre en el pool de
+    procesos). La dirección se geocodifica y el `PropertyId` de las rental
+    units se asigna en `load_property`.
+    """
+    items_output = item['items_output']
+    data_property, tours_rental_units = retrive_property(items_output)
+
+    element_feature = extract_id_label(elements_dict["features"].data)
+    features_id = search_feature_with_map(
+        data_property["property_features"],
+        element_feature,
+        EquivalencesVitaStudents.FEATURES,
+    )
 
-        items_output = item['items_output']
-        data_property, tours_rental_units = retrive_property(items_output)
-        
-        element_feature = extract_id_label(elements_dict["features"].data)
-        features_id = search_feature_with_map(
-            data_property["property_features"],
-            element_feature,
-            EquivalencesVitaStudents.FEATURES,
-        )
+    property_vita = Property(
+        referenceCode=re.sub(r'\s','_', data_property['property_referend_code']),
+        rentalType=GlobalConfig.RENTAL_TYPE,
+        isActive=GlobalConfig.BOOL_TRUE,
+        isPublished=GlobalConfig.BOOL_TRUE,
+        Features=features_id,
+        tourUrl=tours_rental_units,
+        PropertyTypeId=get_elements_types(GlobalConfig.PROPERTY_TYPE_ID, elements_dict["propertiesTypes"]),
+        Texts=Text(
+            description_en=data_property['property_description_en'][0],
+            description_es=data_property['property_description_es'][0],
+            title_en=data_property['property_name'],
+            title_es=data_property['property_name'],
+        ),
+        Images=data_property['property_images'],
+    )
 
-        property_vita = Property(
-            referenceCode=re.sub(r'\s','_', data_property['property_referend_code']),
-            rentalType=GlobalConfig.RENTAL_TYPE,
-            isActive=GlobalConfig.BOOL_TRUE,
-            isPublished=GlobalConfig.BOOL_TRUE,
-            Features=features_id,
-            tourUrl=tours_rental_units,
-            PropertyTypeId=get_elements_types(GlobalConfig.PROPERTY_TYPE_ID, elements_dict["propertiesTypes"]),
-            Texts=Text(
-                description_en=data_property['property_description_en'][0],
-                description_es=data_property['property_description_es'][0],
-                title_en=data_property['property_name'],
-                title_es=data_property['property_name'],
-            ),
-            Images=data_property['property_images'],
-            Location=LocationAddress(
-                lat=str(data_property["property_address"].lat),
-                lon=str(data_property["property_address"].lon),
-                country=data_property["property_address"].country,
-                countryCode=data_property["property_address"].countryCode,
-                city=data_property["property_address"].city,
-                street=data_property["property_address"].street,
-                state=data_property["property_address"].state,
-                prefixPhone=data_property["property_address"].prefixPhone,
-                postalCode=data_property["property_address"].postalCode,
-                number=data_property["property_address"].number,
-                fullAddress=data_property["property_address"].fullAddress,
-                address=data_property["property_address"].address,
+    rental_units_vita = []
+    errors = []
+    for rental_unit in items_output['all_rental_units']:
+        try:
+            rental_units_vita.append(
+                retrive_rental_unit(rental_unit, property_vita, element_feature)
             )
-        )
-        property_id = save_property(property_vita, api_key)
-        property_vita.id = property_id
-        create_json(property_vita, Pages.vita.value)
+        except Exception as error:
+            # Se registran en `load_property`: este proceso no tiene el logger de la araña
+            errors.append(str(error))
 
-        logger.info("Property ID: %s", property_id)
-        list_rental_unit_id = []
+    return property_vita, data_property['property_address'], rental_units_vita, errors
 
-        for index_rental_unit, rental_unit in enumerate(items_output['all_rental_units']):
-            try:
 
-                data_rental_units, calendar_unit_list = retrive_rental_unit(rental_unit, property_vita, element_feature)
+def load_property(result: Tuple[Property, str, List, List], api_key: str, logger: Logger) -> Tuple:
+    """Geocodifica la dirección y guarda la propiedad, sus rental units y calendarios en Lodgerin."""
+    property_vita, property_address, rental_units_vita, errors = result
+    for error in errors:
+        logger.warning(error)
 
-                # RentalUnit
-                rental_unit_id = save_rental_unit(data_rental_units, api_key)
-                data_rental_units.id = rental_unit_id
-                list_rental_unit_id.append(data_rental_units)
-                create_json(data_rental_units, Pages.vita.value)
-                
+    property_vita.Location = search_location_address(property_address)
+    property_id = save_property(property_vita, api_key, Pages.vita.value)
+    if property_id is None:
+        raise RuntimeError(f"No se pudo guardar la propiedad {property_vita.referenceCode}")
+    property_vita.id = property_id
 
-                # schedule
-                for rental_id, calendar_unit in zip(
-                    list_rental_unit_id, calendar_unit_list
-                ):
-                    if calendar_unit.startDate == "None":
-                        continue
-                    check_and_insert_rental_unit_calendar(
-                        rental_id.id, calendar_unit, api_key
-                    )
+    logger.info("Property ID: %s", property_id)
 
-                for calendar_unit in calendar_unit_list:
-                    create_json(calendar_unit, Pages.vita.value)
+    # RentalUnit: se guardan de forma concurrente una vez conocido el ID de la propiedad
+    for data_rental_units, _ in rental_units_vita:
+        data_rental_units.PropertyId = property_id
+    rental_unit_ids = save_rental_units(
+        [data_rental_units for data_rental_units, _ in rental_units_vita], api_key, Pages.vita.value
+    )
 
-                exporter.process_and_export_to_csv(property_vita, data_rental_units)
-                
-            except Exception as error:
-                logger.warning(error)
+    calendars = []
+    for (data_rental_units, calendar_unit_list), rental_unit_id in zip(rental_units_vita, rental_unit_ids):
+        data_rental_units.id = rental_unit_id
+
+        # schedule: cada calendario pertenece a su propia rental unit
+        calendars.extend(
+            (rental_unit_id, calendar_unit)
+            for calendar_unit in calendar_unit_list
+            if calendar_unit.startDate != "None"
+        )
+
+    sync_rental_unit_calendars(calendars, api_key)
+    return property_vita, rental_units_vita
+
+
+def emit_property(output: Tuple, exporter: CsvExporter) -> None:
+    property_vita, rental_units_vita = output
+    create_json(property_vita, Pages.vita.value)
+    for data_rental_units, calendar_unit_list in rental_units_vita:
+        create_json(data_rental_units, Pages.vita.value)
+        for calendar_unit in calendar_unit_list:
+            create_json(calendar_unit, Pages.vita.value)
+        exporter.process_and_export_to_csv(property_vita, data_rental_units)
 
 
 def retrive_property(items_output: Dict[str, str | List]) -> Tuple[Dict[str, str | List], List]:
@@ -178,10 +204,8 @@ def clean_data_property(property_data: Dict[str, str | List]) -> None:
     property_data["property_description_es"]
     property_data["property_referend_code"]
     
-    # Obtener la dirección
-    property_data["property_address"] = search_location(
-        property_data["property_address"].replace('Vita Student', '').strip()
-    )
+    # Obtener la dirección (se geocodifica al guardar la propiedad)
+    property_data["property_address"] = property_data["property_address"].replace('Vita Student', '').strip()
 
     # Obtener los feature
     property_data["property_features"] = list(map(
@@ -225,7 +249,6 @@ def retrive_rental_unit(rental_unit:Dict[str, str | List | Dict], property_data:
 
     try:
         rental_unit = RentalUnits(
-            PropertyId=property_data.id,
             referenceCode=rental_unit.get("rental_unit_room_code"),
             areaM2=rental_unit_room_data.get("size").replace("sqm", ""),
             isActive=True,
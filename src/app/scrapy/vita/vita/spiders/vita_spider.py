@@ -1,8 +1,8 @@
 import json
 import scrapy
-import requests
 from os import path
 from pathlib import Path
+from urllib.parse import urlencode
 
 from app.scrapy.vita.vita import items
 from scrapy.selector.unified import Selector
@@ -14,6 +14,9 @@ from app.scrapy.vita.vita.enum_vita import (
     ConfigRentalUnitRequests,
 )
 from app.models.enums import Pages
+from app.scrapy.common import load_context
+from app.scrapy.aggregator import ItemAggregator
+from app.scrapy.frontier import SIGNATURE_META, listing_signature
 
 class VitaSpiderSpider(scrapy.Spider):
     name = "vita_spider"
@@ -46,7 +49,7 @@ class VitaSpiderSpider(scrapy.Spider):
         Path(self.items_spider_output_document["output_folder"]).mkdir(
             parents=True, exist_ok=True
         )
-        self.context = json.loads(context) if isinstance(context, str) else {}
+        self.context = load_context(context)
 
     def start_requests(self):
         """
@@ -69,55 +72,106 @@ class VitaSpiderSpider(scrapy.Spider):
             self.logger.info('Sin URL de propiedades para: [%s]', response.url)
             return None
 
-        for url_property in urls_property.getall():
-            yield scrapy.Request(url_property, callback=self.parse_property, dont_filter=True)
+        for url_property in urls_property:
+            yield scrapy.Request(
+                url_property.get(),
+                callback=self.parse_property,
+                dont_filter=True,
+                # Tarjeta del listado (nombre, precio desde...) para el modo incremental
+                meta={SIGNATURE_META: listing_signature(url_property.xpath('../..//text()').getall())},
+            )
 
     def parse_property(self, response: Selector):
 
+        all_type_rental_units = response.xpath(ConfigXpath.TYPE_RENTAL_UNITS.value)
+
+        if not all_type_rental_units:
+            self.logger.info('No se encontraron tipos de rental units para: [%s]', response.url)
+            return None
+
         data_property: dict[str, str] = {}
         data_property['property_city'] = response.url.split('/')[-3]
         data_property['property_url'] = response.url
         data_property |= get_data_general(response, ConfigXpath.BASIC_DATA_PROPERTY.value)
+        data_property['property_description_es'] = ['']
+        data_property['property_cost'] = None
+        data_property['all_rental_units'] = []
 
-        data_property['property_description_es'] = get_description_es(
-            response.url, ConfigXpath.BASIC_DATA_PROPERTY.value['property_description_en']
+        # El item se entrega cuando responden todas las peticiones de la propiedad
+        aggregator = ItemAggregator(data_property, self.build_property_item, name=response.url)
+
+        yield aggregator.request(
+            url=response.url.replace('/en/', '/es/'),
+            callback=self.parse_description_es,
         )
 
         # ------------------------------------------------------------------------------------------
         # obtener el Costo
         developmentid = response.xpath("//div[contains(@class, '__price')]/div/@data-developmentid").get()
-        data_property['property_cost'] = get_cost(developmentid)
-
-        # ------------------------------------------------------------------------------------------
-
-        all_type_rental_units = response.xpath(ConfigXpath.TYPE_RENTAL_UNITS.value)
-
-        if not all_type_rental_units:
-            self.logger.info('No se encontraron tipos de rental units para: [%s]', response.url)
-            return None
+        yield aggregator.request(**get_cost(developmentid), callback=self.parse_cost)
 
         # ------------------------------------------------------------------------------------------
         # obtener los rental units
 
-        data_property['all_rental_units'] = []
-
-        for type_rental_unit in all_type_rental_units.getall():
-            data_rental_unit: list[dict] = get_rental_unit_information(developmentid, type_rental_unit)
-            for rental_unit in data_rental_unit:
-                room_code = rental_unit['link'].split("?")[0].replace("view-room-", '')
-                data_property['all_rental_units'].append({
-                    'rental_unit_room_code': room_code,
-                    'rental_unit_url': path.join(response.url, rental_unit['link']),
-                    'rental_unit_cost': rental_unit['range'],
-                    'rental_unit_type': type_rental_unit,
-                    'rental_unit_room_data': get_room_data_rental_unit(room_code),
-                    'rental_unit_booking_data': get_booking_data_rental_unit(room_code),
-                })
-
+        for index_type, type_rental_unit in enumerate(all_type_rental_units.getall()):
+            yield aggregator.request(
+                **get_rental_unit_information(developmentid, type_rental_unit),
+                callback=self.parse_rental_units,
+                cb_kwargs={"type_rental_unit": type_rental_unit, "index_type": index_type},
+            )
+
+        yield from aggregator.close()
+
+    def build_property_item(self, data_property: dict):
+        data_property['all_rental_units'] = [
+            rental_unit for _, rental_unit in sorted(
+                data_property['all_rental_units'], key=lambda item: item[0]
+            )
+        ]
         item_output = items.VitaItem()
         item_output['items_output'] = data_property
         yield item_output
 
+    def parse_description_es(self, response, aggregator: ItemAggregator):
+        aggregator.data['property_description_es'] = response.xpath(
+            ConfigXpath.BASIC_DATA_PROPERTY.value['property_description_en']
+        ).getall()
+        return ()
+
+    def parse_cost(self, response, aggregator: ItemAggregator):
+        aggregator.data['property_cost'] = response.body.decode(getattr(response, 'encoding', 'utf-8'))
+        return ()
+
+    def parse_rental_units(self, response, aggregator: ItemAggregator, type_rental_unit: str, index_type: int):
+
+        property_url = aggregator.data['property_url']
+        for index_unit, rental_unit in enumerate(json.loads(response.body)):
+            room_code = rental_unit['link'].split("?")[0].replace("view-room-", '')
+            data_rental_unit = {
+                'rental_unit_room_code': room_code,
+                'rental_unit_url': path.join(property_url, rental_unit['link']),
+                'rental_unit_cost': rental_unit['range'],
+                'rental_unit_type': type_rental_unit,
+                'rental_unit_room_data': {},
+                'rental_unit_booking_data': {},
+            }
+            aggregator.data['all_rental_units'].append(((index_type, index_unit), data_rental_unit))
+
+            yield aggregator.request(
+                **get_room_data_rental_unit(room_code),
+                callback=self.parse_rental_unit_data,
+                cb_kwargs={"data_rental_unit": data_rental_unit, "key": 'rental_unit_room_data'},
+            )
+            yield aggregator.request(
+                **get_booking_data_rental_unit(room_code),
+                callback=self.parse_rental_unit_data,
+                cb_kwargs={"data_rental_unit": data_rental_unit, "key": 'rental_unit_booking_data'},
+            )
+
+    def parse_rental_unit_data(self, response, aggregator: ItemAggregator, data_rental_unit: dict, key: str):
+        data_rental_unit[key] = json.loads(response.body)
+        return ()
+
 
 def get_data_general(response: Selector, items_xpath: dict[str, str]) -> dict[str, str]:
     return {
@@ -132,34 +186,31 @@ def clean_data(data: str) -> str:
     return aux_data.strip()
 
 
-def get_data_with_requests(url: str, payload, aux_headers) -> str:
-    response = requests.get(url, headers=aux_headers, params=payload)
-    return response if response.status_code == 200 else []
+def get_api_request(url: str, payload, aux_headers) -> dict:
+    """
+    Argumentos de la peticion de Scrapy para una API GET de Vita.
+    """
+    return {"url": f"{url}?{urlencode(payload)}", "headers": aux_headers}
 
 
-def get_cost(developmentid: str) -> str:
+def get_cost(developmentid: str) -> dict:
     payload = ConfigPropertyRequests.PROPERTY_PAYLOAD.value.copy()
     payload['development'] = developmentid
-    response = get_data_with_requests(
+    return get_api_request(
         url=ConfigPropertyRequests.PROPERTY_URL.value,
         payload=payload,
         aux_headers=ConfigPropertyRequests.PROPERTY_HEADERS.value
     )
-    if response == []:
-        return None
-    return response.text
-    
-
 
 
 def get_rental_unit_information(developmentid: str, type_rental_unit: str) -> dict:
     payload = ConfigAllRentalUnitsRequests.ALL_RENTAL_UNITS_PAYLOAD.value.copy()
     payload |= {'development': developmentid, 'type': type_rental_unit}
-    return get_data_with_requests(
+    return get_api_request(
         url=ConfigAllRentalUnitsRequests.ALL_RENTAL_UNITS_URL.value,
         payload=payload,
         aux_headers=ConfigAllRentalUnitsRequests.ALL_RENTAL_UNITS_HEADERS.value
-    ).json()
+    )
 
 
 def get_room_data_rental_unit(room_code: str) -> dict:
@@ -167,12 +218,11 @@ def get_room_data_rental_unit(room_code: str) -> dict:
     payload['code'] = room_code
     headers = ConfigRentalUnitRequests.RENTAL_UNIT_HEADERS.value.copy()
     headers['Referer'] = f"https://www.vitastudent.com/en/cities/barcelona/poblenou/view-room-{room_code}/?academicYear=2025 / 26"
-    response = get_data_with_requests(
+    return get_api_request(
         url=ConfigRentalUnitRequests.RENTAL_UNIT_URL.value,
         payload=payload,
         aux_headers=headers,
     )
-    return {} if not response else response.json()
 
 
 def get_booking_data_rental_unit(room_code: str) -> dict:
@@ -180,12 +230,11 @@ def get_booking_data_rental_unit(room_code: str) -> dict:
     payload['code'] = room_code
     headers = ConfigRentalUnitRequests.PLUS_DATA_RENTAL_UNIT_HEADERS.value.copy()
     headers['Referer'] = f"https://www.vitastudent.com/en/cities/barcelona/poblenou/view-room-{room_code}/?academicYear=2025 / 26"
-    response = get_data_with_requests(
+    return get_api_request(
         url=ConfigRentalUnitRequests.PLUS_DATA_RENTAL_UNIT_URL.value,
         payload=payload,
         aux_headers=headers,
     )
-    return {} if not response else response.json()
 
 
 def extract_room_details(response: Selector) -> dict:
@@ -198,15 +247,3 @@ def extract_room_details(response: Selector) -> dict:
         value = item.xpath('normalize-space(.)').get().strip()
         room_details[label] = value
     return room_details
-
-
-def get_description_es(url: str, xpath_description_es: str) -> str:
-    
-    aux_url = url.replace('/en/', '/es/')
-    response_es = requests.get(aux_url)
-    
-    if not response_es.status_code == 200:
-        return ['']
-    
-    response_es_scrapy = Selector(text=response_es.text)
-    return response_es_scrapy.xpath(xpath_description_es).getall()
\ No newline at end of file
@@ -1,12 +1,14 @@
 from app.models.enums import Pages
 import app.scrapy.funcs as funcs
 from pprint import pprint
+from functools import partial
 from logging import Logger
+from typing import Iterable
 from app.models.schemas import mapping
 from app.scrapy.common import (
     parse_elements, 
     create_json, 
-    read_json
+    search_location_address,
 )
 from app.scrapy.yugo.yugo.yugo.utils import (
     retrive_lodgerin_property,
@@ -14,65 +16,94 @@ from app.scrapy.yugo.yugo.yugo.utils import (
 )
 from app.models.enums import Pages
 from app.services.csvexport import CsvExporter
+from app.scrapy.parallel import ParallelEtl, Skip
 
-def etl_data_yugo(output_path: str, logger: Logger, context) -> None:
-
-    items: list[dict[str, str]] = read_json(output_path)
-    if items == []:
-        logger.warning('- La data se encuentra vacia')
-        return None
+def etl_data_yugo(items: Iterable[dict], logger: Logger, context) -> None:
 
     elements_dict = parse_elements(context, mapping)
     list_api_key = elements_dict["api_key"].data
     exporter = CsvExporter(Pages.yugo.value)
 
-    for index_property, data in enumerate(items):
-        data = data["items_output"]
+    # Las propiedades son independientes: se procesan en paralelo y se
+    # escriben en el orden en que llegaron
+    ParallelEtl(
+        transform=transform_property,
+        load=partial(load_property, logger=logger),
+        emit=partial(emit_property, exporter=exporter),
+        transform_args=(elements_dict, list_api_key),
+        logger=logger,
+    ).run(items)
 
-        # ---------------------------------------------------------------------------------------
-        # Property
-        data["yugo_space_name"] = data["yugo_space_name"].replace('Yugo', '').strip()
-        data_property, api_key = retrive_lodgerin_property(
-            data, elements_dict, list_api_key
-        )
-        if not api_key:
-            logger.warning("No se obtuvo la API_key para la propiedad numero: %s", [index_property, api_key, data_property])
-            continue
 
-        property_id = funcs.save_property(data_property, api_key)
-        logger.info("property_id: %s", property_id)
-        data_property.id = property_id
-        create_json(data_property, Pages.yugo.value)
+def transform_property(data: dict, elements_dict, list_api_key) -> tuple | Skip:
+    """
+    Construye el Property de Lodgerin y sus rental units (corre en el pool de
+    procesos). La dirección se geocodifica y el `PropertyId` de las rental
+    units se asigna en `load_property`.
+    """
+    data = data["items_output"]
 
-        # ---------------------------------------------------------------------------------------
-        # RentalUnit
-        if not data["all_rental_units"]:
-            logger.warning('No presenta rental units la propiedad numero: %s', index_property)
-            continue
+    # ---------------------------------------------------------------------------------------
+    # Property
+    data["yugo_space_name"] = data["yugo_space_name"].replace('Yugo', '').strip()
+    data_property, api_key = retrive_lodgerin_property(
+        data, elements_dict, list_api_key
+    )
+    if not api_key:
+        return Skip(f"No se obtuvo la API_key para la propiedad: {data_property.referenceCode}")
 
-        data_rental_units, calendar_unit_list = (
-            retrive_lodgerin_rental_units(
-                data_property, elements_dict, data["all_rental_units"]
-            )
+    # ---------------------------------------------------------------------------------------
+    # RentalUnit
+    data_rental_units, calendar_unit_list = (
+        retrive_lodgerin_rental_units(
+            data_property, elements_dict, data["all_rental_units"]
         )
-        list_rental_unit_id = []
-        for rental_unit in data_rental_units:
-            create_json(rental_unit, Pages.yugo.value)
-            rental_unit_id = funcs.save_rental_unit(rental_unit, api_key)
-            rental_unit.id = rental_unit_id
-            list_rental_unit_id.append(rental_unit)
-            exporter.process_and_export_to_csv(data_property, rental_unit)
+    )
+    return data_property, api_key, data["address_contact_and_email"], data_rental_units, calendar_unit_list
+
+
+def load_property(result: tuple, logger: Logger) -> tuple:
+    """Geocodifica la dirección y guarda la propiedad, sus rental units y calendarios en Lodgerin."""
+    data_property, api_key, address, data_rental_units, calendar_unit_list = result
+    data_property.Location = search_location_address(address)
+
+    property_id = funcs.save_property(data_property, api_key, Pages.yugo.value)
+    logger.info("property_id: %s", property_id)
+    if property_id is None:
+        raise RuntimeError(f"No se pudo guardar la propiedad {data_property.referenceCode}")
+    data_property.id = property_id
+
+    # ---------------------------------------------------------------------------------------
+    # RentalUnit
+    if not data_rental_units:
+        logger.warning('No presenta rental units la propiedad: %s', data_property.referenceCode)
+        return data_property, [], []
+
+    # Con el ID de la propiedad, sus rental units se guardan de forma concurrente
+    for rental_unit in data_rental_units:
+        rental_unit.PropertyId = property_id
+    rental_unit_ids = funcs.save_rental_units(data_rental_units, api_key, Pages.yugo.value)
+    for rental_unit, rental_unit_id in zip(data_rental_units, rental_unit_ids):
+        rental_unit.id = rental_unit_id
+
+    # ---------------------------------------------------------------------------------------
+    # schedule
+    funcs.sync_rental_unit_calendars(
+        [
+            (rental_unit.id, calendar_unit)
+            for rental_unit, calendar_unit in zip(data_rental_units, calendar_unit_list)
+            if calendar_unit.startDate != "None"
+        ],
+        api_key,
+    )
+    return data_property, data_rental_units, calendar_unit_list
 
-        # ---------------------------------------------------------------------------------------
-        # schedule
-        for rental_id, calendar_unit in zip(
-            list_rental_unit_id, calendar_unit_list
-        ):
-            if calendar_unit.startDate == "None":
-                continue
-            funcs.check_and_insert_rental_unit_calendar(
-                rental_id.id, calendar_unit, api_key
-            )
 
-        for calendar_unit in calendar_unit_list:
-            create_json(calendar_unit, Pages.yugo.value)
\ No newline at end of file
+def emit_property(output: tuple, exporter: CsvExporter) -> None:
+    data_property, data_rental_units, calendar_unit_list = output
+    create_json(data_property, Pages.yugo.value)
+    for rental_unit in data_rental_units:
+        create_json(rental_unit, Pages.yugo.value)
+        exporter.process_and_export_to_csv(data_property, rental_unit)
+    for calendar_unit in calendar_unit_list:
+        create_json(calendar_unit, Pages.yugo.value)
@@ -1,10 +1,9 @@
 # coding=utf-8
 import scrapy
-import requests
 
 from os import path
 from pathlib import Path
-from ast import literal_eval
+from typing import Optional
 from scrapy.selector.unified import Selector
 
 from app.scrapy.yugo.yugo.yugo import items
@@ -12,6 +11,9 @@ from app.scrapy.yugo.yugo.yugo.utils_refine_data import *
 from app.scrapy.yugo.yugo.yugo.enum_yugo import ConfigXpath, ConfigXpathOtherCountries
 
 from app.models.enums import Pages
+from app.scrapy.common import extract_embedded_json, load_context
+from app.scrapy.aggregator import ItemAggregator
+from app.scrapy.frontier import SIGNATURE_META, listing_signature
 
 class YugoSpiderSpider(scrapy.Spider):
     name = "yugo_spider"
@@ -70,7 +72,12 @@ class YugoSpiderSpider(scrapy.Spider):
             "italy": "https://yugo.com/en-us/global/italy",
         }
 
-        self.context = json.loads(context) if context else {}
+        self.context = load_context(context)
+
+        # Paginas de rental units ya descargadas en este crawl (None si fallaron)
+        # y los items que esperan una descarga en curso
+        self.rental_unit_pages: dict[str, Optional[dict]] = {}
+        self.rental_unit_waiters: dict[str, list[tuple]] = {}
 
     def start_requests(self):
         """
@@ -146,7 +153,10 @@ class YugoSpiderSpider(scrapy.Spider):
                 url=data_yugo_space['url_yugo_space'],
                 dont_filter=True,
                 callback=self.parse_property_space,
-                meta={"meta_data": meta_data}
+                meta={
+                    "meta_data": meta_data,
+                    SIGNATURE_META: listing_signature(article_yugo_space.xpath('.//text()').getall()),
+                }
             )
 
     def parse_yugo_space_another_countries(self, response: Selector):
@@ -169,7 +179,10 @@ class YugoSpiderSpider(scrapy.Spider):
                 url=data_yugo_space['url_yugo_space'],
                 dont_filter=True,
                 callback=self.verify_search_property,
-                meta={"meta_data": meta_data}
+                meta={
+                    "meta_data": meta_data,
+                    SIGNATURE_META: listing_signature(article_yugo_space.xpath('.//text()').getall()),
+                }
             )
 
 
@@ -204,13 +217,10 @@ class YugoSpiderSpider(scrapy.Spider):
         meta_data = response.meta.get("meta_data")
 
         address = ''
-        if re.search(r'"translatedWordsList"', response.text):
-            api_property = re.search(r'"translatedWordsList":\s?(\[.+\])}</script>', response.text)
-            if api_property:
-                # Presenta la api con la data de property
-                all_data_property = api_property.group(1)
-                all_data_property = literal_eval(all_data_property)
-                address = self.extractor_address(all_data_property)
+        # Presenta la api con la data de property
+        all_data_property = extract_embedded_json(response.text, r'"translatedWordsList":\s?')
+        if all_data_property:
+            address = self.extractor_address(all_data_property)
 
         items_property = extractor_all_data(response, ConfigXpath.ITEMS_PROPERTY.value)
         items_property_general = extractor_all_data(response, ConfigXpath.ITEMS_PROPERTY_GENERAL.value)
@@ -223,134 +233,149 @@ class YugoSpiderSpider(scrapy.Spider):
 
         meta_data['all_images'] = extract_image_urls(response, ConfigXpath.ITEMS_PICTURE.value)
 
-        meta_data['second_items_property'] = self.get_data_languages(response.url)
-
-        meta_data = self.refine_data_property(meta_data)
+        meta_data['second_items_property'] = []
 
         meta_data['aux_url_property'] = response.url
 
         meta_data['referend_code'] = get_referend_code(response.url)
-        
+
+        meta_data['all_rental_units'] = []
+
+        # El item se entrega cuando responden todas las peticiones de idiomas y rental units
+        aggregator = ItemAggregator(meta_data, self.build_property_item, name=response.url)
+
+        aux_url = response.url.split('/global/')[-1]
+        for index_language, language in enumerate(self.all_languages):
+            yield aggregator.request(
+                url=f"https://yugo.com/{language}/global/{aux_url}",
+                callback=self.parse_data_language,
+                cb_kwargs={"language": language, "index_language": index_language},
+            )
+
         # ---------------------------------------
         # Proceso de busqueda de los rental units
 
-        if not response.xpath(ConfigXpath.ALL_LINK_RENTAL_UNITS.value):
-            item_output = items.YugoItem()
-            meta_data['all_rental_units'] = []
-            item_output['items_output'] = meta_data
-            yield item_output
-
-        else:
+        if response.xpath(ConfigXpath.ALL_LINK_RENTAL_UNITS.value):
             urls_rental_units = response.xpath(ConfigXpath.ALL_LINK_RENTAL_UNITS.value).getall()
             urls_rental_units = list(map(lambda url_rental_units: self.url_base + url_rental_units, urls_rental_units))
             meta_data['urls_rental_units'] = urls_rental_units
 
-            yield scrapy.Request(
+            yield aggregator.request(
                 url=meta_data['student_rooms'],
                 callback=self.get_all_rental_units,
-                meta={"meta_data": meta_data},
-                dont_filter=True
+                cb_kwargs={"urls_by_content_id": index_rental_unit_urls(urls_rental_units)},
             )
 
-    
-    def get_all_rental_units(self, response):
-        
-        item_output = items.YugoItem()
+        yield from aggregator.close()
 
-        meta_data = response.meta.get("meta_data")
-        meta_data['all_rental_units'] = []
+    def build_property_item(self, meta_data: dict):
 
-        all_id_rental_units = re.findall(r'"contentId":\d+,', response.text)
-        
-        if not all_id_rental_units:
-            item_output['items_output'] = meta_data
-            yield item_output
-            return None
-            
-        api_all_rental_units = []
-
-        for conten_id in all_id_rental_units:
-    
-            aux_conten_id = re.search(r'(\d+)', conten_id).group(1)
-            url = f"https://yugo.com/en-gb/tenancyOptionsByContentId/{aux_conten_id}"
-            json_data: dict = requests.get(url).json()
-
-            json_data['url'] = url
-            json_data['aux_conten_id'] = aux_conten_id
-            api_all_rental_units.append(json_data)
-
-        if not api_all_rental_units:
-            self.logger.info('No existen Rental Units disponibles. %s', meta_data['aux_url_property'])
-
-        else:
-            meta_data['all_rental_units'] = self.get_data_rental_units(
-                meta_data['urls_rental_units'],
-                api_all_rental_units
+        meta_data['second_items_property'].sort(key=lambda item: item['index_language'])
+        meta_data['all_rental_units'] = [
+            data_rental_unit for _, data_rental_unit in sorted(
+                meta_data['all_rental_units'], key=lambda item: item[0]
             )
+        ]
+        if meta_data.get('urls_rental_units') and not meta_data['all_rental_units']:
+            self.logger.info('No existen Rental Units disponibles. %s', meta_data['aux_url_property'])
 
         item_output = items.YugoItem()
-        item_output['items_output'] = meta_data
+        item_output['items_output'] = self.refine_data_property(meta_data)
         yield item_output
 
+    def get_all_rental_units(self, response, aggregator: ItemAggregator, urls_by_content_id: dict[str, list[str]]):
 
-    def get_data_rental_units(self, urls_rental_units: list[str], api_all_rental_units: list[dict]):
+        all_id_rental_units = re.findall(r'"contentId":(\d+),', response.text)
 
-        all_data_rental_units = []
+        for index_api, aux_conten_id in enumerate(dict.fromkeys(all_id_rental_units)):
 
-        for api_data_rental_unit in api_all_rental_units:
+            if aux_conten_id not in urls_by_content_id:
+                continue
 
-            content_id = api_data_rental_unit['aux_conten_id']
+            yield aggregator.request(
+                url=f"https://yugo.com/en-gb/tenancyOptionsByContentId/{aux_conten_id}",
+                callback=self.get_data_rental_units,
+                cb_kwargs={
+                    "content_id": aux_conten_id,
+                    "index_api": index_api,
+                    "urls_rental_units": urls_by_content_id[aux_conten_id],
+                },
+            )
 
-            for url_rental_unit in urls_rental_units:
+    def get_data_rental_units(
+        self,
+        response,
+        aggregator: ItemAggregator,
+        content_id: str,
+        index_api: int,
+        urls_rental_units: list[str],
+    ):
 
-                if not url_rental_unit.endswith(content_id):
-                    continue
-                
-                response_with_requests = requests.get(url_rental_unit)
+        api_data_rental_unit: dict = response.json()
+        api_data_rental_unit['url'] = response.url
+        api_data_rental_unit['aux_conten_id'] = content_id
 
-                if not response_with_requests.status_code == 200:
-                    continue
+        for index_url, url_rental_unit in enumerate(urls_rental_units):
+            waiter = (aggregator, api_data_rental_unit, (index_api, index_url))
 
-                new_scrapy_selector = Selector(text=response_with_requests.text)
-                
-                items_rental_units = extractor_all_data(new_scrapy_selector, ConfigXpath.ITEMS_RENTAL_UNITS.value)
-                items_rental_units['picture'] = extract_image_urls(new_scrapy_selector, ConfigXpath.ITEMS_PICTURE_RENTAL_UNITS.value)
-                items_rental_units['url_rental_unit'] = url_rental_unit
-                all_data_rental_units.append({
-                    'api_data_rental_unit': api_data_rental_unit,
-                    'response_data_rental_units': items_rental_units,
-                })
+            if url_rental_unit in self.rental_unit_pages:
+                self.add_rental_unit(waiter, self.rental_unit_pages[url_rental_unit])
+                continue
 
-        return all_data_rental_units
+            # Cada espera cuenta como pendiente hasta que llegue la pagina
+            aggregator.hold()
+            if url_rental_unit in self.rental_unit_waiters:
+                self.rental_unit_waiters[url_rental_unit].append(waiter)
+                continue
 
-    
-    def get_data_languages(self, url: str):
+            self.rental_unit_waiters[url_rental_unit] = [waiter]
+            yield aggregator.request(
+                url=url_rental_unit,
+                callback=self.parse_rental_unit,
+                cb_kwargs={"url_rental_unit": url_rental_unit},
+                on_error=self.error_rental_unit,
+            )
 
-        all_data_languages = []
+    def parse_rental_unit(self, response, aggregator: ItemAggregator, url_rental_unit: str):
 
-        aux_url = url.split('/global/')[-1]
+        items_rental_units = extractor_all_data(response, ConfigXpath.ITEMS_RENTAL_UNITS.value)
+        items_rental_units['picture'] = extract_image_urls(response, ConfigXpath.ITEMS_PICTURE_RENTAL_UNITS.value)
+        items_rental_units['url_rental_unit'] = url_rental_unit
+        yield from self.resolve_rental_unit(url_rental_unit, items_rental_units)
 
-        for index_language, language in enumerate(self.all_languages):
+    def error_rental_unit(self, failure, aggregator: ItemAggregator, url_rental_unit: str):
+        yield from self.resolve_rental_unit(url_rental_unit, None)
 
-            new_url = f"https://yugo.com/{language}/global/{aux_url}"
-            response_with_requests = requests.get(new_url)
-            if not response_with_requests.status_code == 200:
-                self.logger.warning('No se obtuvo info en el lenguaje: %s', url)
-                continue
+    def resolve_rental_unit(self, url: str, items_rental_units: Optional[dict]):
+        """
+        Guarda la pagina en la cache del crawl y entrega el resultado a todos
+        los items que la esperaban.
+        """
+        self.rental_unit_pages[url] = items_rental_units
+        for waiter in self.rental_unit_waiters.pop(url, []):
+            self.add_rental_unit(waiter, items_rental_units)
+            yield from waiter[0].release()
+
+    def add_rental_unit(self, waiter: tuple, items_rental_units: Optional[dict]):
+        aggregator, api_data_rental_unit, order = waiter
+        if items_rental_units is None:
+            return
+        aggregator.data['all_rental_units'].append((order, {
+            'api_data_rental_unit': api_data_rental_unit,
+            'response_data_rental_units': dict(items_rental_units),
+        }))
+
+    def parse_data_language(self, response, aggregator: ItemAggregator, language: str, index_language: int):
 
-            html_content = response_with_requests.text
-            new_selector_scrapy = Selector(text=html_content)
-            items_property = extractor_all_data(new_selector_scrapy, ConfigXpath.ITEMS_PROPERTY.value)
-            for key, value in items_property.items():
-                items_property[key] = "".join(value).strip()
+        items_property = extractor_all_data(response, ConfigXpath.ITEMS_PROPERTY.value)
+        for key, value in items_property.items():
+            items_property[key] = "".join(value).strip()
 
-            items_property['language'] = language
-            items_property['index_language'] = index_language
-            all_data_languages.append(items_property)
-        
-        return all_data_languages
+        items_property['language'] = language
+        items_property['index_language'] = index_language
+        aggregator.data['second_items_property'].append(items_property)
+        return ()
 
-   
     def refine_data_property(self, items_output: dict) -> dict:
         
         items = items_output.copy()
@@ -7,7 +7,6 @@ from app.scrapy.common import (
     get_all_imagenes,
     decode_clean_string,
     extract_area,
-    search_location,
     filtrar_ids_validos,
     create_rental_unit_code_with_initials
 )
@@ -17,7 +16,6 @@ from app.models.schemas import (
     Property,
     RentalUnits,
     RentalUnitsCalendarItem,
-    LocationAddress,
     ApiKeyItem,
     Text
 )
@@ -102,7 +100,6 @@ def retrive_lodgerin_property(item, elements, list_api_key):
         element_feature,
         EquivalencesYugo.FEATURES,
     )
-    address = search_location(item['address_contact_and_email'])
 
     # clean reference_code
     reference_code = decode_clean_string(item["url_yugo_space"])
@@ -126,20 +123,6 @@ def retrive_lodgerin_property(item, elements, list_api_key):
         PropertyTypeId=PropertyTypeId,
         Texts=descriptions.get('Texts'),
         Images=images,
-        Location=LocationAddress(
-            lat=str(address.lat),
-            lon=str(address.lon),
-            country=address.country,
-            countryCode=address.countryCode,
-            city=address.city,
-            street=address.street,
-            state=address.state,
-            prefixPhone=address.prefixPhone,
-            postalCode=address.postalCode,
-            number=address.number,
-            fullAddress=address.fullAddress,
-            address=address.address,
-        ),
         provider="yugo",
         providerRef=reference_code,
     )
@@ -193,7 +176,6 @@ def retrive_lodgerin_rental_units(
         )
 
         data_rental_unit = RentalUnits(
-            PropertyId=items_property.id,
             referenceCode=reference_code,
             areaM2=area_m2,
             isActive=True,
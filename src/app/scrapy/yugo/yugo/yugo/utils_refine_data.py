@@ -89,6 +89,18 @@ def get_referend_code(url: str):
     return f"{data_url[-2]}-{data_url[-1]}" 
 
 
+def index_rental_unit_urls(urls: list[str]) -> dict[str, list[str]]:
+    """
+    Indice contentId -> urls de los rental units, segun los digitos finales de cada url.
+    """
+    index: dict[str, list[str]] = {}
+    for url in dict.fromkeys(urls):
+        content_id = re.search(r'(\d+)/?$', url)
+        if content_id:
+            index.setdefault(content_id.group(1), []).append(url)
+    return index
+
+
 def clean_list(data: list) -> list:
     return list(filter(None, map(str.strip, data)))
 
@@ -0,0 +1,139 @@
+import os
+import copy
+import json
+import time
+import uuid
+import threading
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config.settings import CacheConfig
+
+
+class TTLCache:
+    """
+    Caché con expiración en memoria y en disco (`<directorio>/<nombre>.json`).
+
+    El archivo en disco lo comparten la API y los workers. Cada invalidación
+    escribe una nueva generación en `<nombre>.generation`; si cambió, la copia
+    en memoria de cada proceso se descarta en la siguiente lectura. Los
+    archivos se crean con permisos 0600 porque guardan API keys.
+    """
+
+    def __init__(self, name: str, ttl: float, directory: str = CacheConfig.DIR):
+        self.name = name
+        self.ttl = ttl
+        self.path = os.path.join(directory, f"{name}.json")
+        self.generation_path = os.path.join(directory, f"{name}.generation")
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+        self._generation: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _read_disk(self) -> Dict[str, Tuple[float, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return {key: (entry["expires_at"], entry["value"]) for key, entry in entries.items()}
+
+    def _write_private(self, path: str, write: Callable[[Any], None]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        descriptor = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as cache_file:
+            write(cache_file)
+        os.replace(tmp_path, path)
+
+    def _write_disk(self, entries: Dict[str, Tuple[float, Any]]) -> None:
+        self._write_private(
+            self.path,
+            lambda cache_file: json.dump(
+                {key: {"expires_at": expires_at, "value": value} for key, (expires_at, value) in entries.items()},
+                cache_file,
+                ensure_ascii=False,
+            ),
+        )
+
+    def _read_generation(self) -> str:
+        try:
+            with open(self.generation_path, "r", encoding="utf-8") as generation_file:
+                return generation_file.read().strip()
+        except OSError:
+            return ""
+
+    def _sync_generation(self) -> None:
+        # Otro proceso invalidó la caché: la copia en memoria ya no sirve
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._memory.clear()
+            self._generation = generation
+
+    def _bump_generation(self) -> None:
+        generation = uuid.uuid4().hex
+        self._write_private(self.generation_path, lambda generation_file: generation_file.write(generation))
+        self._generation = generation
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            self._sync_generation()
+            entry = self._memory.get(key)
+            if entry is None:
+                self._memory.update(self._read_disk())
+                entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < now:
+                self._memory.pop(key, None)
+                return None
+            # Copia: quien lo recibe puede modificarlo sin alterar la caché
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._sync_generation()
+            entries = {
+                cache_key: entry
+                for cache_key, entry in self._read_disk().items()
+                if entry[0] >= now
+            }
+            entries[key] = (now + self.ttl, value)
+            self._write_disk(entries)
+            self._memory = entries
+
+    def get_or_set(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor en caché o lo calcula; los `None` no se guardan.
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            self._memory.clear()
+            # Primero se borra del disco y después cambia la generación, así
+            # ningún proceso vuelve a cargar en memoria los valores invalidados
+            if key is None:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            else:
+                entries = self._read_disk()
+                if entries.pop(key, None) is not None:
+                    self._write_disk(entries)
+            self._bump_generation()
+
+
+elements_cache = TTLCache("elements", CacheConfig.ELEMENTS_TTL)
+api_keys_cache = TTLCache("api_keys", CacheConfig.API_KEYS_TTL)
+
+CACHES: Dict[str, TTLCache] = {
+    elements_cache.name: elements_cache,
+    api_keys_cache.name: api_keys_cache,
+}
@@ -0,0 +1,155 @@
+import time
+import asyncio
+import logging
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config.settings import SyncConfig
+from app.models.schemas import RentalUnitsCalendarItem
+from app.services.lodgerin import AsyncLodgerinAPI
+from app.services.storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarStore(SqliteStore):
+    """
+    Copia local del último calendario conocido en Lodgerin por rental unit.
+
+    Un rango se identifica por su `endDate` (el "bloqueado hasta"), igual que
+    la comparación que hacía `check_and_insert_rental_unit_calendar`: el
+    `startDate` suele ser la fecha del día y cambia en cada corrida.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS calendar_units (
+            rental_unit_id TEXT PRIMARY KEY,
+            seeded_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS calendar_ranges (
+            rental_unit_id TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            start_date TEXT,
+            synced_at REAL NOT NULL,
+            PRIMARY KEY (rental_unit_id, end_date)
+        );
+    """
+
+    def known_units(self, rental_unit_ids: Iterable[str]) -> set:
+        rental_unit_ids = list(rental_unit_ids)
+        if not rental_unit_ids:
+            return set()
+        placeholders = ",".join("?" * len(rental_unit_ids))
+        rows = self.connection.execute(
+            f"SELECT rental_unit_id FROM calendar_units WHERE rental_unit_id IN ({placeholders})",
+            rental_unit_ids,
+        ).fetchall()
+        return {row["rental_unit_id"] for row in rows}
+
+    def get_end_dates(self, rental_unit_id: str) -> set:
+        rows = self.connection.execute(
+            "SELECT end_date FROM calendar_ranges WHERE rental_unit_id = ?", (rental_unit_id,)
+        ).fetchall()
+        return {row["end_date"] for row in rows}
+
+    def seed(self, rental_unit_id: str, ranges: List[Dict[str, Optional[str]]]) -> None:
+        """
+        Guarda el calendario leído de la API la primera vez que se ve la unidad.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO calendar_units (rental_unit_id, seeded_at) VALUES (?, ?)",
+                (rental_unit_id, time.time()),
+            )
+            self._add_ranges(conn, rental_unit_id, ranges)
+
+    def add(self, rental_unit_id: str, ranges: List[Dict[str, Optional[str]]]) -> None:
+        with self.transaction() as conn:
+            self._add_ranges(conn, rental_unit_id, ranges)
+
+    def _add_ranges(self, conn, rental_unit_id: str, ranges: List[Dict[str, Optional[str]]]) -> None:
+        now = time.time()
+        conn.executemany(
+            "INSERT OR REPLACE INTO calendar_ranges (rental_unit_id, end_date, start_date, synced_at) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (rental_unit_id, item["endDate"], item.get("startDate"), now)
+                for item in ranges
+                if item.get("endDate")
+            ],
+        )
+
+    def forget(self, rental_unit_id: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM calendar_ranges WHERE rental_unit_id = ?", (rental_unit_id,))
+            conn.execute("DELETE FROM calendar_units WHERE rental_unit_id = ?", (rental_unit_id,))
+
+
+class CalendarSync:
+    """
+    Sincroniza calendarios enviando solo los rangos nuevos respecto a la copia local.
+
+    Solo la primera vez que aparece una rental unit se consulta su calendario
+    en la API. Los envíos de todas las unidades se hacen de forma concurrente,
+    con un POST por unidad que agrupa sus rangos nuevos. La API no tiene
+    endpoint para borrar rangos, así que los que desaparecen solo se registran.
+    """
+
+    def __init__(self, lodgerin_api: AsyncLodgerinAPI, store: CalendarStore):
+        self.lodgerin_api = lodgerin_api
+        self.store = store
+
+    async def sync(self, calendars: List[Tuple[str, RentalUnitsCalendarItem]]) -> Dict[str, int]:
+        desired: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        for rental_unit_id, calendar_unit in calendars:
+            if rental_unit_id and calendar_unit.endDate not in ("None", None):
+                desired[str(rental_unit_id)][calendar_unit.endDate] = calendar_unit.model_dump()
+
+        known_units = self.store.known_units(desired)
+        await asyncio.gather(*(
+            self._seed(rental_unit_id) for rental_unit_id in desired if rental_unit_id not in known_units
+        ))
+
+        stats = {"added": 0, "removed": 0, "unchanged": 0}
+        uploads = []
+        for rental_unit_id, ranges in desired.items():
+            known = self.store.get_end_dates(rental_unit_id)
+            added = [item for end_date, item in ranges.items() if end_date not in known]
+            removed = known - ranges.keys()
+            stats["unchanged"] += len(ranges) - len(added)
+            stats["removed"] += len(removed)
+            if removed:
+                logger.info(f"Rangos que ya no aparecen para la rental unit {rental_unit_id}: {sorted(removed)}")
+            if added:
+                uploads.append(self._upload(rental_unit_id, added))
+
+        stats["added"] = sum(await asyncio.gather(*uploads))
+        logger.info(f"Calendarios sincronizados: {stats}")
+        return stats
+
+    async def _seed(self, rental_unit_id: str) -> None:
+        existing_schedule = await self.lodgerin_api.get_rental_unit_calendar(rental_unit_id)
+        if existing_schedule is None:
+            # Sin respuesta no se marca la unidad: se vuelve a consultar en la próxima corrida
+            return
+        self.store.seed(rental_unit_id, existing_schedule.get("data") or [])
+
+    async def _upload(self, rental_unit_id: str, added: List[dict]) -> int:
+        response = await self.lodgerin_api.create_rental_unit_calendar(rental_unit_id, added)
+        if not response:
+            logger.info(f"Error inserting dates for rental unit ID {rental_unit_id}")
+            return 0
+        self.store.add(rental_unit_id, added)
+        logger.info(f"Successfully inserted {len(added)} dates for rental unit ID {rental_unit_id}")
+        return len(added)
+
+
+_calendar_store: Optional[CalendarStore] = None
+
+
+def get_calendar_store() -> CalendarStore:
+    global _calendar_store
+    if _calendar_store is None:
+        _calendar_store = CalendarStore(SyncConfig.CALENDARS_DB)
+    return _calendar_store
@@ -0,0 +1,166 @@
+import logging
+import importlib
+import threading
+
+from typing import Any, Dict, Optional
+
+from scrapy.crawler import CrawlerRunner
+from scrapy.settings import Settings
+from scrapy.spiderloader import SpiderLoader
+from scrapy.utils.log import configure_logging
+from scrapy.utils.reactor import install_reactor
+
+from app.config.settings import ElementsConfig, HttpCacheConfig, ScraperConfig
+from app.models.enums import Pages
+
+logger = logging.getLogger(__name__)
+
+TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+
+# Paquete Python de cada proyecto de Scrapy (la carpeta que contiene settings.py)
+SPIDER_PACKAGES: Dict[str, str] = {
+    Pages.flipcoliving.value: "app.scrapy.flipcoliving.flipcoliving.flipcoliving",
+    Pages.somosalthena.value: "app.scrapy.somosalthena.somosalthena.somosalthena",
+    Pages.yugo.value: "app.scrapy.yugo.yugo.yugo",
+    Pages.vita.value: "app.scrapy.vita.vita",
+    Pages.nodis.value: "app.scrapy.nodis.nodis",
+}
+
+# Ajustes que referencian módulos relativos al proyecto (p. ej. "yugo.pipelines.YugoPipeline")
+COMPONENT_SETTINGS = (
+    "ITEM_PIPELINES",
+    "SPIDER_MIDDLEWARES",
+    "DOWNLOADER_MIDDLEWARES",
+    "EXTENSIONS",
+)
+
+_setup_lock = threading.Lock()
+_crochet = None
+
+
+def _setup_reactor():
+    """
+    Instala el reactor asyncio y lo arranca en un hilo con crochet. Solo se
+    hace una vez por proceso; las siguientes arañas reutilizan el mismo reactor.
+    """
+    global _crochet
+    with _setup_lock:
+        if _crochet is None:
+            install_reactor(TWISTED_REACTOR)
+            import crochet
+
+            configure_logging(install_root_handler=False)
+            crochet.setup()
+            _crochet = crochet
+    return _crochet
+
+
+def _qualify(path: str, bot_name: str, package: str) -> str:
+    if path.startswith(f"{bot_name}."):
+        return f"{package}{path[len(bot_name):]}"
+    return path
+
+
+def get_project_settings(scrapy_path: str) -> Settings:
+    """
+    Carga el settings.py del proyecto reescribiendo las rutas relativas al
+    proyecto (las que resuelve `scrapy crawl` desde su cwd) a rutas absolutas.
+    """
+    package = SPIDER_PACKAGES[scrapy_path]
+    module = importlib.import_module(f"{package}.settings")
+
+    settings = Settings()
+    settings.setmodule(module, priority="project")
+    bot_name = settings.get("BOT_NAME")
+
+    settings.set(
+        "SPIDER_MODULES",
+        [_qualify(path, bot_name, package) for path in settings.getlist("SPIDER_MODULES")],
+        priority="project",
+    )
+    settings.set("NEWSPIDER_MODULE", _qualify(settings.get("NEWSPIDER_MODULE", ""), bot_name, package), priority="project")
+    for name in COMPONENT_SETTINGS:
+        components = settings.getdict(name)
+        if components:
+            settings.set(
+                name,
+                {_qualify(path, bot_name, package): order for path, order in components.items()},
+                priority="project",
+            )
+    settings.setdict(HttpCacheConfig.SPIDER_SETTINGS, priority="cmdline")
+    return settings
+
+
+def _make_log_handler(log_path: str) -> logging.Handler:
+    handler = logging.FileHandler(log_path, mode="a", encoding="utf-8")
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(logging.Formatter(ScraperConfig.LOG_FORMAT, ScraperConfig.LOG_DATEFORMAT))
+    return handler
+
+
+def run_spider(
+    scrapy_path: str,
+    spider_name: str,
+    log_path: str,
+    context: Dict[str, Any],
+    flag_refine: bool = False,
+    timeout: Optional[float] = ScraperConfig.CRAWL_TIMEOUT,
+    incremental: bool = False,
+    jobdir: Optional[str] = None,
+) -> int:
+    """
+    Ejecuta la araña dentro del proceso actual con CrawlerRunner.
+
+    El contexto se pasa como objeto a la araña, sin serializarlo en la línea de
+    comandos. Devuelve un código de salida compatible con `execute_spider`.
+    """
+    crochet = _setup_reactor()
+    settings = get_project_settings(scrapy_path)
+    if jobdir:
+        settings.set("JOBDIR", jobdir, priority="cmdline")
+    spider_cls = SpiderLoader.from_settings(settings).load(spider_name)
+
+    spider_kwargs = {
+        "context": context,
+        "output_folder_path": ElementsConfig.PATH_DATA,
+    }
+    if flag_refine:
+        spider_kwargs["refine"] = "1"
+    if incremental:
+        spider_kwargs["incremental"] = "1"
+
+    runner = CrawlerRunner(settings)
+
+    @crochet.run_in_reactor
+    def crawl():
+        return runner.crawl(spider_cls, **spider_kwargs)
+
+    @crochet.run_in_reactor
+    def stop():
+        return runner.stop()
+
+    handler = _make_log_handler(log_path)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    finished = False
+    try:
+        logger.info(f"Scraping iniciado en proceso para {spider_name}")
+        crawl().wait(timeout=timeout)
+        finished = True
+        return 0
+    except crochet.TimeoutError:
+        logger.error(f"La araña {spider_name} superó el tiempo máximo de {timeout} segundos")
+        return 1
+    except Exception as error:
+        finished = True
+        logger.error('Problemas al ejecutar el spider. Error: %s', error)
+        return 1
+    finally:
+        if not finished:
+            # Timeout o interrupción del worker: se cierra la araña de forma ordenada
+            try:
+                stop().wait(timeout=ScraperConfig.CRAWL_STOP_TIMEOUT)
+            except crochet.TimeoutError:
+                logger.error(f"La araña {spider_name} no se detuvo a tiempo")
+        root_logger.removeHandler(handler)
+        handler.close()
@@ -0,0 +1,86 @@
+import json
+import time
+import hashlib
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.config.settings import SyncConfig
+from app.services.storage import SqliteStore
+
+
+def content_hash(model: BaseModel) -> str:
+    """
+    Hash del contenido canónico del modelo, sin su ID de Lodgerin.
+    """
+    data = model.model_dump(exclude={"id"})
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FingerprintStore(SqliteStore):
+    """
+    Último contenido enviado a Lodgerin por proveedor y `referenceCode`, junto
+    con el ID que devolvió la API. Permite saltar los upserts sin cambios.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            provider TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            reference_code TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            lodgerin_id TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (provider, kind, reference_code)
+        );
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_age_days: float = SyncConfig.FINGERPRINT_MAX_AGE_DAYS,
+        timeout: float = 30.0,
+    ):
+        super().__init__(db_path, timeout)
+        self.max_age = max_age_days * 24 * 3600
+
+    def unchanged_id(self, provider: str, kind: str, model: BaseModel) -> Optional[str]:
+        """
+        Devuelve el ID de Lodgerin si el modelo no cambió desde el último envío.
+        """
+        row = self.connection.execute(
+            "SELECT content_hash, lodgerin_id, updated_at FROM fingerprints "
+            "WHERE provider = ? AND kind = ? AND reference_code = ?",
+            (provider, kind, model.referenceCode),
+        ).fetchone()
+        if row is None or row["content_hash"] != content_hash(model):
+            return None
+        if self.max_age and time.time() - row["updated_at"] > self.max_age:
+            return None
+        return row["lodgerin_id"]
+
+    def record(self, provider: str, kind: str, model: BaseModel, lodgerin_id: str) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fingerprints "
+                "(provider, kind, reference_code, content_hash, lodgerin_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (provider, kind, model.referenceCode, content_hash(model), str(lodgerin_id), time.time()),
+            )
+
+    def forget(self, provider: str) -> int:
+        with self.transaction() as conn:
+            cursor = conn.execute("DELETE FROM fingerprints WHERE provider = ?", (provider,))
+        return cursor.rowcount
+
+
+_fingerprint_store: Optional[FingerprintStore] = None
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    global _fingerprint_store
+    if _fingerprint_store is None:
+        _fingerprint_store = FingerprintStore(SyncConfig.FINGERPRINTS_DB)
+    return _fingerprint_store
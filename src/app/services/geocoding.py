@@ -0,0 +1,151 @@
+import re
+import json
+import time
+import threading
+import unicodedata
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config.settings import CacheConfig
+from app.services.lodgerin import LodgerinInternal
+from app.services.storage import SqliteStore
+
+# Marca en memoria para las direcciones que la API no encontró
+MISS = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Clave de caché de una dirección: sin diferencias de mayúsculas, espacios
+    ni separadores al inicio o al final.
+    """
+    query = unicodedata.normalize("NFKC", str(query)).casefold()
+    query = re.sub(r"\s+", " ", query)
+    return query.strip(" ,.;-")
+
+
+class GeocodingCache(SqliteStore):
+    """
+    Caché persistente de `/maps/search` con un LRU en memoria delante.
+
+    Las direcciones no encontradas también se guardan (caché negativa) con un
+    TTL más corto; los errores de red no se guardan.
+
+    `invalidate` incrementa la generación guardada en `geocoding_meta`; cada
+    proceso vacía su LRU cuando ve una generación distinta.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS geocoding (
+            query TEXT PRIMARY KEY,
+            result TEXT,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS geocoding_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO geocoding_meta (id, generation) VALUES (1, 0);
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl: float = CacheConfig.GEOCODING_TTL,
+        negative_ttl: float = CacheConfig.GEOCODING_NEGATIVE_TTL,
+        lru_size: int = CacheConfig.GEOCODING_LRU_SIZE,
+        timeout: float = 30.0,
+    ):
+        super().__init__(db_path, timeout)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._generation: Optional[int] = None
+
+    def _remember(self, key: str, expires_at: float, value) -> None:
+        with self._lru_lock:
+            self._lru[key] = (expires_at, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _read_generation(self) -> int:
+        return self.connection.execute("SELECT generation FROM geocoding_meta WHERE id = 1").fetchone()[0]
+
+    def lookup(self, query: str):
+        """
+        Devuelve el resultado guardado, `MISS` si se sabe que no existe o None
+        si hay que consultar la API.
+        """
+        key = normalize_query(query)
+        now = time.time()
+        generation = self._read_generation()
+        with self._lru_lock:
+            if generation != self._generation:
+                # Otro proceso invalidó la caché
+                self._lru.clear()
+                self._generation = generation
+            entry = self._lru.get(key)
+            if entry is not None and entry[0] >= now:
+                self._lru.move_to_end(key)
+                return entry[1]
+
+        row = self.connection.execute(
+            "SELECT result, expires_at FROM geocoding WHERE query = ?", (key,)
+        ).fetchone()
+        if row is None or row["expires_at"] < now:
+            return None
+        value = json.loads(row["result"]) if row["result"] is not None else MISS
+        self._remember(key, row["expires_at"], value)
+        return value
+
+    def store(self, query: str, result: Optional[dict]) -> None:
+        key = normalize_query(query)
+        expires_at = time.time() + (self.ttl if result is not None else self.negative_ttl)
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocoding (query, result, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False) if result is not None else None, expires_at),
+            )
+        self._remember(key, expires_at, result if result is not None else MISS)
+
+    def invalidate(self) -> None:
+        with self.transaction(immediate=True) as conn:
+            conn.execute("DELETE FROM geocoding")
+            conn.execute("UPDATE geocoding_meta SET generation = generation + 1 WHERE id = 1")
+        with self._lru_lock:
+            self._lru.clear()
+
+
+_geocoding_cache: Optional[GeocodingCache] = None
+
+
+def get_geocoding_cache() -> GeocodingCache:
+    global _geocoding_cache
+    if _geocoding_cache is None:
+        _geocoding_cache = GeocodingCache(CacheConfig.GEOCODING_DB)
+    return _geocoding_cache
+
+
+def geocode(query: str) -> Optional[dict]:
+    """
+    Primer resultado de `/maps/search` para la dirección, usando la caché.
+    """
+    if not query:
+        return None
+    cache = get_geocoding_cache()
+    cached = cache.lookup(query)
+    if cached is MISS:
+        return None
+    if cached is not None:
+        return cached
+
+    addresses = LodgerinInternal().search_locations(query)
+    if addresses is None:
+        return None
+    result = addresses[0] if addresses else None
+    cache.store(query, result)
+    return result
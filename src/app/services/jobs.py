@@ -0,0 +1,330 @@
+import os
+import re
+import json
+import time
+import signal
+import logging
+import traceback
+import multiprocessing
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import app.services.scraper as scraper
+
+from app.config.settings import JobsConfig
+from app.models.enums import JobStatus, URLs
+from app.services.storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+REGEX_ITEM_COUNT = re.compile(r"'item_scraped_count': (\d+)")
+REGEX_FINISH_REASON = re.compile(r"'finish_reason': '(\w+)'")
+
+
+class JobStore(SqliteStore):
+    """
+    Cola persistente de trabajos de scraping.
+
+    Los trabajos sobreviven a reinicios de la API: los que quedaron en estado
+    `running` se vuelven a encolar con `requeue_interrupted`.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            page TEXT NOT NULL,
+            url TEXT NOT NULL,
+            refine INTEGER NOT NULL DEFAULT 0,
+            incremental INTEGER NOT NULL DEFAULT 0,
+            resume INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            worker TEXT,
+            item_count INTEGER,
+            error TEXT,
+            output_tail TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        super().__init__(db_path, timeout)
+        self.ensure_column("jobs", "output_tail", "TEXT")
+        self.ensure_column("jobs", "incremental", "INTEGER NOT NULL DEFAULT 0")
+        self.ensure_column("jobs", "resume", "INTEGER NOT NULL DEFAULT 0")
+
+    def enqueue(
+        self,
+        page: str,
+        url: str,
+        refine: bool = False,
+        incremental: bool = False,
+        resume: bool = False,
+    ) -> int:
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (page, url, refine, incremental, resume, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (page, url, int(refine), int(incremental), int(resume), JobStatus.QUEUED.value, time.time()),
+            )
+        return cursor.lastrowid
+
+    def claim_next(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Toma el trabajo encolado más antiguo cuya araña no se esté ejecutando ya
+        (dos corridas de la misma araña comparten log y archivos de salida).
+        """
+        with self.transaction(immediate=True) as conn:
+            row = conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE status = ?
+                  AND page NOT IN (SELECT page FROM jobs WHERE status = ?)
+                ORDER BY id LIMIT 1
+                """,
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, worker = ? WHERE id = ?",
+                (JobStatus.RUNNING.value, time.time(), worker, row["id"]),
+            )
+        return self.get(row["id"])
+
+    def finish(
+        self,
+        job_id: int,
+        status: JobStatus,
+        item_count: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, item_count = ?, error = ? WHERE id = ?",
+                (status.value, time.time(), item_count, error, job_id),
+            )
+
+    def update_output(self, job_id: int, lines: List[str]) -> None:
+        """
+        Guarda las últimas líneas de salida del proceso de Scrapy.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET output_tail = ? WHERE id = ?",
+                (json.dumps(lines, ensure_ascii=False), job_id),
+            )
+
+    def requeue(self, job_id: int) -> None:
+        """
+        Vuelve a encolar un trabajo detenido; al retomarlo continúa desde su JOBDIR.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, worker = NULL, resume = 1 WHERE id = ?",
+                (JobStatus.QUEUED.value, job_id),
+            )
+
+    def requeue_interrupted(self) -> int:
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, worker = NULL, resume = 1 WHERE status = ?",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            )
+        return cursor.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return serialize_job(dict(row))
+
+    def get_latest(self, page: str) -> Optional[Dict[str, Any]]:
+        """
+        Último trabajo iniciado para una araña.
+        """
+        row = self.connection.execute(
+            "SELECT * FROM jobs WHERE page = ? AND started_at IS NOT NULL ORDER BY started_at DESC LIMIT 1",
+            (page,),
+        ).fetchone()
+        if row is None:
+            return None
+        return serialize_job(dict(row))
+
+
+def serialize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte las marcas de tiempo a ISO y calcula la duración del trabajo.
+    """
+    started_at, finished_at = job.get("started_at"), job.get("finished_at")
+    if started_at is None:
+        duration = None
+    else:
+        duration = round((finished_at or time.time()) - started_at, 3)
+
+    for key in ("created_at", "started_at", "finished_at"):
+        if job.get(key) is not None:
+            job[key] = datetime.fromtimestamp(job[key]).isoformat(timespec="seconds")
+
+    job["refine"] = bool(job["refine"])
+    job["incremental"] = bool(job["incremental"])
+    job["resume"] = bool(job["resume"])
+    job["output_tail"] = json.loads(job["output_tail"]) if job.get("output_tail") else []
+    job["duration_seconds"] = duration
+    return job
+
+
+def read_log_tail(log_path: Optional[str], tail_bytes: int = 64 * 1024) -> Optional[str]:
+    if not log_path or not os.path.isfile(log_path):
+        return None
+    with open(log_path, "rb") as log_file:
+        log_file.seek(0, os.SEEK_END)
+        log_file.seek(max(0, log_file.tell() - tail_bytes))
+        return log_file.read().decode("utf-8", errors="replace")
+
+
+def read_item_count(log_path: Optional[str], tail_bytes: int = 64 * 1024) -> Optional[int]:
+    """
+    Obtiene `item_scraped_count` de las estadísticas que Scrapy vuelca al final del log.
+    Solo se lee la cola del archivo.
+    """
+    tail = read_log_tail(log_path, tail_bytes)
+    if tail is None:
+        return None
+    matches = REGEX_ITEM_COUNT.findall(tail)
+    return int(matches[-1]) if matches else 0
+
+
+def read_finish_reason(log_path: Optional[str], tail_bytes: int = 64 * 1024) -> Optional[str]:
+    """
+    `finish_reason` de las estadísticas finales: "finished", "shutdown" (detenida)...
+    """
+    matches = REGEX_FINISH_REASON.findall(read_log_tail(log_path, tail_bytes) or "")
+    return matches[-1] if matches else None
+
+
+_job_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore(JobsConfig.DB_PATH)
+    return _job_store
+
+
+class WorkerInterrupted(BaseException):
+    """
+    Se lanza al recibir SIGTERM; hereda de BaseException para atravesar los
+    `except Exception` del código de scraping.
+    """
+
+
+def _raise_interrupted(signum, frame):
+    raise WorkerInterrupted(f"Señal {signum} recibida")
+
+
+def run_job(store: JobStore, job: Dict[str, Any]) -> None:
+    job_id = job["id"]
+    logger.info(
+        "Ejecutando trabajo %s (%s, refine=%s, incremental=%s, resume=%s)",
+        job_id, job["page"], job["refine"], job["incremental"], job["resume"],
+    )
+    try:
+        log_path = scraper.scrape_page(
+            URLs(job["url"]),
+            job["refine"],
+            on_output=lambda lines: store.update_output(job_id, lines),
+            incremental=job["incremental"],
+            resume=job["resume"],
+        )
+    except WorkerInterrupted:
+        logger.warning("Trabajo %s interrumpido, se vuelve a encolar", job_id)
+        store.requeue(job_id)
+        raise
+    except Exception as error:
+        logger.error("Trabajo %s fallido: %s", job_id, error)
+        logger.error(traceback.format_exc())
+        store.finish(job_id, JobStatus.FAILED, error=str(error))
+    else:
+        if read_finish_reason(log_path) == "shutdown":
+            # Detenida con SIGTERM (p. ej. /kill con graceful): el JOBDIR queda para reanudarla
+            logger.warning("Trabajo %s detenido antes de terminar", job_id)
+            store.finish(job_id, JobStatus.INTERRUPTED, item_count=read_item_count(log_path))
+            return
+        if not job["refine"]:
+            scraper.clear_jobdir(job["page"])
+        store.finish(job_id, JobStatus.FINISHED, item_count=read_item_count(log_path))
+
+
+def worker_main(worker_name: str, db_path: str, stop_event, poll_interval: float) -> None:
+    """
+    Bucle de un worker: toma trabajos de la cola hasta que se pide detenerlo.
+    """
+    signal.signal(signal.SIGTERM, _raise_interrupted)
+    store = JobStore(db_path)
+    logger.info("Worker %s iniciado (PID: %s)", worker_name, os.getpid())
+    try:
+        while not stop_event.is_set():
+            job = store.claim_next(worker_name)
+            if job is None:
+                stop_event.wait(poll_interval)
+                continue
+            run_job(store, job)
+    except (WorkerInterrupted, KeyboardInterrupt):
+        pass
+    finally:
+        store.close()
+        logger.info("Worker %s detenido", worker_name)
+
+
+class WorkerPool:
+    """
+    Pool acotado de procesos que consumen la cola de trabajos.
+
+    El número de procesos limita cuántas arañas corren a la vez, sin ocupar
+    hilos del servidor de la API.
+    """
+
+    def __init__(
+        self,
+        db_path: str = JobsConfig.DB_PATH,
+        max_workers: int = JobsConfig.MAX_WORKERS,
+        poll_interval: float = JobsConfig.POLL_INTERVAL,
+    ):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes: list = []
+
+    def start(self) -> None:
+        requeued = JobStore(self.db_path).requeue_interrupted()
+        if requeued:
+            logger.info("Se volvieron a encolar %s trabajos interrumpidos", requeued)
+
+        for index in range(self.max_workers):
+            process = self._context.Process(
+                target=worker_main,
+                args=(f"worker-{index}", self.db_path, self._stop_event, self.poll_interval),
+                name=f"scraper-worker-{index}",
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info("Pool de scraping iniciado con %s workers", self.max_workers)
+
+    def stop(self, timeout: float = JobsConfig.STOP_TIMEOUT) -> None:
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                # Los trabajos en curso se vuelven a encolar al recibir SIGTERM
+                process.terminate()
+                process.join()
+        self._processes = []
+        logger.info("Pool de scraping detenido")
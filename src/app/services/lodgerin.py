@@ -1,20 +1,95 @@
+import re
+import asyncio
 import logging
+import threading
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.config.settings import GlobalConfig, LodgerinConfig, TokenConfig,EmailConfig, ElementsConfig
 
+
+class LodgerinSession(requests.Session):
+    """
+    Sesión con timeout por defecto: `requests` no permite configurarlo a nivel de sesión.
+    """
+
+    def __init__(self, timeout: float = LodgerinConfig.TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+# `POST /rental-units/{id}/calendar` agrega fechas en lugar de reemplazarlas
+CALENDAR_PATH = re.compile(r"/rental-units/[^/]+/calendar")
+
+
+class UpsertRetry(Retry):
+    """
+    Reintenta los POST solo si son upserts: repetir el del calendario tras un
+    timeout podría insertar rangos de fechas duplicados.
+    """
+
+    def increment(self, method=None, url=None, *args, **kwargs):
+        if method == "POST" and url and CALENDAR_PATH.search(url):
+            return Retry.increment(self.new(total=0), method, url, *args, **kwargs)
+        return super().increment(method, url, *args, **kwargs)
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(base_url: str) -> requests.Session:
+    """
+    Devuelve la sesión compartida para una URL base.
+
+    Mantiene un pool de conexiones keep-alive y reintenta con backoff
+    exponencial ante 429 y errores 5xx (respetando `Retry-After`).
+    """
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            retry = UpsertRetry(
+                total=LodgerinConfig.MAX_RETRIES,
+                backoff_factor=LodgerinConfig.BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                # Los POST de propiedades y rental units son upserts; el del calendario no se repite
+                allowed_methods=frozenset(["GET", "POST"]),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=LodgerinConfig.POOL_CONNECTIONS,
+                pool_maxsize=LodgerinConfig.POOL_MAXSIZE,
+                max_retries=retry,
+            )
+            session = LodgerinSession()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[base_url] = session
+        return session
+
+
 class LodgerinInternal:
     def __init__(self, lang="en"):
         self.base_url = LodgerinConfig.INTERNAL_URL
         self.base_url_maps = LodgerinConfig.MAPS_INTERNAL_URL
         self.headers = {"x-access-token": TokenConfig.API_INTERNAL, "x-access-lang": lang}
         self.data = {}
+        self.session = get_session(self.base_url)
+        self.session_maps = get_session(self.base_url_maps)
 
     def get_api_key(self, email):
         url = f"{self.base_url}/integrations/inputs/api-key-scraping-by-email"
         try:
-            response = requests.get(url, headers=self.headers, params={"email": email})
+            response = self.session.get(url, headers=self.headers, params={"email": email})
             response.raise_for_status()
             data = response.json()
             api_key = data.get("data", {}).get("apiKey")
@@ -27,21 +102,21 @@ class LodgerinInternal:
             logging.info(f"An error occurred: {err}")
         return None
 
-    def search_location(self, query):
+    def search_locations(self, query) -> Optional[List[dict]]:
+        """
+        Resultados de `/maps/search` para la consulta: lista vacía si no hay
+        coincidencias y None si la petición falló.
+        """
         url = f"{self.base_url_maps}/maps/search"
         try:
-            response = requests.get(
+            response = self.session_maps.get(
                 url,
                 headers=self.headers,
-                params={"q": query, "size": 60, "region[]": "ES"},
-                timeout=10,
+                params={"q": query, "size": 50, "region[]": "ES"},
             )
             response.raise_for_status()
             data = response.json()
-            address = data.get("data", {})[0]
-            if not address:
-                raise Exception("La clave 'address' no se encuentra en la respuesta.")
-            return address
+            return data.get("data") or []
         except requests.exceptions.HTTPError as err:
             logging.info(f"HTTP error occurred: {err}")
         except Exception as err:
@@ -49,24 +124,11 @@ class LodgerinInternal:
         return None
 
     def search_location(self, query):
-        url = f"{self.base_url_maps}/maps/search"
-        try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                params={"q": query, "size": 50, "region[]": "ES"},
-            )
-            response.raise_for_status()
-            data = response.json()
-            address = data.get("data", {})[0]
-            if not address:
-                raise Exception("La clave 'address' no se encuentra en la respuesta.")
-            return address
-        except requests.exceptions.HTTPError as err:
-            print(f"HTTP error occurred: {err}")
-        except Exception as err:
-            print(f"An error occurred: {err}")
-        return None
+        addresses = self.search_locations(query)
+        if not addresses:
+            logging.info(f"No se encontró la dirección para: {query}")
+            return None
+        return addresses[0]
 
 
 class LodgerinAPI:
@@ -74,6 +136,7 @@ class LodgerinAPI:
         self.base_url = LodgerinConfig.API_URL
         self.headers = {"x-access-apikey": api_key, "x-access-lang": lang}
         self.data = {}
+        self.session = get_session(self.base_url)
 
     # GET
     def get_elements(self):
@@ -88,7 +151,7 @@ class LodgerinAPI:
         """
         url = f"{self.base_url}/elements"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as err:
@@ -100,7 +163,7 @@ class LodgerinAPI:
     def get_properties(self, limit=100):
         url = f"{self.base_url}/properties?limit={limit}"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as err:
@@ -112,7 +175,7 @@ class LodgerinAPI:
     def get_rental_units(self, limit=100):
         url = f"{self.base_url}/rental-units?limit={limit}"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as err:
@@ -139,7 +202,7 @@ class LodgerinAPI:
         url = f"{self.base_url}/rental-units/{rental_unit_id}/calendar"
 
         try:
-            response = requests.get(url, headers=self.headers, params=end_date)
+            response = self.session.get(url, headers=self.headers, params=end_date)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -160,7 +223,7 @@ class LodgerinAPI:
     def create_or_update_property(self, property_data):
         url = f"{self.base_url}/properties"
         try:
-            response = requests.post(url, json=property_data, headers=self.headers)
+            response = self.session.post(url, json=property_data, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -181,7 +244,7 @@ class LodgerinAPI:
     def create_or_update_rental_unit(self, rental_unit_data):
         url = f"{self.base_url}/rental-units"
         try:
-            response = requests.post(url, json=rental_unit_data, headers=self.headers)
+            response = self.session.post(url, json=rental_unit_data, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -217,7 +280,7 @@ class LodgerinAPI:
         payload = {"dates": dates}
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.session.post(url, headers=self.headers, json=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -233,3 +296,225 @@ class LodgerinAPI:
             logging.info(f"Request error occurred: {req_err}")
         except Exception as err:
             logging.info(f"An unexpected error occurred: {err}")
+
+
+class AsyncLodgerinAPI:
+    """
+    Variante asíncrona de `LodgerinAPI` para los upserts de los ETL.
+
+    Un semáforo limita las peticiones simultáneas y se reintenta con backoff
+    exponencial ante 429/5xx, igual que la sesión síncrona. Usar como
+    `async with AsyncLodgerinAPI(api_key) as api: ...`.
+    """
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        api_key,
+        lang="en",
+        max_concurrency: int = LodgerinConfig.MAX_CONCURRENCY,
+    ):
+        self.base_url = LodgerinConfig.API_URL
+        self.headers = {"x-access-apikey": api_key, "x-access-lang": lang}
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=LodgerinConfig.TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Envía la petición reintentando errores de red, 429 y 5xx. Devuelve la
+        última respuesta sin validar el código de estado. El POST del
+        calendario no es un upsert y no se reintenta.
+        """
+        max_retries = 0 if method == "POST" and CALENDAR_PATH.search(path) else LodgerinConfig.MAX_RETRIES
+        async with self.semaphore:
+            for attempt in range(max_retries + 1):
+                try:
+                    response = await self.client.request(method, path, **kwargs)
+                except httpx.TransportError:
+                    if attempt == max_retries:
+                        raise
+                else:
+                    if response.status_code not in self.RETRY_STATUS or attempt == max_retries:
+                        return response
+                await asyncio.sleep(LodgerinConfig.BACKOFF_FACTOR * (2 ** attempt))
+
+    async def _request(self, method: str, path: str, **kwargs) -> Optional[dict]:
+        response = None
+        try:
+            response = await self._send(method, path, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as http_err:
+            error_message = (
+                response.text
+                if response.content
+                else "No additional error details provided"
+            )
+            logging.error(
+                f"HTTP error occurred: {http_err} - Response content: {error_message}"
+            )
+        except httpx.RequestError as req_err:
+            logging.info(f"Request error occurred: {req_err}")
+        except Exception as err:
+            logging.info(f"An unexpected error occurred: {err}")
+        return None
+
+    async def get_rental_unit_calendar(self, rental_unit_id: str):
+        return await self._request("GET", f"/rental-units/{rental_unit_id}/calendar")
+
+    async def create_or_update_property(self, property_data):
+        return await self._request("POST", "/properties", json=property_data)
+
+    async def create_or_update_rental_unit(self, rental_unit_data):
+        return await self._request("POST", "/rental-units", json=rental_unit_data)
+
+    async def create_rental_unit_calendar(
+        self, rental_unit_id: str, dates: List[Dict[str, Optional[str]]]
+    ):
+        return await self._request(
+            "POST", f"/rental-units/{rental_unit_id}/calendar", json={"dates": dates}
+        )
+
+
+RENTAL_UNIT_SAVED_MSG = "The rental unit has been saved successfully!"
+
+
+class RentalUnitBatcher:
+    """
+    Acumula `RentalUnits` y los envía en lotes al endpoint masivo de la API.
+
+    Cada lote se envía en cuanto se completa; `flush()` envía el resto y
+    espera a todos. El ID devuelto se asigna a `rental_unit.id`. Si el
+    servidor rechaza el lote (o no devuelve alguna unidad) esas unidades se
+    envían una a una; si el endpoint no existe no se vuelve a intentar en
+    este proceso.
+    """
+
+    # Códigos con los que el servidor indica que no admite el endpoint masivo
+    UNSUPPORTED_STATUS = (404, 405, 501)
+    _supported_urls: set = set()
+    _unsupported_urls: set = set()
+
+    def __init__(
+        self,
+        lodgerin_api: AsyncLodgerinAPI,
+        batch_size: int = LodgerinConfig.BATCH_SIZE,
+        bulk_path: str = LodgerinConfig.BULK_RENTAL_UNITS_PATH,
+    ):
+        self.lodgerin_api = lodgerin_api
+        self.batch_size = max(1, batch_size)
+        self.bulk_path = bulk_path
+        self.bulk_url = f"{self.lodgerin_api.base_url}{bulk_path}"
+        self.pending: list = []
+        self.tasks: List[asyncio.Task] = []
+        self._probe_lock = asyncio.Lock()
+
+    @property
+    def bulk_supported(self) -> bool:
+        return bool(self.bulk_path) and self.bulk_url not in self._unsupported_urls
+
+    def add(self, rental_unit) -> None:
+        self.pending.append(rental_unit)
+        if len(self.pending) >= self.batch_size:
+            self._send_pending()
+
+    def _send_pending(self) -> None:
+        batch, self.pending = self.pending, []
+        if batch:
+            self.tasks.append(asyncio.ensure_future(self._send_batch(batch)))
+
+    async def flush(self) -> None:
+        self._send_pending()
+        tasks, self.tasks = self.tasks, []
+        await asyncio.gather(*tasks)
+
+    async def _send_batch(self, batch: list) -> None:
+        remaining = batch
+        if self.bulk_supported and len(batch) > 1:
+            if self.bulk_url in self._supported_urls:
+                remaining = await self._send_bulk(batch)
+            else:
+                # Mientras no se sepa si el endpoint existe, solo un lote lo prueba
+                async with self._probe_lock:
+                    if self.bulk_supported:
+                        remaining = await self._send_bulk(batch)
+        if remaining:
+            await asyncio.gather(*(self._send_one(rental_unit) for rental_unit in remaining))
+
+    async def _send_bulk(self, batch: list) -> list:
+        """
+        Envía un lote y devuelve las unidades que hay que reenviar una a una.
+        """
+        try:
+            response = await self.lodgerin_api._send(
+                "POST", self.bulk_path, json={"rentalUnits": [item.model_dump() for item in batch]}
+            )
+        except httpx.RequestError as req_err:
+            logging.info(f"Request error occurred: {req_err}")
+            return batch
+
+        if response.status_code in self.UNSUPPORTED_STATUS:
+            logging.info(f"Endpoint masivo no disponible ({response.status_code}), se envían las unidades una a una")
+            self._unsupported_urls.add(self.bulk_url)
+            return batch
+        if response.is_error:
+            logging.error(f"Lote de {len(batch)} rental units rechazado: {response.status_code} - {response.text}")
+            return batch
+
+        self._supported_urls.add(self.bulk_url)
+        try:
+            results = response.json().get("data") or []
+        except ValueError:
+            return batch
+
+        by_reference = {
+            result.get("referenceCode"): result
+            for result in results
+            if isinstance(result, dict) and result.get("referenceCode")
+        }
+        remaining = []
+        for index, rental_unit in enumerate(batch):
+            result = by_reference.get(rental_unit.referenceCode)
+            if result is None and not by_reference and len(results) == len(batch):
+                # Sin referenceCode en la respuesta se asume el mismo orden del lote
+                result = results[index]
+            if isinstance(result, dict) and result.get("id"):
+                rental_unit.id = result["id"]
+            else:
+                remaining.append(rental_unit)
+
+        logging.info(f"Lote de rental units guardado: {len(batch) - len(remaining)}/{len(batch)}")
+        return remaining
+
+    async def _send_one(self, rental_unit) -> None:
+        response = await self.lodgerin_api.create_or_update_rental_unit(rental_unit.model_dump())
+        if response and response.get("msg") == RENTAL_UNIT_SAVED_MSG:
+            rental_unit.id = response.get("data", {}).get("id")
+        else:
+            logging.error(f"Failed to save rental_unit {rental_unit.referenceCode}: {response}")
+
+
+@lru_cache(maxsize=None)
+def get_lodgerin_api(api_key: str, lang: str = "en") -> LodgerinAPI:
+    """
+    Cliente de Lodgerin reutilizable por api_key (todos comparten la sesión HTTP).
+    """
+    return LodgerinAPI(api_key, lang)
@@ -0,0 +1,176 @@
+import os
+import re
+import json
+import threading
+
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.models.enums import ConfigErrorScraper
+
+REGEX_ERROR = re.compile(ConfigErrorScraper.REGEX_ERROR.value)
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _get_lock(path: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+class LogIndex:
+    """
+    Índice incremental del log de una araña.
+
+    Guarda en un archivo `<log>.idx` el último byte leído y los contadores del
+    estado (open/close, errores con su posición), de forma que cada consulta
+    solo lee los bytes nuevos del log. Si el log se trunca o se recrea el
+    índice se reconstruye desde cero.
+    """
+
+    HEAD_BYTES = 256
+
+    def __init__(
+        self,
+        log_path: str,
+        index_path: Optional[str] = None,
+        lines_before: int = 10,
+        lines_after: int = 20,
+        tail_lines: int = 10,
+        max_errors: int = 50,
+    ):
+        self.log_path = log_path
+        self.index_path = index_path or f"{log_path}.idx"
+        self.lines_before = lines_before
+        self.lines_after = lines_after
+        self.tail_lines = tail_lines
+        self.max_errors = max_errors
+
+    def _empty_state(self, stat: os.stat_result, head: str) -> Dict[str, Any]:
+        return {
+            "inode": stat.st_ino,
+            "head": head,
+            "offset": 0,
+            "line_count": 0,
+            "open_seen": False,
+            "close_seen": False,
+            "error_count": 0,
+            "errors": [],
+            "recent_offsets": [],
+            "tail": [],
+        }
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(state, index_file, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _read_head(self, log_file) -> str:
+        log_file.seek(0)
+        return log_file.read(self.HEAD_BYTES).decode("utf-8", errors="replace")
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Lee solo los bytes agregados desde la última consulta y actualiza el índice.
+        """
+        with _get_lock(self.index_path):
+            with open(self.log_path, "rb") as log_file:
+                stat = os.fstat(log_file.fileno())
+                head = self._read_head(log_file)
+                state = self._load_state()
+                if (
+                    state is None
+                    or state["inode"] != stat.st_ino
+                    or state["offset"] > stat.st_size
+                    or not head.startswith(state["head"])
+                ):
+                    state = self._empty_state(stat, head)
+                elif len(state["head"]) < self.HEAD_BYTES:
+                    state["head"] = head
+
+                start_offset = state["offset"]
+                self._scan(log_file, state)
+
+            if state["offset"] != start_offset or not os.path.exists(self.index_path):
+                self._save_state(state)
+            return state
+
+    def _scan(self, log_file, state: Dict[str, Any]) -> None:
+        recent_offsets = deque(state["recent_offsets"], maxlen=self.lines_before)
+        tail = deque(state["tail"], maxlen=self.tail_lines)
+        offset = state["offset"]
+
+        log_file.seek(offset)
+        for raw_line in log_file:
+            if not raw_line.endswith(b"\n"):
+                # Línea incompleta: se procesa cuando Scrapy termine de escribirla
+                break
+            line = raw_line.decode("utf-8", errors="replace")
+
+            if "open_spider" in line:
+                state["open_seen"] = True
+            if "close_spider" in line:
+                state["close_seen"] = True
+            if REGEX_ERROR.search(line):
+                state["error_count"] += 1
+                if len(state["errors"]) < self.max_errors:
+                    state["errors"].append({
+                        "line": state["line_count"],
+                        "text": line,
+                        "offset": offset,
+                        "context_offset": recent_offsets[0] if recent_offsets else offset,
+                    })
+
+            recent_offsets.append(offset)
+            tail.append(line)
+            offset += len(raw_line)
+            state["line_count"] += 1
+
+        state["offset"] = offset
+        state["recent_offsets"] = list(recent_offsets)
+        state["tail"] = list(tail)
+
+    def _read_window(self, error: Dict[str, Any]) -> List[str]:
+        """
+        Líneas alrededor de un error, leídas desde su posición en el log.
+        """
+        lines_count = error["line"] - max(0, error["line"] - self.lines_before) + self.lines_after
+        window = []
+        with open(self.log_path, "rb") as log_file:
+            log_file.seek(error["context_offset"])
+            for raw_line in log_file:
+                window.append(raw_line.decode("utf-8", errors="replace"))
+                if len(window) >= lines_count:
+                    break
+        return window
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Estado de la araña con la misma forma que devolvía `check_log_status`.
+        """
+        state = self.update()
+        if state["errors"]:
+            return {
+                "status": "error",
+                "details": {
+                    f'Error in line: {error["line"]}. Error: {error["text"]}': self._read_window(error)
+                    for error in state["errors"]
+                },
+            }
+
+        if state["open_seen"] and not state["close_seen"]:
+            status = "running"
+        elif state["close_seen"]:
+            status = "finished"
+        else:
+            status = "not_started"
+        return {"status": status, "details": state["tail"]}
@@ -0,0 +1,74 @@
+import time
+import logging
+import threading
+
+from collections import deque
+from typing import IO, Callable, List, Optional
+
+from app.config.settings import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+
+class LogRelay:
+    """
+    Reenvía la salida de un proceso hijo línea a línea al log de la app.
+
+    Solo se conservan en memoria las últimas `max_lines` líneas (para el
+    endpoint de estado), así la memoria no crece con la duración del crawl.
+    `on_output` recibe esa cola como máximo cada `flush_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_lines: int = ScraperConfig.OUTPUT_TAIL_LINES,
+        on_output: Optional[Callable[[List[str]], None]] = None,
+        flush_interval: float = ScraperConfig.OUTPUT_FLUSH_INTERVAL,
+    ):
+        self.name = name
+        self.on_output = on_output
+        self.flush_interval = flush_interval
+        self._lines: deque = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._last_flush = 0.0
+
+    def follow(self, stream: IO[str], level: int = logging.INFO) -> None:
+        thread = threading.Thread(
+            target=self._pump, args=(stream, level), name=f"relay-{self.name}", daemon=True
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def _pump(self, stream: IO[str], level: int) -> None:
+        with stream:
+            for line in stream:
+                line = line.rstrip("\n")
+                logger.log(level, f"[{self.name}] {line}")
+                with self._lock:
+                    self._lines.append(line)
+                self._flush()
+
+    def _flush(self, force: bool = False) -> None:
+        if self.on_output is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_flush < self.flush_interval:
+                return
+            self._last_flush = now
+            lines = list(self._lines)
+        try:
+            self.on_output(lines)
+        except Exception as error:
+            logger.warning(f"No se pudo publicar la salida de {self.name}: {error}")
+
+    def tail(self) -> List[str]:
+        with self._lock:
+            return list(self._lines)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+        self._flush(force=True)
@@ -1,13 +1,15 @@
 import os
 import json
+import shutil
 import logging
 import traceback
 import subprocess
 
-from typing import Callable, Dict, Optional, Tuple
-from app.config.settings import EmailConfig, ElementsConfig, LOG_DIR, BASE_DIR, SCRAPY_DIR
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config.settings import EmailConfig, ElementsConfig, HttpCacheConfig, ScraperConfig, LOG_DIR, BASE_DIR, SCRAPY_DIR
 from app.models.enums import URLs, Pages
 from app.scrapy.common import initialize_scraping_context, initialize_scraping_context_maps
+from app.services.log_relay import LogRelay
 
 
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -26,30 +28,89 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-def run_webscraping(url: URLs, flag_refine=False) -> None:
+def run_webscraping(url: URLs, flag_refine=False) -> Optional[str]:
     """
     Ejecuta Scrapy en un proceso separado usando subprocess con contexto adicional.
 
     Args:
         url (URLs): URL de la página que será scrapeada.
+
+    Returns:
+        str | None: Ruta del log de la araña, o None si el scraping falló.
     """
     try:
-        scrapy_path, context = get_path_and_context(url)
-        if any([scrapy_path is None, context is None]):
-            logger.error(f"No se encontró una araña para la URL: {url}")
-            return None
-        
-        spider_name = f"{scrapy_path}_spider"
-        output_folder_path = os.path.join(BASE_DIR, "logs", f"{scrapy_path}.log")        
-        if os.path.exists(output_folder_path):
-            os.remove(output_folder_path)
-
-        logger.info(f"Ejecutando Scrapy con la araña: {spider_name}")
-        execute_spider(scrapy_path, spider_name, output_folder_path, context, flag_refine)
-
+        return scrape_page(url, flag_refine)
     except Exception as e:
         logger.error(f"Error al hacer scraping para {url}: {str(e)}")
         logger.error(traceback.format_exc())
+        return None
+
+
+def scrape_page(
+        url: URLs,
+        flag_refine=False,
+        on_output: Optional[Callable[[List[str]], None]] = None,
+        incremental: bool = False,
+        resume: bool = False,
+    ) -> Optional[str]:
+    """
+    Igual que `run_webscraping`, pero propaga los errores para que el llamador
+    (p. ej. los workers de la cola de trabajos) pueda registrar el fallo.
+    `on_output` recibe periódicamente las últimas líneas de salida de Scrapy.
+    Con `incremental` se omiten las páginas de detalle sin cambios en el listado.
+    Con `resume` se continúa desde el JOBDIR de una corrida detenida; si no, se
+    empieza de cero.
+
+    Returns:
+        str | None: Ruta del log de la araña, o None si no existe araña para la URL.
+    """
+    scrapy_path, context = get_path_and_context(url)
+    if any([scrapy_path is None, context is None]):
+        logger.error(f"No se encontró una araña para la URL: {url}")
+        return None
+
+    spider_name = f"{scrapy_path}_spider"
+    output_folder_path = os.path.join(BASE_DIR, "logs", f"{scrapy_path}.log")
+    for stale_path in (output_folder_path, f"{output_folder_path}.idx"):
+        # El log y su índice de estado se recrean en cada corrida
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    jobdir = None
+    if not flag_refine:
+        jobdir = get_jobdir(scrapy_path)
+        if resume and os.path.isdir(jobdir):
+            logger.info(f"Reanudando {spider_name} desde {jobdir}")
+        else:
+            clear_jobdir(scrapy_path)
+
+    logger.info(f"Ejecutando Scrapy con la araña: {spider_name}")
+    if ScraperConfig.EXECUTION_MODE == "inprocess":
+        # Import diferido: instala el reactor de Twisted solo en el proceso que ejecuta arañas
+        from app.services.crawler_host import run_spider
+
+        returncode = run_spider(
+            scrapy_path, spider_name, output_folder_path, context, flag_refine,
+            incremental=incremental, jobdir=jobdir,
+        )
+    else:
+        returncode = execute_spider(
+            scrapy_path, spider_name, output_folder_path, context, flag_refine, on_output, incremental, jobdir
+        )
+    if returncode != 0:
+        raise RuntimeError(f"La araña {spider_name} terminó con código {returncode}")
+    return output_folder_path
+
+
+def get_jobdir(scrapy_path: str) -> str:
+    return os.path.join(ScraperConfig.JOBDIR_ROOT, scrapy_path)
+
+
+def clear_jobdir(scrapy_path: str) -> None:
+    """
+    Borra la cola y el checkpoint guardados de la araña (el crawl terminó o se reinicia).
+    """
+    shutil.rmtree(get_jobdir(scrapy_path), ignore_errors=True)
 
 
 def get_path_and_context(url: URLs) -> Tuple[None | str | Callable]:
@@ -105,19 +166,29 @@ def execute_spider(
         output_folder_path: str,
         context: Dict[str, list],
         flag_refine=False,
-    ) -> None:
+        on_output: Optional[Callable[[List[str]], None]] = None,
+        incremental: bool = False,
+        jobdir: Optional[str] = None,
+    ) -> int:
+    process = None
     try:
         command = [
                 "scrapy", "crawl", spider_name,
                 "-a", f"context={json.dumps(context)}",
                 "-a", f"output_folder_path={ElementsConfig.PATH_DATA}",
                 "-s", f"LOG_FILE={output_folder_path}",
-                "-s", f"LOG_FORMAT=%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(funcName)s:%(lineno)d - %(message)s",
+                "-s", f"LOG_FORMAT={ScraperConfig.LOG_FORMAT}",
                 "-s", f"LOG_LEVEL=INFO",
-                "-s", f"LOG_DATEFORMAT=%Y-%m-%d %H:%M:%S",
+                "-s", f"LOG_DATEFORMAT={ScraperConfig.LOG_DATEFORMAT}",
         ]
+        for name, value in HttpCacheConfig.SPIDER_SETTINGS.items():
+            command.extend(["-s", f"{name}={value}"])
         if flag_refine:
             command.extend(["-a", "refine=1"])
+        if incremental:
+            command.extend(["-a", "incremental=1"])
+        if jobdir:
+            command.extend(["-s", f"JOBDIR={jobdir}"])
         process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
@@ -125,18 +196,27 @@ def execute_spider(
             text=True,
             cwd=str(SCRAPY_DIR / scrapy_path / scrapy_path),
             encoding="utf-8",
+            errors="replace",
+            bufsize=1,
         )
 
         logger.info(f"Scraping iniciado para {spider_name} (PID: {process.pid})")
 
-        stdout, stderr = process.communicate()
-        if stdout:
-            logger.info(f"Scrapy Output para {spider_name}:\n{stdout}")
-        if stderr:
-            logger.error(f"Scrapy Error para {spider_name}:\n{stderr}")
+        # La salida se lee línea a línea en lugar de acumularla con communicate()
+        relay = LogRelay(spider_name, on_output=on_output)
+        relay.follow(process.stdout, logging.INFO)
+        relay.follow(process.stderr, logging.ERROR)
+        process.wait()
+        relay.join()
 
     except Exception as error:
         logger.error('Problemas al ejecutar el spider. Error: %s', error)
         raise RuntimeError('Problemas al ejecutar el spider') from error
 
-    return None
+    finally:
+        if process is not None and process.poll() is None:
+            # El llamador fue interrumpido: se detiene Scrapy de forma ordenada
+            process.terminate()
+            process.wait()
+
+    return process.returncode
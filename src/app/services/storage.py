@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class SqliteStore:
+    """
+    Base para los almacenes locales en SQLite.
+
+    Cada hilo obtiene su propia conexión (las conexiones de sqlite3 no se
+    comparten entre hilos) y el archivo se abre en modo WAL para que la API,
+    los workers y los procesos de Scrapy puedan leer y escribir a la vez.
+    """
+
+    SCHEMA: str = ""
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        self.db_path = str(db_path)
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.SCHEMA:
+            self.connection.executescript(self.SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Abre una transacción explícita. Con `immediate=True` se toma el lock de
+        escritura desde el inicio, útil para operaciones de lectura-escritura
+        atómicas entre procesos.
+        """
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def ensure_column(self, table: str, column: str, definition: str) -> None:
+        """
+        Agrega una columna a una tabla creada por una versión anterior del esquema.
+        """
+        columns = {row["name"] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
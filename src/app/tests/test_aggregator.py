@@ -0,0 +1,44 @@
+from scrapy.http import HtmlResponse
+from twisted.python.failure import Failure
+
+from app.scrapy.aggregator import ItemAggregator
+
+
+def respond(request):
+    response = HtmlResponse(url=request.url, body=b"<html></html>", request=request)
+    return list(request.callback(response, **request.cb_kwargs))
+
+
+def test_item_is_emitted_once_after_nested_requests():
+    emitted = []
+
+    def on_complete(data):
+        emitted.append(data)
+        yield data
+
+    def parse_child(response, aggregator):
+        aggregator.data["children"].append(response.url)
+        return ()
+
+    def parse_parent(response, aggregator):
+        for index in range(2):
+            yield aggregator.request(f"https://example.com/child/{index}", parse_child)
+
+    aggregator = ItemAggregator({"children": []}, on_complete)
+    parent = aggregator.request("https://example.com/parent", parse_parent)
+    assert list(aggregator.close()) == []
+
+    children = respond(parent)
+    assert len(children) == 2 and not emitted
+
+    assert respond(children[0]) == []
+    failure = Failure(Exception("timeout"))
+    failure.request = children[1]
+    assert list(children[1].errback(failure)) == [{"children": ["https://example.com/child/0"]}]
+    assert len(emitted) == 1
+
+
+def test_item_without_requests_is_emitted_on_close():
+    aggregator = ItemAggregator({"name": "property"}, lambda data: [data])
+    assert list(aggregator.close()) == [{"name": "property"}]
+    assert list(aggregator.close()) == []
@@ -0,0 +1,54 @@
+import os
+import stat
+
+from app.services.cache import TTLCache
+
+
+def test_values_are_shared_through_disk_and_invalidated(tmp_path):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"features": [1, 2]}
+
+    api_cache = TTLCache("elements", ttl=60, directory=str(tmp_path))
+    worker_cache = TTLCache("elements", ttl=60, directory=str(tmp_path))
+
+    assert api_cache.get_or_set("key", fetch) == {"features": [1, 2]}
+    # Otro proceso lee el valor desde disco sin volver a consultar la API
+    assert worker_cache.get_or_set("key", fetch) == {"features": [1, 2]}
+    assert len(calls) == 1
+
+    api_cache.invalidate()
+    assert worker_cache.get("key") is None
+
+
+def test_expired_and_none_values_are_not_served(tmp_path):
+    cache = TTLCache("api_keys", ttl=-1, directory=str(tmp_path))
+    cache.set("mail@example.com", "secret")
+    assert cache.get("mail@example.com") is None
+    assert cache.get_or_set("otro@example.com", lambda: None) is None
+    assert not (tmp_path / "api_keys.json").read_text(encoding="utf-8").count("otro")
+
+
+def test_invalidation_reaches_workers_after_the_file_is_recreated(tmp_path):
+    api_cache = TTLCache("elements", ttl=60, directory=str(tmp_path))
+    worker_cache = TTLCache("elements", ttl=60, directory=str(tmp_path))
+    other_worker_cache = TTLCache("elements", ttl=60, directory=str(tmp_path))
+
+    api_cache.set("key", "viejo")
+    assert worker_cache.get("key") == "viejo"
+
+    api_cache.invalidate()
+    # Otro worker vuelve a crear el archivo antes de que el primero lea
+    other_worker_cache.set("otra", "nuevo")
+    assert worker_cache.get("key") is None
+    assert worker_cache.get("otra") == "nuevo"
+
+
+def test_cache_files_are_private(tmp_path):
+    cache = TTLCache("api_keys", ttl=60, directory=str(tmp_path))
+    cache.set("mail@example.com", "secret")
+    cache.invalidate("mail@example.com")
+    for name in ("api_keys.json", "api_keys.generation"):
+        assert stat.S_IMODE(os.stat(tmp_path / name).st_mode) == 0o600
@@ -0,0 +1,38 @@
+import asyncio
+
+from app.models.schemas import RentalUnitsCalendarItem
+from app.services.calendar_sync import CalendarStore, CalendarSync
+
+
+class FakeLodgerinAPI:
+    def __init__(self, remote):
+        self.remote = remote
+        self.calls = []
+
+    async def get_rental_unit_calendar(self, rental_unit_id):
+        self.calls.append(("GET", rental_unit_id))
+        return {"data": self.remote.get(rental_unit_id, [])}
+
+    async def create_rental_unit_calendar(self, rental_unit_id, dates):
+        self.calls.append(("POST", rental_unit_id, [date["endDate"] for date in dates]))
+        return {"msg": "ok"}
+
+
+def test_only_new_ranges_are_sent(tmp_path):
+    store = CalendarStore(tmp_path / "calendars.sqlite3")
+    lodgerin_api = FakeLodgerinAPI({"ru-1": [{"startDate": "2025-01-01", "endDate": "2025-06-30"}]})
+    calendars = [
+        ("ru-1", RentalUnitsCalendarItem(startDate="2025-02-01", endDate="2025-06-30")),
+        ("ru-1", RentalUnitsCalendarItem(startDate="2025-02-01", endDate="2025-09-30")),
+        ("ru-2", RentalUnitsCalendarItem(startDate="None", endDate="None")),
+    ]
+
+    stats = asyncio.run(CalendarSync(lodgerin_api, store).sync(calendars))
+    assert stats == {"added": 1, "removed": 0, "unchanged": 1}
+    assert lodgerin_api.calls == [("GET", "ru-1"), ("POST", "ru-1", ["2025-09-30"])]
+
+    # En la siguiente corrida la copia local evita el GET y no hay cambios que enviar
+    lodgerin_api.calls.clear()
+    stats = asyncio.run(CalendarSync(lodgerin_api, store).sync(calendars[:1]))
+    assert lodgerin_api.calls == []
+    assert stats == {"added": 0, "removed": 1, "unchanged": 1}
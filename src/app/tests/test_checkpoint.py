@@ -0,0 +1,21 @@
+import json
+
+import scrapy
+
+from app.scrapy.checkpoint import ResumeMiddleware
+
+
+class StubSpider(scrapy.Spider):
+    name = "stub_spider"
+
+
+def test_start_requests_are_skipped_when_resuming(tmp_path):
+    spider = StubSpider()
+    spider.crawler = type("StubCrawler", (), {"settings": scrapy.settings.Settings({"JOBDIR": str(tmp_path)})})()
+    start_requests = [scrapy.Request("https://example.com/")]
+
+    assert list(ResumeMiddleware().process_start_requests(start_requests, spider)) == start_requests
+
+    (tmp_path / "requests.queue").mkdir()
+    (tmp_path / "requests.queue" / "active.json").write_text(json.dumps([0]))
+    assert list(ResumeMiddleware().process_start_requests(start_requests, spider)) == []
@@ -0,0 +1,36 @@
+from app.scrapy.common import extract_embedded_json, iter_embedded_json_array, loads_js
+
+
+HTML = """
+<script>
+  const postData = [{"Titulo": "Piso [centro]", "Precio": 900}, {"Titulo": "Casa 'norte'", "Precio": 1200,},];
+  const other = [1, 2];
+</script>
+<script>{"props": {"translatedWordsList": [{"key": "address", "value": "C/ Mayor \\"1\\""}]}}</script>
+"""
+
+
+def test_embedded_literal_is_bounded_and_decoded():
+    words = extract_embedded_json(HTML, r'"translatedWordsList":\s?')
+    assert words == [{"key": "address", "value": 'C/ Mayor "1"'}]
+
+    # Coma final de JavaScript: se corrige en el segundo intento
+    assert extract_embedded_json(HTML, r"const postData\s*=\s*") == [
+        {"Titulo": "Piso [centro]", "Precio": 900},
+        {"Titulo": "Casa 'norte'", "Precio": 1200},
+    ]
+    assert extract_embedded_json(HTML, r"const missing =", default=[]) == []
+
+
+def test_array_is_streamed_element_by_element():
+    elements = iter_embedded_json_array(HTML, r"const postData\s*=\s*")
+    assert next(elements) == {"Titulo": "Piso [centro]", "Precio": 900}
+    assert list(elements) == [{"Titulo": "Casa 'norte'", "Precio": 1200}]
+    assert list(iter_embedded_json_array("sin datos", r"const postData\s*=")) == []
+
+
+def test_javascript_fixes_do_not_touch_strings():
+    assert loads_js('[{"d": "value undefined here", "e": "a,]", "f": undefined},]') == [
+        {"d": "value undefined here", "e": "a,]", "f": None}
+    ]
+    assert loads_js("{'a': 'it\\'s true, ]', 'b': true,}") == {"a": "it's true, ]", "b": True}
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.services.fingerprints import FingerprintStore
+
+
+class StubProperty(BaseModel):
+    id: Optional[str] = None
+    referenceCode: str
+    title: str
+
+
+def test_unchanged_models_reuse_the_saved_id(tmp_path):
+    store = FingerprintStore(tmp_path / "fingerprints.sqlite3")
+    item = StubProperty(referenceCode="VITA_1", title="Vita Granada")
+    assert store.unchanged_id("vita", "property", item) is None
+
+    store.record("vita", "property", item, "abc123")
+    # El ID asignado por Lodgerin no forma parte del contenido
+    item.id = "abc123"
+    assert store.unchanged_id("vita", "property", item) == "abc123"
+    assert store.unchanged_id("yugo", "property", item) is None
+
+    item.title = "Vita Granada Centro"
+    assert store.unchanged_id("vita", "property", item) is None
+
+
+def test_fingerprints_expire(tmp_path):
+    store = FingerprintStore(tmp_path / "fingerprints.sqlite3", max_age_days=-1)
+    item = StubProperty(referenceCode="NODIS_1", title="Nodis")
+    store.record("nodis", "property", item, "xyz")
+    assert store.unchanged_id("nodis", "property", item) is None
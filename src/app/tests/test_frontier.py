@@ -0,0 +1,91 @@
+import scrapy
+
+from scrapy.http import HtmlResponse
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from app.config.settings import ScraperConfig
+from app.scrapy.aggregator import ItemAggregator
+from app.scrapy.frontier import SIGNATURE_META, CrawlFrontierMiddleware, listing_signature
+
+
+class StubSpider(scrapy.Spider):
+    name = "stub_spider"
+
+
+class StubItem(scrapy.Item):
+    name = scrapy.Field()
+
+
+def crawl_once(listing: dict) -> tuple:
+    """
+    Simula una corrida: el listado genera una petición por detalle y las que
+    pasan el middleware se "descargan" y procesan.
+    """
+    spider = StubSpider(incremental="1")
+    stats = MemoryStatsCollector(get_crawler())
+    middleware = CrawlFrontierMiddleware(stats)
+    middleware.spider_opened(spider)
+
+    listing_response = HtmlResponse(url="https://example.com/", body=b"<html></html>", request=scrapy.Request("https://example.com/"))
+    requests = [
+        scrapy.Request(url, meta={SIGNATURE_META: listing_signature(text)})
+        for url, text in listing.items()
+    ]
+    scheduled = list(middleware.process_spider_output(listing_response, requests, spider))
+
+    for request in scheduled:
+        detail = HtmlResponse(url=request.url, body=b"<html>detalle</html>", request=request)
+        for item in middleware.process_spider_output(detail, [StubItem(name=request.url)], spider):
+            middleware.item_scraped(item, detail, spider)
+    middleware.spider_closed(spider)
+    return [request.url for request in scheduled], stats.get_stats()
+
+
+def test_unchanged_listing_entries_are_skipped_on_the_next_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(ScraperConfig, "FRONTIER_DB", str(tmp_path / "frontier.sqlite3"))
+    listing = {"https://example.com/a": "A  desde 500 €", "https://example.com/b": "B desde 600 €"}
+
+    scheduled, _ = crawl_once(listing)
+    assert scheduled == list(listing)
+
+    listing["https://example.com/b"] = "B desde 650 €"
+    listing["https://example.com/a"] = "A desde 500 €"  # solo cambian los espacios
+    scheduled, stats = crawl_once(listing)
+    assert scheduled == ["https://example.com/b"]
+    assert stats["frontier/skipped"] == 1
+
+
+def test_full_crawl_without_the_argument(tmp_path, monkeypatch):
+    monkeypatch.setattr(ScraperConfig, "FRONTIER_DB", str(tmp_path / "frontier.sqlite3"))
+    spider = StubSpider()
+    middleware = CrawlFrontierMiddleware(MemoryStatsCollector(get_crawler()))
+    middleware.spider_opened(spider)
+
+    request = scrapy.Request("https://example.com/a", meta={SIGNATURE_META: "x"})
+    response = HtmlResponse(url="https://example.com/", body=b"", request=scrapy.Request("https://example.com/"))
+    assert list(middleware.process_spider_output(response, [request], spider)) == [request]
+    assert not (tmp_path / "frontier.sqlite3").exists()
+
+
+def test_detail_page_is_recorded_only_once_its_item_is_scraped(tmp_path, monkeypatch):
+    monkeypatch.setattr(ScraperConfig, "FRONTIER_DB", str(tmp_path / "frontier.sqlite3"))
+    spider = StubSpider(incremental="1")
+    middleware = CrawlFrontierMiddleware(MemoryStatsCollector(get_crawler()))
+    middleware.spider_opened(spider)
+
+    listing = HtmlResponse(url="https://example.com/", body=b"", request=scrapy.Request("https://example.com/"))
+    detail_request = scrapy.Request("https://example.com/a", meta={SIGNATURE_META: "x"})
+    [detail_request] = middleware.process_spider_output(listing, [detail_request], spider)
+
+    # El item se arma con una petición posterior a la página de detalle
+    aggregator = ItemAggregator({}, lambda data: [StubItem(name="a")])
+    detail = HtmlResponse(url=detail_request.url, body=b"detalle", request=detail_request)
+    [sub_request] = middleware.process_spider_output(detail, [aggregator.request("https://example.com/a/rooms", lambda *args: ())], spider)
+    assert not middleware.frontier.unchanged("https://example.com/a", "x")
+
+    sub_response = HtmlResponse(url=sub_request.url, body=b"", request=sub_request)
+    [item] = middleware.process_spider_output(sub_response, sub_request.callback(sub_response, **sub_request.cb_kwargs), spider)
+    middleware.item_scraped(item, sub_response, spider)
+    assert middleware.frontier.unchanged("https://example.com/a", "x")
+    middleware.spider_closed(spider)
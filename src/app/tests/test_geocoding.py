@@ -0,0 +1,42 @@
+import app.services.geocoding as geocoding
+from app.services.geocoding import MISS, GeocodingCache
+
+
+def test_lookup_uses_normalised_queries_and_negative_cache(tmp_path):
+    cache = GeocodingCache(tmp_path / "geocoding.sqlite3")
+    cache.store("Calle Mayor 1, Madrid", {"lat": "40.4", "lon": "-3.7"})
+    cache.store("Dirección inexistente", None)
+
+    assert cache.lookup("  calle mayor 1,   MADRID ") == {"lat": "40.4", "lon": "-3.7"}
+    assert cache.lookup("dirección inexistente") is MISS
+    assert cache.lookup("Otra calle") is None
+
+    # Un nuevo proceso (sin LRU) lee los mismos valores desde SQLite
+    reopened = GeocodingCache(tmp_path / "geocoding.sqlite3")
+    assert reopened.lookup("Calle Mayor 1, Madrid") == {"lat": "40.4", "lon": "-3.7"}
+
+
+def test_geocode_only_calls_the_api_once_per_address(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_search_locations(self, query):
+        calls.append(query)
+        return [] if "nada" in query else [{"lat": "1", "lon": "2"}]
+
+    monkeypatch.setattr(geocoding, "_geocoding_cache", GeocodingCache(tmp_path / "geocoding.sqlite3"))
+    monkeypatch.setattr(geocoding.LodgerinInternal, "search_locations", fake_search_locations)
+
+    for _ in range(3):
+        assert geocoding.geocode("Gran Vía 10") == {"lat": "1", "lon": "2"}
+        assert geocoding.geocode("nada por aquí") is None
+    assert len(calls) == 2
+
+
+def test_invalidation_clears_the_lru_of_other_processes(tmp_path):
+    api_cache = GeocodingCache(tmp_path / "geocoding.sqlite3")
+    worker_cache = GeocodingCache(tmp_path / "geocoding.sqlite3")
+    api_cache.store("Calle Mayor 1, Madrid", {"lat": "40.4", "lon": "-3.7"})
+    assert worker_cache.lookup("Calle Mayor 1, Madrid") == {"lat": "40.4", "lon": "-3.7"}
+
+    api_cache.invalidate()
+    assert worker_cache.lookup("Calle Mayor 1, Madrid") is None
@@ -0,0 +1,76 @@
+import sys
+import logging
+import subprocess
+
+from app.models.enums import JobStatus
+from app.services.jobs import JobStore, read_item_count
+from app.services.log_relay import LogRelay
+
+
+def test_claim_skips_pages_already_running(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    first = store.enqueue("yugo", "https://yugo.com/en-us")
+    second = store.enqueue("yugo", "https://yugo.com/en-us", refine=True)
+    third = store.enqueue("vita", "https://www.vitastudent.com/en")
+
+    assert store.claim_next("worker-0")["id"] == first
+    # La segunda corrida de yugo espera a que termine la primera
+    assert store.claim_next("worker-1")["id"] == third
+    assert store.claim_next("worker-2") is None
+
+    store.finish(first, JobStatus.FINISHED, item_count=3)
+    claimed = store.claim_next("worker-0")
+    assert claimed["id"] == second
+    assert claimed["refine"] is True
+
+
+def test_requeue_interrupted_and_job_details(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    job_id = store.enqueue("nodis", "https://nodis.es/")
+    store.claim_next("worker-0")
+
+    assert store.requeue_interrupted() == 1
+    job = store.get(job_id)
+    assert job["status"] == JobStatus.QUEUED.value
+    assert job["started_at"] is None and job["duration_seconds"] is None
+
+    store.claim_next("worker-0")
+    store.finish(job_id, JobStatus.FINISHED, item_count=7)
+    job = store.get(job_id)
+    assert job["status"] == JobStatus.FINISHED.value
+    assert job["item_count"] == 7
+    assert job["duration_seconds"] >= 0
+
+
+def test_read_item_count_from_log_tail(tmp_path):
+    log_path = tmp_path / "vita.log"
+    log_path.write_text(
+        "INFO: Dumping Scrapy stats:\n{'item_scraped_count': 42,\n 'finish_reason': 'finished'}\n",
+        encoding="utf-8",
+    )
+    assert read_item_count(str(log_path)) == 42
+    assert read_item_count(str(tmp_path / "missing.log")) is None
+
+
+def test_log_relay_keeps_bounded_tail_for_job(tmp_path, caplog):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    job_id = store.enqueue("vita", "https://www.vitastudent.com/en")
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import sys\nfor i in range(500): print(i)\nprint('fallo', file=sys.stderr)"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    relay = LogRelay("vita_spider", max_lines=20, on_output=lambda lines: store.update_output(job_id, lines))
+    # Como en execute_spider, ambos streams se leen a la vez
+    with caplog.at_level(logging.INFO, logger="app.services.log_relay"):
+        relay.follow(process.stdout, logging.INFO)
+        relay.follow(process.stderr, logging.ERROR)
+        process.wait()
+        relay.join()
+
+    tail = store.get(job_id)["output_tail"]
+    assert len(tail) == 20
+    # Las líneas de ambos streams se intercalan: "fallo" puede quedar fuera de la cola
+    assert "499" in tail
+    assert ("ERROR", "[vita_spider] fallo") in [(record.levelname, record.getMessage()) for record in caplog.records]
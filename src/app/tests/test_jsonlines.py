@@ -0,0 +1,30 @@
+import json
+
+from app.scrapy.jsonlines import JsonLinesWriter, convert_json_to_jsonl, get_writer, close_writers, read_jsonl
+
+
+def test_writer_appends_and_reader_streams(tmp_path):
+    path = str(tmp_path / "data" / "property.jsonl")
+    with JsonLinesWriter(path, flush_every=2) as writer:
+        writer.write({"name": "Á"})
+        writer.write({"name": "B"})
+    with JsonLinesWriter(path) as writer:
+        writer.write({"name": "C"})
+    with open(path, "a", encoding="utf-8") as partial:
+        partial.write('{"name": ')  # proceso terminado a mitad de línea
+
+    assert [item["name"] for item in read_jsonl(path)] == ["Á", "B", "C"]
+    assert list(read_jsonl(str(tmp_path / "missing.jsonl"))) == []
+
+
+def test_legacy_json_is_converted_on_first_write(tmp_path):
+    legacy = tmp_path / "yugo" / "property.json"
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps([{"id": 1}, {"id": 2}], indent=4), encoding="utf-8-sig")
+
+    get_writer(str(tmp_path / "yugo" / "property.jsonl")).write({"id": 3})
+    close_writers(str(tmp_path / "yugo"))
+
+    assert [item["id"] for item in read_jsonl(str(tmp_path / "yugo" / "property.jsonl"))] == [1, 2, 3]
+    assert not legacy.exists() and (tmp_path / "yugo" / "property.json.bak").exists()
+    assert convert_json_to_jsonl(str(legacy)) is None
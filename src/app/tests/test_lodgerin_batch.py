@@ -0,0 +1,121 @@
+import json
+import asyncio
+import threading
+
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pydantic import BaseModel
+
+from app.config.settings import LodgerinConfig
+from app.services.lodgerin import RENTAL_UNIT_SAVED_MSG, AsyncLodgerinAPI, RentalUnitBatcher
+
+
+class StubRentalUnit(BaseModel):
+    id: Optional[str] = None
+    referenceCode: str
+
+
+class StubLodgerinHandler(BaseHTTPRequestHandler):
+    """
+    Servidor local que imita la API de Lodgerin para las rental units.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.calls.append(self.path)
+
+        if self.path == "/rental-units/bulk":
+            if not self.server.bulk_enabled:
+                return self._reply(404, {"msg": "Not found"})
+            units = [
+                unit for unit in payload["rentalUnits"]
+                if unit["referenceCode"] not in self.server.skip_in_bulk
+            ]
+            # El orden de la respuesta no tiene por qué coincidir con el del lote
+            data = [{"id": f"id-{unit['referenceCode']}", "referenceCode": unit["referenceCode"]} for unit in reversed(units)]
+            return self._reply(200, {"msg": "The rental units have been saved successfully!", "data": data})
+
+        if self.path.endswith("/calendar"):
+            return self._reply(503, {"msg": "Service unavailable"})
+
+        if self.path == "/rental-units":
+            return self._reply(200, {"msg": RENTAL_UNIT_SAVED_MSG, "data": {"id": f"id-{payload['referenceCode']}"}})
+
+        self._reply(404, {"msg": "Not found"})
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLodgerinHandler)
+    server.calls = []
+    server.bulk_enabled = True
+    server.skip_in_bulk = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(LodgerinConfig, "API_URL", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+
+
+def save_all(rental_units, batch_size):
+    async def _save():
+        async with AsyncLodgerinAPI("test-key") as lodgerin_api:
+            batcher = RentalUnitBatcher(lodgerin_api, batch_size=batch_size)
+            for rental_unit in rental_units:
+                batcher.add(rental_unit)
+            await batcher.flush()
+
+    asyncio.run(_save())
+
+
+def test_batches_are_mapped_back_by_reference_code(stub_server):
+    rental_units = [StubRentalUnit(referenceCode=f"RU-{index}") for index in range(5)]
+    save_all(rental_units, batch_size=2)
+
+    # El último lote tiene una sola unidad y va por el endpoint individual
+    assert sorted(stub_server.calls) == ["/rental-units", "/rental-units/bulk", "/rental-units/bulk"]
+    assert [unit.id for unit in rental_units] == [f"id-RU-{index}" for index in range(5)]
+
+
+def test_missing_items_are_posted_one_by_one(stub_server):
+    stub_server.skip_in_bulk = {"RU-1"}
+    rental_units = [StubRentalUnit(referenceCode=f"RU-{index}") for index in range(3)]
+    save_all(rental_units, batch_size=3)
+
+    assert stub_server.calls == ["/rental-units/bulk", "/rental-units"]
+    assert rental_units[1].id == "id-RU-1"
+
+
+def test_falls_back_to_single_posts_when_bulk_is_not_supported(stub_server):
+    stub_server.bulk_enabled = False
+    rental_units = [StubRentalUnit(referenceCode=f"RU-{index}") for index in range(4)]
+    save_all(rental_units, batch_size=2)
+
+    # Tras el primer rechazo no se vuelve a intentar el endpoint masivo
+    assert stub_server.calls.count("/rental-units/bulk") == 1
+    assert stub_server.calls.count("/rental-units") == 4
+    assert all(unit.id == f"id-{unit.referenceCode}" for unit in rental_units)
+
+
+def test_calendar_post_is_not_retried(stub_server, monkeypatch):
+    monkeypatch.setattr(LodgerinConfig, "BACKOFF_FACTOR", 0)
+
+    async def _save():
+        async with AsyncLodgerinAPI("test-key") as lodgerin_api:
+            return await lodgerin_api.create_rental_unit_calendar("RU-1", [{"startDate": "2025-01-01"}])
+
+    # Agrega fechas: repetirlo podría duplicar los rangos
+    assert asyncio.run(_save()) is None
+    assert stub_server.calls == ["/rental-units/RU-1/calendar"]
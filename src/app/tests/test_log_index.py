@@ -0,0 +1,46 @@
+from app.services.log_index import LogIndex
+
+
+def write_lines(path, lines, mode="a"):
+    with open(path, mode, encoding="utf-8") as log_file:
+        log_file.writelines(f"{line}\n" for line in lines)
+
+
+def test_status_is_updated_incrementally(tmp_path):
+    log_path = tmp_path / "vita.log"
+    write_lines(log_path, ["inicio", "open_spider vita"], mode="w")
+    index = LogIndex(str(log_path))
+
+    assert index.status() == {"status": "running", "details": ["inicio\n", "open_spider vita\n"]}
+    offset = index.update()["offset"]
+
+    write_lines(log_path, [f"item {i}" for i in range(30)] + ["close_spider vita"])
+    # Una línea a medio escribir no se procesa todavía
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        log_file.write("incomp")
+
+    status = index.status()
+    assert status["status"] == "finished"
+    assert status["details"][-1] == "close_spider vita\n"
+    assert len(status["details"]) == 10
+    assert index.update()["offset"] > offset
+    assert index.update()["line_count"] == 33
+
+
+def test_error_window_and_reset_on_truncate(tmp_path):
+    log_path = tmp_path / "nodis.log"
+    lines = [f"linea {i}" for i in range(40)]
+    lines[25] = "2025-01-01 [scrapy.core.scraper] ERROR: fallo"
+    write_lines(log_path, lines, mode="w")
+    index = LogIndex(str(log_path))
+
+    status = index.status()
+    assert status["status"] == "error"
+    [(key, window)] = status["details"].items()
+    assert key.startswith("Error in line: 25.")
+    assert window[0] == "linea 15\n" and window[-1] == "linea 39\n"
+    assert len(window) == 25
+
+    # La araña vuelve a correr: el log se recrea y el índice se reinicia
+    write_lines(log_path, ["open_spider nodis"], mode="w")
+    assert index.status() == {"status": "running", "details": ["open_spider nodis\n"]}
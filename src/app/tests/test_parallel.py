@@ -0,0 +1,41 @@
+import time
+
+from app.scrapy.parallel import ParallelEtl, Skip
+
+
+def slow_load(value):
+    # Las primeras propiedades tardan más en guardarse que las siguientes
+    time.sleep(0.02 * (5 - value % 5))
+    if value == 3:
+        raise RuntimeError("error en Lodgerin")
+    return value
+
+
+def test_output_keeps_item_order_and_isolates_errors():
+    emitted = []
+    etl = ParallelEtl(transform=lambda item: item, load=slow_load, emit=emitted.append, processes=0, threads=4)
+
+    assert etl.run(iter(range(10))) == 1
+    assert emitted == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert etl.processed == 10
+
+
+def test_transform_runs_in_a_process_pool():
+    emitted = []
+    etl = ParallelEtl(transform=pow, emit=emitted.append, transform_args=(2,), processes=2, threads=2)
+
+    assert etl.run(range(6)) == 0
+    assert emitted == [0, 1, 4, 9, 16, 25]
+
+
+def skip_odd(value):
+    return Skip(f"{value} es impar") if value % 2 else value
+
+
+def test_skipped_items_are_logged_and_not_emitted(caplog):
+    emitted = []
+    etl = ParallelEtl(transform=skip_odd, emit=emitted.append, processes=0, threads=2)
+
+    assert etl.run(range(4)) == 0
+    assert emitted == [0, 2]
+    assert "Se omite la propiedad número 1: 1 es impar" in caplog.text
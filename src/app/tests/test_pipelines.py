@@ -0,0 +1,136 @@
+import json
+import logging
+import threading
+
+import pytest
+import scrapy
+from scrapy.settings import Settings
+from twisted.internet import defer
+
+from app.scrapy import pipelines
+from app.scrapy.pipelines import EtlStage, StreamingJsonLinesPipeline
+
+
+@pytest.fixture(autouse=True)
+def without_reactor(monkeypatch):
+    """Sin reactor en marcha, lo que iría a sus hilos se ejecuta en el momento."""
+    from twisted.internet import reactor
+
+    monkeypatch.setattr(pipelines.threads, "deferToThread", defer.maybeDeferred)
+    monkeypatch.setattr(reactor, "callFromThread", lambda function, *args: function(*args))
+
+
+class StubSpider(scrapy.Spider):
+    name = "stub_spider"
+
+
+class RecordingPipeline(StreamingJsonLinesPipeline):
+    def __init__(self):
+        self.first_item = threading.Event()
+
+    def run_etl(self, items, spider):
+        self.etl_items = []
+        for item in items:
+            self.etl_items.append(item)
+            self.first_item.set()
+
+
+def make_spider(tmp_path, jobdir=None, running=True):
+    spider = StubSpider()
+    spider.items_spider_output_document = {
+        "output_folder": str(tmp_path),
+        "file_name": "stub.json",
+        "refine": "0",
+    }
+    engine = type("StubEngine", (), {"running": running})()
+    settings = Settings({"JOBDIR": jobdir} if jobdir else {})
+    spider.crawler = type("StubCrawler", (), {"settings": settings, "engine": engine})()
+    return spider
+
+
+def test_items_are_streamed_to_disk_and_passed_to_the_etl(tmp_path):
+    spider = make_spider(tmp_path)
+    pipeline = RecordingPipeline()
+    pipeline.open_spider(spider)
+    for index in range(3):
+        pipeline.process_item({"items_output": {"index": index}}, spider)
+    # El ETL consume los items mientras la araña sigue abierta
+    assert pipeline.first_item.wait(timeout=5)
+    pipeline.close_spider(spider)
+
+    assert (tmp_path / "stub.jsonl").read_text(encoding="utf-8").count("\n") == 3
+    assert [item["items_output"]["index"] for item in pipeline.etl_items] == [0, 1, 2]
+
+
+def test_interrupted_crawl_keeps_items_for_the_resumed_run(tmp_path):
+    jobdir = tmp_path / "jobdir"
+    spider = make_spider(tmp_path, str(jobdir), running=False)
+    pipeline = RecordingPipeline()
+    pipeline.open_spider(spider)
+    pipeline.process_item({"items_output": {"index": 0}}, spider)
+    pipeline.close_spider(spider)
+    assert [item["items_output"]["index"] for item in pipeline.etl_items] == [0]
+
+    (jobdir / "requests.queue").mkdir(parents=True)
+    (jobdir / "requests.queue" / "active.json").write_text(json.dumps([0]))
+    spider = make_spider(tmp_path, str(jobdir))
+    pipeline = RecordingPipeline()
+    pipeline.open_spider(spider)
+    pipeline.process_item({"items_output": {"index": 1}}, spider)
+    pipeline.close_spider(spider)
+
+    # El archivo conserva todo; el ETL solo recibe los items nuevos
+    assert [item["items_output"]["index"] for item in pipeline.iter_items()] == [0, 1]
+    assert [item["items_output"]["index"] for item in pipeline.etl_items] == [1]
+
+
+def test_no_etl_without_items(tmp_path):
+    spider = make_spider(tmp_path)
+    pipeline = RecordingPipeline()
+    pipeline.open_spider(spider)
+    pipeline.close_spider(spider)
+    assert not hasattr(pipeline, "etl_items")
+
+
+def test_somosalthena_catalogue_is_stored_per_property_and_filtered_while_reading(tmp_path):
+    from app.scrapy.somosalthena.somosalthena.somosalthena.pipelines import SomosalthenaPipeline
+    from app.scrapy.somosalthena.somosalthena.somosalthena.utils import is_coliving_property
+
+    class FilteringPipeline(SomosalthenaPipeline):
+        def run_etl(self, items, spider):
+            self.coliving = [data["Referencia"] for data in items if is_coliving_property(data)]
+
+    catalogue = [
+        {"Referencia": "A", "GrupoInmueble": "Pisos", "Operacion": "alquiler"},
+        {"Referencia": "B", "GrupoInmueble": "Locales", "Operacion": "alquiler"},
+        {"Referencia": "C", "GrupoInmueble": "Casas", "Operacion": "venta"},
+        {},
+    ]
+    spider = make_spider(tmp_path)
+    pipeline = FilteringPipeline()
+    pipeline.open_spider(spider)
+    for data_json in catalogue:
+        pipeline.process_item({"items_output": data_json}, spider)
+    pipeline.close_spider(spider)
+
+    assert list(pipeline.iter_items()) == catalogue
+    assert pipeline.coliving == ["A"]
+
+
+def test_full_queue_returns_a_deferred_fired_by_the_etl_thread():
+    release = threading.Event()
+    consumed = []
+
+    def run_etl(items):
+        release.wait(timeout=5)
+        consumed.extend(items)
+
+    stage = EtlStage(run_etl, logging.getLogger(__name__), maxsize=1)
+    assert stage.put({"index": 0}) is None
+    waiter = stage.put({"index": 1})
+    assert isinstance(waiter, defer.Deferred) and not waiter.called
+
+    release.set()
+    stage.finish()
+    assert waiter.called
+    assert consumed == [{"index": 0}, {"index": 1}]
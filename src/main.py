@@ -1,7 +1,9 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.router import router
+from app.services.jobs import WorkerPool
 import app.config.settings as settings
 import sentry_sdk
 
@@ -35,11 +37,23 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranca el pool de workers que consume la cola de trabajos de scraping.
+    """
+    pool = WorkerPool()
+    if pool.max_workers > 0:
+        pool.start()
+    yield
+    pool.stop()
+
 
 app = FastAPI(
     title="API WebScrapingforRentalPlatforms",
     version="1.0",
     description="API para web scraping de plataformas de alquiler.",
+    lifespan=lifespan,
 )
 
 app.include_router(router)